@@ -0,0 +1,232 @@
+"""
+Benchmark the latency the AutoGen integration adds on top of Zep, fully offline.
+
+Drives ZepUserMemory, ZepGraphMemory and the tool functions against FakeAsyncZep,
+an in-process AsyncZep stand-in with configurable latency and result sizes. For
+each scenario and concurrency level (number of agents running turns at the same
+time) it reports:
+
+- added: per-turn time against a zero-latency fake, i.e. the integration's own
+  overhead (p50 and p95, milliseconds)
+- turn: per-turn time against the configured service latency (p50 and p95)
+- throughput: turns per second across all agents
+- alloc: mean peak memory allocated per turn (KiB, measured with tracemalloc)
+
+Exits with status 1 if --max-added-ms is given and a scenario's p50 added
+latency exceeds it, so it can gate changes in CI.
+
+Usage:
+    python benchmarks/bench_memory.py [--turns 50] [--concurrency 1,8,32]
+        [--latency-ms 40] [--results 10] [--max-added-ms 5] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import UserMessage
+
+from zep_autogen import ZepGraphMemory, ZepUserMemory
+from zep_autogen.tools import add_graph_data, search_memory
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_zep import FakeAsyncZep, FakeZepConfig, fixed, lognormal  # noqa: E402
+
+Turn = Callable[[int], Awaitable[None]]
+# Builds the turn function of one agent
+Scenario = Callable[[FakeAsyncZep, int], Awaitable[Turn]]
+
+
+async def _model_context(text: str) -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content=text, source="user"))
+    return model_context
+
+
+async def user_memory_turn(client: FakeAsyncZep, agent: int) -> Turn:
+    """Add the user's message to the thread, then inject context for the reply."""
+    memory = ZepUserMemory(client=client, user_id=f"user-{agent}", thread_id=f"thread-{agent}")
+
+    async def turn(i: int) -> None:
+        text = f"Message {i} from user {agent}"
+        await memory.add(
+            MemoryContent(
+                content=text,
+                mime_type=MemoryMimeType.TEXT,
+                metadata={"type": "message", "role": "user"},
+            )
+        )
+        await memory.update_context(await _model_context(text))
+
+    return turn
+
+
+async def graph_memory_turn(client: FakeAsyncZep, agent: int) -> Turn:
+    """Add data to the graph, then inject the graph context for the reply."""
+    memory = ZepGraphMemory(client=client, graph_id=f"graph-{agent}")
+
+    async def turn(i: int) -> None:
+        text = f"Observation {i} from agent {agent}"
+        await memory.add(MemoryContent(content=text, mime_type=MemoryMimeType.TEXT))
+        await memory.update_context(await _model_context(text))
+
+    return turn
+
+
+async def search_tool_turn(client: FakeAsyncZep, agent: int) -> Turn:
+    """Search facts and entities with the search tool function."""
+
+    async def turn(i: int) -> None:
+        await search_memory(client, f"query {i}", graph_id=f"graph-{agent}", scope="edges,nodes")
+
+    return turn
+
+
+async def add_tool_turn(client: FakeAsyncZep, agent: int) -> Turn:
+    """Store one item with the add tool function."""
+
+    async def turn(i: int) -> None:
+        await add_graph_data(client, f"Observation {i}", graph_id=f"graph-{agent}")
+
+    return turn
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "user_memory": user_memory_turn,
+    "graph_memory": graph_memory_turn,
+    "search_memory": search_tool_turn,
+    "add_graph_data": add_tool_turn,
+}
+
+
+async def run_turns(
+    scenario: Scenario, config: FakeZepConfig, agents: int, turns: int
+) -> tuple[list[float], float]:
+    """
+    Run turns turns on each of agents concurrent agents.
+
+    Returns:
+        The time of every turn in milliseconds, and the wall time in seconds
+    """
+    client = FakeAsyncZep(config)
+    agent_turns = [await scenario(client, agent) for agent in range(agents)]
+    # One warm-up turn per agent so thread checks and caches reach their steady state
+    await asyncio.gather(*[turn(-1) for turn in agent_turns])
+
+    durations: list[float] = []
+
+    async def run_agent(turn: Turn) -> None:
+        for i in range(turns):
+            started = time.perf_counter()
+            await turn(i)
+            durations.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[run_agent(turn) for turn in agent_turns])
+    return durations, time.perf_counter() - started
+
+
+async def measure_allocations(scenario: Scenario, config: FakeZepConfig, turns: int) -> float:
+    """Get the mean peak memory allocated by one turn, in KiB."""
+    client = FakeAsyncZep(config)
+    turn = await scenario(client, 0)
+    await turn(-1)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(turns):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await turn(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks) / 1024
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=50, help="Turns per agent")
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="Comma-separated numbers of concurrent agents"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=40.0, help="Median service latency (log-normal)"
+    )
+    parser.add_argument("--results", type=int, default=10, help="Results available per read")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake service")
+    parser.add_argument("--max-added-ms", type=float, help="Fail if p50 added latency exceeds this")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    concurrency = [int(level) for level in args.concurrency.split(",")]
+    offline = FakeZepConfig(results=fixed(args.results), seed=args.seed)
+    online = FakeZepConfig(
+        default_latency_ms=lognormal(args.latency_ms),
+        results=fixed(args.results),
+        seed=args.seed,
+    )
+
+    print(
+        f"{args.turns} turns per agent, {args.latency_ms:g} ms median service latency, "
+        f"{args.results} results per read"
+    )
+    print(
+        f"{'scenario':<16}{'agents':>7}{'added p50':>11}{'added p95':>11}"
+        f"{'turn p50':>10}{'turn p95':>10}{'turns/s':>10}{'alloc KiB':>11}"
+    )
+
+    results = []
+    failed = False
+    for name in args.scenarios.split(","):
+        scenario = SCENARIOS[name]
+        alloc_kib = await measure_allocations(scenario, offline, args.turns)
+        for agents in concurrency:
+            added, _ = await run_turns(scenario, offline, agents, args.turns)
+            turn_times, wall = await run_turns(scenario, online, agents, args.turns)
+            row = {
+                "scenario": name,
+                "agents": agents,
+                "added_p50_ms": _percentile(added, 50),
+                "added_p95_ms": _percentile(added, 95),
+                "turn_p50_ms": _percentile(turn_times, 50),
+                "turn_p95_ms": _percentile(turn_times, 95),
+                "turns_per_s": len(turn_times) / wall,
+                "alloc_kib": alloc_kib,
+            }
+            results.append(row)
+            print(
+                f"{name:<16}{agents:>7}{row['added_p50_ms']:>11.3f}{row['added_p95_ms']:>11.3f}"
+                f"{row['turn_p50_ms']:>10.1f}{row['turn_p95_ms']:>10.1f}"
+                f"{row['turns_per_s']:>10.0f}{alloc_kib:>11.1f}"
+            )
+            if args.max_added_ms is not None and row["added_p50_ms"] > args.max_added_ms:
+                failed = True
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if failed:
+        print(f"p50 added latency exceeded {args.max_added_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
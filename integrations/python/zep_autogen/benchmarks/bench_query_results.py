@@ -0,0 +1,94 @@
+"""
+Benchmark the cost of building AutoGen query results from Zep search results.
+
+Compares eager conversion of every edge, node and episode to MemoryContent with
+the lazy LazyMemoryQueryResult view, when no results, the first few results, or
+all results are read.
+
+Usage:
+    python benchmarks/bench_query_results.py [--results 200] [--repeat 50]
+"""
+
+import argparse
+import timeit
+
+from zep_cloud import EntityEdge, EntityNode, Episode, GraphSearchResults
+
+from zep_autogen.results import graph_results_to_memory_content, to_query_result
+
+
+def make_graph_results(count: int) -> GraphSearchResults:
+    """Build search results with count items per scope."""
+    edges = [
+        EntityEdge(
+            uuid_=f"edge-{i}",
+            fact=f"User mentioned preference number {i} during a conversation",
+            name="HAS_PREFERENCE",
+            source_node_uuid="user",
+            target_node_uuid=f"node-{i}",
+            created_at="2025-01-01T00:00:00Z",
+            valid_at="2025-01-01T00:00:00Z",
+            attributes={"category": "preference", "rank": i, "tags": ["a", "b", "c"]},
+            score=1.0 / (i + 1),
+        )
+        for i in range(count)
+    ]
+    nodes = [
+        EntityNode(
+            uuid_=f"node-{i}",
+            name=f"Entity {i}",
+            summary=f"Summary of entity {i} and how it relates to the user",
+            created_at="2025-01-01T00:00:00Z",
+            attributes={"kind": "topic", "rank": i},
+            score=1.0 / (i + 1),
+        )
+        for i in range(count)
+    ]
+    episodes = [
+        Episode(
+            uuid_=f"episode-{i}",
+            content=f"Message {i} from the conversation history",
+            created_at="2025-01-01T00:00:00Z",
+            source="message",
+            role="user",
+            role_type="user",
+        )
+        for i in range(count)
+    ]
+    return GraphSearchResults(edges=edges, nodes=nodes, episodes=episodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=200, help="Results per scope")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per case")
+    args = parser.parse_args()
+
+    graph_results = make_graph_results(args.results)
+
+    def eager() -> None:
+        to_query_result(graph_results_to_memory_content(graph_results, "graph"))
+
+    def lazy(read: int | None) -> None:
+        result = to_query_result(graph_results_to_memory_content(graph_results, "graph", lazy=True))
+        for _ in result.results[:read] if read is not None else result.results:
+            pass
+
+    cases = {
+        "eager": eager,
+        "lazy, nothing read": lambda: lazy(0),
+        "lazy, first 5 read": lambda: lazy(5),
+        "lazy, all read": lambda: lazy(None),
+    }
+
+    total = args.results * 3
+    print(f"{total} results, {args.repeat} iterations per case")
+    baseline = None
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=args.repeat, repeat=3)) / args.repeat
+        baseline = baseline or seconds
+        print(f"{name:<20} {seconds * 1000:8.3f} ms  ({baseline / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+In-process stand-in for AsyncZep, used to benchmark the integration offline.
+
+FakeAsyncZep is a real AsyncZep instance (so the memories and tools accept it)
+whose thread and graph clients are replaced by fakes. Every call sleeps for a
+latency drawn from a configurable distribution and returns zep_cloud response
+types whose size is drawn from configurable distributions, so the integration's
+conversion code runs exactly as it does against the service. No request leaves
+the process.
+"""
+
+import asyncio
+import math
+import random
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from zep_cloud import EntityEdge, EntityNode, Episode, GraphSearchResults, NotFoundError
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import (
+    AddThreadMessagesResponse,
+    EpisodeResponse,
+    Message,
+    MessageListResponse,
+    SuccessResponse,
+    Thread,
+    ThreadContextResponse,
+)
+
+# Draws a value from a random generator
+Distribution = Callable[[random.Random], float]
+
+
+def fixed(value: float) -> Distribution:
+    """Always the same value."""
+    return lambda rng: value
+
+
+def uniform(low: float, high: float) -> Distribution:
+    """Uniformly distributed between low and high."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Distribution:
+    """Log-normally distributed around median; a long right tail like real latencies."""
+    if median <= 0:
+        return fixed(0.0)
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class FakeZepConfig:
+    """
+    Latency and payload shape of the fake service.
+
+    Attributes:
+        latency_ms: Latency of each call in milliseconds, per operation; operations
+            without an entry use default_latency_ms
+        default_latency_ms: Latency of operations without their own distribution
+        results: Number of results a search or history read has available, capped
+            by the limit of the call
+        text_chars: Length of each fact, summary, message or episode text
+        context_chars: Length of the thread context string
+        seed: Seed of the random generator, for repeatable runs
+    """
+
+    latency_ms: dict[str, Distribution] = field(default_factory=dict)
+    default_latency_ms: Distribution = field(default_factory=lambda: fixed(0.0))
+    results: Distribution = field(default_factory=lambda: fixed(10))
+    text_chars: Distribution = field(default_factory=lambda: uniform(40, 200))
+    context_chars: Distribution = field(default_factory=lambda: fixed(1500))
+    seed: int = 0
+
+
+class _FakeService:
+    """Shared state of the fake clients: latency, payload generation and call counts."""
+
+    def __init__(self, config: FakeZepConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.calls: Counter[str] = Counter()
+        self.service_ms = 0.0
+        self.threads: dict[str, list[Message]] = {}
+
+    async def call(self, operation: str) -> None:
+        self.calls[operation] += 1
+        distribution = self.config.latency_ms.get(operation, self.config.default_latency_ms)
+        latency_ms = max(0.0, distribution(self.rng))
+        self.service_ms += latency_ms
+        await asyncio.sleep(latency_ms / 1000)
+
+    def count(self, limit: int | None) -> int:
+        available = max(0, int(self.config.results(self.rng)))
+        return min(available, limit) if limit is not None else available
+
+    def text(self, prefix: str, distribution: Distribution | None = None) -> str:
+        length = max(1, int((distribution or self.config.text_chars)(self.rng)))
+        return (prefix + " " + "lorem ipsum dolor sit amet " * (length // 27 + 1))[:length]
+
+
+class _FakeThreadClient:
+    def __init__(self, service: _FakeService) -> None:
+        self._service = service
+
+    async def create(self, *, thread_id: str, user_id: str, **_: Any) -> Thread:
+        await self._service.call("thread.create")
+        self._service.threads.setdefault(thread_id, [])
+        return Thread(thread_id=thread_id, user_id=user_id)
+
+    async def get(
+        self, thread_id: str, *, lastn: int | None = None, **_: Any
+    ) -> MessageListResponse:
+        await self._service.call("thread.get")
+        if thread_id not in self._service.threads:
+            raise NotFoundError(body=f"thread {thread_id} not found")
+        messages = self._service.threads[thread_id]
+        return MessageListResponse(messages=messages[-lastn:] if lastn else messages)
+
+    async def add_messages(
+        self, thread_id: str, *, messages: Sequence[Message], **_: Any
+    ) -> AddThreadMessagesResponse:
+        await self._service.call("thread.add_messages")
+        self._service.threads.setdefault(thread_id, []).extend(messages)
+        return AddThreadMessagesResponse()
+
+    async def get_user_context(self, thread_id: str, **_: Any) -> ThreadContextResponse:
+        await self._service.call("thread.get_user_context")
+        return ThreadContextResponse(
+            context=self._service.text("Context", self._service.config.context_chars)
+        )
+
+    async def delete(self, thread_id: str, **_: Any) -> SuccessResponse:
+        await self._service.call("thread.delete")
+        self._service.threads.pop(thread_id, None)
+        return SuccessResponse()
+
+
+class _FakeEpisodeClient:
+    def __init__(self, service: _FakeService) -> None:
+        self._service = service
+
+    async def get_by_graph_id(
+        self, graph_id: str, *, lastn: int | None = None, **_: Any
+    ) -> EpisodeResponse:
+        await self._service.call("graph.episode.get_by_graph_id")
+        return EpisodeResponse(
+            episodes=[_episode(self._service, i) for i in range(self._service.count(lastn))]
+        )
+
+
+class _FakeGraphClient:
+    def __init__(self, service: _FakeService) -> None:
+        self._service = service
+        self.episode = _FakeEpisodeClient(service)
+
+    async def add(self, *, data: str, type: str, **_: Any) -> Episode:
+        await self._service.call("graph.add")
+        return Episode(uuid_="episode", content=data, created_at="2025-01-01T00:00:00Z")
+
+    async def add_batch(self, *, episodes: Sequence[Any], **_: Any) -> list[Episode]:
+        await self._service.call("graph.add_batch")
+        return [
+            Episode(uuid_=f"episode-{i}", content=episode.data, created_at="2025-01-01T00:00:00Z")
+            for i, episode in enumerate(episodes)
+        ]
+
+    async def search(
+        self, *, query: str, limit: int | None = None, scope: str | None = None, **_: Any
+    ) -> GraphSearchResults:
+        await self._service.call("graph.search")
+        count = self._service.count(limit)
+        scope = scope or "edges"
+        if scope == "nodes":
+            return GraphSearchResults(nodes=[_node(self._service, i) for i in range(count)])
+        if scope == "episodes":
+            return GraphSearchResults(episodes=[_episode(self._service, i) for i in range(count)])
+        return GraphSearchResults(edges=[_edge(self._service, i) for i in range(count)])
+
+    async def delete(self, graph_id: str, **_: Any) -> SuccessResponse:
+        await self._service.call("graph.delete")
+        return SuccessResponse()
+
+
+def _edge(service: _FakeService, i: int) -> EntityEdge:
+    return EntityEdge(
+        uuid_=f"edge-{service.rng.getrandbits(64):x}",
+        fact=service.text(f"Fact {i}"),
+        name="RELATES_TO",
+        source_node_uuid="source",
+        target_node_uuid="target",
+        created_at="2025-01-01T00:00:00Z",
+        valid_at="2025-01-01T00:00:00Z",
+        attributes={"rank": i},
+        score=1.0 / (i + 1),
+    )
+
+
+def _node(service: _FakeService, i: int) -> EntityNode:
+    return EntityNode(
+        uuid_=f"node-{service.rng.getrandbits(64):x}",
+        name=f"Entity {i}",
+        summary=service.text(f"Entity {i}"),
+        created_at="2025-01-01T00:00:00Z",
+        attributes={"rank": i},
+        score=1.0 / (i + 1),
+    )
+
+
+def _episode(service: _FakeService, i: int) -> Episode:
+    return Episode(
+        uuid_=f"episode-{service.rng.getrandbits(64):x}",
+        content=service.text(f"Message {i}"),
+        created_at="2025-01-01T00:00:00Z",
+        source="message",
+        role="user",
+        role_type="user",
+        score=1.0 / (i + 1),
+    )
+
+
+class FakeAsyncZep(AsyncZep):
+    """
+    AsyncZep whose thread and graph APIs are served in-process.
+
+    Args:
+        config: Latency and payload shape of the fake service
+    """
+
+    def __init__(self, config: FakeZepConfig | None = None) -> None:
+        super().__init__(api_key="offline")
+        self._service = _FakeService(config or FakeZepConfig())
+        self.thread = _FakeThreadClient(self._service)  # type: ignore[assignment]
+        self.graph = _FakeGraphClient(self._service)  # type: ignore[assignment]
+
+    @property
+    def calls(self) -> Counter[str]:
+        """Get the number of calls made to each operation."""
+        return self._service.calls
+
+    @property
+    def service_ms(self) -> float:
+        """Get the total simulated service latency in milliseconds."""
+        return self._service.service_ms
+
+    def reset_counters(self) -> None:
+        """Reset the call counts and total service latency."""
+        self._service.calls.clear()
+        self._service.service_ms = 0.0
@@ -1,22 +1,45 @@
-from .exceptions import ZepDependencyError
+from .exceptions import (
+    ZepBatchAddError,
+    ZepBufferFullError,
+    ZepDependencyError,
+    ZepWriteNotAttemptedError,
+)
 
 try:
     # Check for required AutoGen dependencies - just test import
     import autogen_core.memory  # noqa: F401
     import autogen_core.model_context  # noqa: F401
 
+    from .coordinator import ZepMemoryCoordinator
+    from .federated_memory import ZepFederatedMemory
     from .graph_memory import ZepGraphMemory
 
     # Import our integration
     from .memory import ZepUserMemory
-    from .tools import create_add_graph_data_tool, create_search_graph_tool
+    from .results import LazyMemoryQueryResult
+    from .telemetry import LatencyAggregator, ZepCallEvent, log_to_autogen_events
+    from .tools import (
+        create_add_graph_data_batch_tool,
+        create_add_graph_data_tool,
+        create_search_graph_tool,
+    )
 
     __all__ = [
         "ZepUserMemory",
         "ZepGraphMemory",
+        "ZepFederatedMemory",
+        "ZepMemoryCoordinator",
+        "LazyMemoryQueryResult",
+        "ZepCallEvent",
+        "LatencyAggregator",
+        "log_to_autogen_events",
         "create_search_graph_tool",
         "create_add_graph_data_tool",
+        "create_add_graph_data_batch_tool",
         "ZepDependencyError",
+        "ZepBatchAddError",
+        "ZepBufferFullError",
+        "ZepWriteNotAttemptedError",
     ]
 
 except ImportError as e:
@@ -0,0 +1,77 @@
+"""
+Chunked, concurrent batch writes for Zep AutoGen memories and tools.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from .exceptions import ZepWriteNotAttemptedError
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+async def write_in_chunks(
+    items: list[T],
+    write_chunk: Callable[[list[T]], Awaitable[None]],
+    chunk_size: int,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ordered: bool = False,
+) -> list[BaseException | None]:
+    """
+    Write items in chunks, with at most max_concurrency chunks in flight.
+
+    A failed chunk does not stop the others, unless ordered is set: the chunks are
+    then written one after another, in order, and the first failure stops the write
+    so no later item lands after a gap.
+
+    Args:
+        items: Items to write
+        write_chunk: Coroutine function writing one chunk of items
+        chunk_size: Largest number of items per chunk
+        max_concurrency: Largest number of chunks written at the same time
+        ordered: Write the chunks in order, stopping at the first failed chunk
+
+    Returns:
+        The error of each item's chunk, or None for items that were written. Items
+        not attempted after a failure have a ZepWriteNotAttemptedError
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if ordered:
+        return await _write_in_order(chunks, write_chunk)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def write(chunk: list[T]) -> None:
+        async with semaphore:
+            await write_chunk(chunk)
+
+    outcomes = await asyncio.gather(*[write(chunk) for chunk in chunks], return_exceptions=True)
+
+    errors: list[BaseException | None] = []
+    for chunk, outcome in zip(chunks, outcomes, strict=True):
+        errors.extend([outcome] * len(chunk))
+    return errors
+
+
+async def _write_in_order(
+    chunks: list[list[T]], write_chunk: Callable[[list[T]], Awaitable[None]]
+) -> list[BaseException | None]:
+    errors: list[BaseException | None] = []
+    for index, chunk in enumerate(chunks):
+        try:
+            await write_chunk(chunk)
+        except Exception as e:
+            errors.extend([e] * len(chunk))
+            skipped = ZepWriteNotAttemptedError(e)
+            for later in chunks[index + 1 :]:
+                errors.extend([skipped] * len(later))
+            break
+        errors.extend([None] * len(chunk))
+    return errors
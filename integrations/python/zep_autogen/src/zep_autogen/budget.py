@@ -0,0 +1,68 @@
+"""
+Token budgeting for the context injected by Zep AutoGen memories.
+"""
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+TokenEstimator = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def truncate_to_tokens(text: str, max_tokens: int, estimator: TokenEstimator) -> str:
+    """
+    Cut text so that it fits in max_tokens, keeping its beginning.
+
+    Args:
+        text: The text to truncate
+        max_tokens: Token budget for the text
+        estimator: Callable returning the token count of a string
+
+    Returns:
+        The text, shortened if it did not fit
+    """
+    if max_tokens <= 0:
+        return ""
+
+    tokens = estimator(text)
+    while text and tokens > max_tokens:
+        text = text[: int(len(text) * max_tokens / tokens)]
+        tokens = estimator(text)
+    return text
+
+
+def pack_graph_results(
+    edges: list[Any], nodes: list[Any], max_tokens: int, estimator: TokenEstimator
+) -> tuple[list[Any], list[Any]]:
+    """
+    Keep the highest ranked facts, then entities, that fit in the token budget.
+
+    Args:
+        edges: Facts in rank order
+        nodes: Entities in rank order
+        max_tokens: Token budget for the kept results
+        estimator: Callable returning the token count of a string
+
+    Returns:
+        The kept edges and nodes
+    """
+    remaining = max_tokens
+    packed: list[list[Any]] = []
+    for items, to_text in (
+        (edges, lambda edge: edge.fact),
+        (nodes, lambda node: f"{node.name}: {node.summary}"),
+    ):
+        kept = []
+        for item in items:
+            tokens = estimator(to_text(item) or "")
+            if tokens > remaining:
+                break
+            kept.append(item)
+            remaining -= tokens
+        packed.append(kept)
+    return packed[0], packed[1]
@@ -0,0 +1,190 @@
+"""
+Write buffering for Zep AutoGen memories.
+
+This module provides a small async buffer that accumulates writes and flushes
+them to Zep in batches.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from .exceptions import ZepBufferFullError
+from .utils import is_retryable
+
+T = TypeVar("T")
+
+# Largest batches accepted by thread.add_messages and graph.add_batch
+MAX_MESSAGES_PER_BATCH = 30
+MAX_EPISODES_PER_BATCH = 20
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer(Generic[T]):
+    """
+    Accumulates items and flushes them in batches.
+
+    A flush happens when the buffer reaches max_batch_size items, when
+    flush_interval seconds have passed since the first buffered item, or when
+    flush() or close() is called. Flushes are serialized, so a writer that fills
+    the buffer while a flush is in progress waits for it (backpressure).
+
+    A batch failing with a retryable error (timeout, connection error, 429 or 5xx) is
+    retried up to max_retries times with exponential backoff. A batch that still
+    fails, or fails with any other error, is moved to dead_letters instead of being
+    written, and the flush stops there so later items keep their order; they stay
+    buffered for the next flush. The error is only raised to the put() callers whose
+    items were in that batch, and to flush(). If the buffer holds max_size items
+    after flushing, adds are rejected with ZepBufferFullError.
+
+    Args:
+        flush_batch: Coroutine function that writes one batch of items to Zep
+        max_batch_size: Number of items that triggers a flush, and the largest batch written
+        flush_interval: Maximum time in seconds an item stays buffered
+        max_size: Largest number of items held, and of dead letters kept
+        max_retries: Number of times a batch failing with a retryable error is retried
+        retry_delay: Delay in seconds before the first retry, doubled for each retry
+    """
+
+    def __init__(
+        self,
+        flush_batch: Callable[[list[T]], Awaitable[None]],
+        max_batch_size: int = 20,
+        flush_interval: float = 1.0,
+        max_size: int = 1000,
+        max_retries: int = 2,
+        retry_delay: float = 0.2,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_size < max_batch_size:
+            raise ValueError("max_size must be at least max_batch_size")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+
+        self._flush_batch = flush_batch
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._max_size = max_size
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+
+        # Buffered items in order, each with a sequence number identifying its add
+        self._items: list[tuple[int, T]] = []
+        self._sequence = itertools.count()
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+
+        # Items of batches that could not be written, oldest dropped beyond max_size
+        self._dead_letters: deque[T] = deque(maxlen=max_size)
+        # Errors of the failed items whose put() is waiting for a flush
+        self._waiting: set[int] = set()
+        self._errors: dict[int, BaseException] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def dead_letters(self) -> list[T]:
+        """Get the items of failed batches that were not written, oldest first."""
+        return list(self._dead_letters)
+
+    def clear_dead_letters(self) -> list[T]:
+        """Remove and return the items of failed batches, e.g. to add them again."""
+        items = list(self._dead_letters)
+        self._dead_letters.clear()
+        return items
+
+    async def put(self, item: T) -> None:
+        """
+        Add an item to the buffer, flushing if a batch is full.
+
+        A failed flush is only raised if the batch holding this item failed.
+
+        Raises:
+            ZepBufferFullError: If max_size items are still buffered after flushing
+            Exception: The error of the failed batch holding this item, which was moved
+                to dead_letters
+        """
+        if len(self._items) >= self._max_size:
+            # A failure is logged by flush(); its items no longer take room
+            with contextlib.suppress(Exception):
+                await self.flush()
+            if len(self._items) >= self._max_size:
+                raise ZepBufferFullError(self._max_size)
+
+        sequence = next(self._sequence)
+        self._items.append((sequence, item))
+
+        if len(self._items) >= self._max_batch_size:
+            self._waiting.add(sequence)
+            try:
+                # A failure is logged by flush(), and raised below if it holds this item
+                with contextlib.suppress(Exception):
+                    await self.flush()
+            finally:
+                self._waiting.discard(sequence)
+            error = self._errors.pop(sequence, None)
+            if error is not None:
+                raise error
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def flush(self) -> None:
+        """
+        Write all buffered items to Zep.
+
+        Raises:
+            Exception: The error of a batch that could not be written. Its items are in
+                dead_letters, and the items after it stay buffered for the next flush
+        """
+        async with self._lock:
+            while self._items:
+                batch = self._items[: self._max_batch_size]
+                del self._items[: len(batch)]
+                try:
+                    await self._write([item for _, item in batch])
+                except Exception as e:
+                    logger.error(f"Failed to write {len(batch)} buffered items to Zep: {e}")
+                    self._dead_letters.extend(item for _, item in batch)
+                    for sequence, _ in batch:
+                        if sequence in self._waiting:
+                            self._errors[sequence] = e
+                    raise
+                except BaseException:
+                    # Cancelled: keep the batch for the next flush
+                    self._items[:0] = batch
+                    raise
+
+    def discard(self) -> None:
+        """Drop all buffered items and dead letters without writing them."""
+        self._items.clear()
+        self._dead_letters.clear()
+
+    async def close(self) -> None:
+        """Stop the flush timer and write all buffered items."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
+
+    async def _write(self, items: list[T]) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._flush_batch(items)
+                return
+            except Exception as e:
+                if attempt == self._max_retries or not is_retryable(e):
+                    raise
+                await asyncio.sleep(self._retry_delay * 2**attempt)
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        # A failure is logged by flush()
+        with contextlib.suppress(Exception):
+            await self.flush()
@@ -0,0 +1,192 @@
+"""
+Shared retrieval for Zep AutoGen memories used by several agents.
+
+This module provides a coordinator that coalesces the identical thread reads made
+by every agent of a team into one remote fetch.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import Message
+
+from .telemetry import TelemetrySink, report_cache_hit, timed_call
+
+
+class ZepMemoryCoordinator:
+    """
+    Coalesces thread context and history reads across ZepUserMemory instances.
+
+    Pass one coordinator to the memories of all agents in a team that share a user
+    and thread. Concurrent reads of the same thread context or history share a single
+    in-flight request (single-flight), and the result is reused for ttl seconds, so a
+    team of N agents makes one retrieval per turn instead of N. Messages written
+    through a coordinated memory invalidate the cached reads of their thread.
+
+    With a telemetry sink, only the caller that starts a remote fetch reports a Zep
+    call; reads served from the cache or joined to another caller's fetch are reported
+    as cache hits.
+
+    Args:
+        client: An initialized AsyncZep instance
+        ttl: Seconds a fetched result is reused; 0 only coalesces concurrent reads
+    """
+
+    def __init__(self, client: AsyncZep, ttl: float = 1.0) -> None:
+        if not isinstance(client, AsyncZep):
+            raise TypeError("client must be an instance of AsyncZep")
+
+        self._client = client
+        self._ttl = ttl
+
+        self._cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+        self._in_flight: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+        # Bumped on every write to a thread with reads in flight, so they are not cached
+        self._generations: dict[str, int] = {}
+        self._stats = {"remote_fetches": 0, "coalesced": 0, "cache_hits": 0}
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get counts of remote fetches, reads joined to an in-flight fetch, and cache hits."""
+        return dict(self._stats)
+
+    async def get_user_context(
+        self,
+        thread_id: str,
+        mode: str,
+        telemetry_sink: TelemetrySink | None = None,
+        component: str = "ZepMemoryCoordinator",
+    ) -> Any:
+        """
+        Get the user context of a thread, sharing the fetch with concurrent callers.
+
+        Args:
+            thread_id: The thread to get the context for
+            mode: Context mode ("basic" or "summary")
+            telemetry_sink: Optional sink receiving a ZepCallEvent for the read
+            component: Component the read is reported for, e.g. the calling memory class
+
+        Returns:
+            The thread.get_user_context response
+        """
+        return await self._fetch(
+            ("context", thread_id, mode),
+            thread_id,
+            lambda: self._client.thread.get_user_context(thread_id=thread_id, mode=mode),
+            "thread.get_user_context",
+            telemetry_sink,
+            component,
+        )
+
+    async def get_recent_messages(
+        self,
+        thread_id: str,
+        lastn: int,
+        telemetry_sink: TelemetrySink | None = None,
+        component: str = "ZepMemoryCoordinator",
+    ) -> list[Message]:
+        """
+        Get the most recent messages of a thread, sharing the fetch with concurrent callers.
+
+        Args:
+            thread_id: The thread to get messages from
+            lastn: Number of messages to get
+            telemetry_sink: Optional sink receiving a ZepCallEvent for the read
+            component: Component the read is reported for, e.g. the calling memory class
+
+        Returns:
+            The messages, oldest first
+        """
+
+        async def fetch() -> list[Message]:
+            thread = await self._client.thread.get(thread_id=thread_id, lastn=lastn)
+            return list(thread.messages or [])
+
+        messages = await self._fetch(
+            ("messages", thread_id, lastn),
+            thread_id,
+            fetch,
+            "thread.get",
+            telemetry_sink,
+            component,
+        )
+        return list(messages)
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop cached reads of a thread, e.g. after messages were added to it."""
+        if any(flight[1] == thread_id for flight in self._in_flight):
+            self._generations[thread_id] = self._generations.get(thread_id, 0) + 1
+        for key in [key for key in self._cache if key[1] == thread_id]:
+            del self._cache[key]
+
+    async def _fetch(
+        self,
+        key: tuple[Any, ...],
+        thread_id: str,
+        fetch: Callable[[], Awaitable[Any]],
+        operation: str,
+        telemetry_sink: TelemetrySink | None,
+        component: str,
+    ) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._stats["cache_hits"] += 1
+            report_cache_hit(telemetry_sink, operation, cached[1], component=component)
+            return cached[1]
+
+        generation = self._generations.get(thread_id, 0)
+        flight_key = (*key, generation)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            self._logger.debug(f"Fetching {key[0]} of thread {thread_id} from Zep")
+            self._stats["remote_fetches"] += 1
+
+            def timed_fetch() -> Awaitable[Any]:
+                return timed_call(
+                    telemetry_sink, operation, fetch(), component=component, cache="miss"
+                )
+
+            task = asyncio.create_task(
+                self._run(key, flight_key, thread_id, generation, timed_fetch)
+            )
+            self._in_flight[flight_key] = task
+            # Shield the shared fetch so one cancelled caller does not cancel it for the others
+            return await asyncio.shield(task)
+
+        self._stats["coalesced"] += 1
+        result = await asyncio.shield(task)
+        # Joined another caller's fetch, which reports the Zep call
+        report_cache_hit(telemetry_sink, operation, result, component=component)
+        return result
+
+    async def _run(
+        self,
+        key: tuple[Any, ...],
+        flight_key: tuple[Any, ...],
+        thread_id: str,
+        generation: int,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        try:
+            result = await fetch()
+            # Only cache results that no write has made stale while they were fetched
+            if self._ttl > 0 and self._generations.get(thread_id, 0) == generation:
+                now = time.monotonic()
+                # Drop expired reads so threads no longer read do not stay cached
+                for expired in [
+                    k for k, (expires_at, _) in self._cache.items() if expires_at <= now
+                ]:
+                    del self._cache[expired]
+                self._cache[key] = (now + self._ttl, result)
+            return result
+        finally:
+            self._in_flight.pop(flight_key, None)
+            # Generations only matter to fetches in flight
+            if not any(flight[1] == thread_id for flight in self._in_flight):
+                self._generations.pop(thread_id, None)
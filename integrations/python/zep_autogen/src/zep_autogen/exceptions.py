@@ -10,3 +10,43 @@ class ZepDependencyError(ImportError):
         self.framework = framework
         self.install_command = install_command
         super().__init__(f"{framework} dependencies not found. Install with: {install_command}")
+
+
+class ZepBatchAddError(Exception):
+    """Raised when some items of a batch add could not be written to Zep."""
+
+    def __init__(self, errors: dict[int, BaseException], total: int):
+        self.errors = errors
+        self.total = total
+        first = errors[min(errors)]
+        super().__init__(f"Failed to add {len(errors)} of {total} items to Zep: {first}")
+
+    @property
+    def failed_indices(self) -> list[int]:
+        """Indices of the items that were not written."""
+        return sorted(self.errors)
+
+    @property
+    def not_attempted_indices(self) -> list[int]:
+        """Indices of the items that were not sent, because an earlier ordered write failed."""
+        return sorted(
+            index
+            for index, error in self.errors.items()
+            if isinstance(error, ZepWriteNotAttemptedError)
+        )
+
+
+class ZepWriteNotAttemptedError(Exception):
+    """Recorded for items that were not sent because an earlier write they follow failed."""
+
+    def __init__(self, cause: BaseException):
+        self.cause = cause
+        super().__init__(f"Not attempted after an earlier write failed: {cause}")
+
+
+class ZepBufferFullError(Exception):
+    """Raised when a buffered add is rejected because the write buffer is full."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Write buffer is full ({max_size} items waiting to be written to Zep)")
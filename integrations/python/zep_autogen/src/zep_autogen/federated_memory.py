@@ -0,0 +1,412 @@
+"""
+Federated Zep memory for AutoGen.
+
+This module provides a memory that retrieves from a user graph and several shared
+graphs at once and injects a single merged context.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any
+
+from autogen_core import CancellationToken
+from autogen_core.memory import (
+    Memory,
+    MemoryContent,
+    MemoryMimeType,
+    MemoryQueryResult,
+    UpdateContextResult,
+)
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import SystemMessage
+from zep_cloud import GraphSearchResults, SearchFilters
+from zep_cloud.client import AsyncZep
+from zep_cloud.graph.utils import compose_context_string
+
+from .budget import TokenEstimator, estimate_tokens, pack_graph_results
+from .utils import run_cancellable
+
+# Constant from the reciprocal rank fusion paper; dampens the weight of top ranks
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(ranked_lists: list[list[Any]], k: int = RRF_K) -> list[Any]:
+    """
+    Merge ranked search results from several sources.
+
+    Each result scores 1 / (k + rank) in every list it appears in. Results are
+    deduplicated by UUID and returned by descending total score; ties keep the
+    order of the input lists.
+
+    Args:
+        ranked_lists: Search results (edges, nodes or episodes) per source, best first
+        k: Rank damping constant
+
+    Returns:
+        The fused results
+    """
+    scores: dict[str, float] = {}
+    items: dict[str, Any] = {}
+    for ranked in ranked_lists:
+        for rank, item in enumerate(ranked, start=1):
+            scores[item.uuid_] = scores.get(item.uuid_, 0.0) + 1.0 / (k + rank)
+            items.setdefault(item.uuid_, item)
+    return [items[uuid] for uuid in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+class ZepFederatedMemory(Memory):
+    """
+    A memory that retrieves from a user graph and several shared graphs concurrently.
+
+    On update_context() every source is searched for facts and entities in parallel
+    under one shared deadline. Sources that miss the deadline are skipped for that
+    turn. The results are merged with reciprocal rank fusion, deduplicated by UUID,
+    trimmed to the token budget and injected as a single system message. Per-source
+    latencies of the last retrieval are available from last_source_timings.
+
+    Args:
+        client: An initialized AsyncZep instance
+        user_id: Optional user whose graph is searched
+        graph_ids: Optional identifiers of shared graphs to search
+        search_filters: Optional filters applied to every graph search
+        facts_limit: Maximum number of facts (edges) retrieved per source
+        entity_limit: Maximum number of entities (nodes) retrieved per source
+        timeout: Shared deadline in seconds for all source searches; None waits for all
+        max_context_tokens: Optional budget for the injected context. Facts are kept
+            first, then entities, in fused rank order
+        token_estimator: Optional callable returning the token count of a string
+        **kwargs: Additional configuration options
+    """
+
+    def __init__(
+        self,
+        client: AsyncZep,
+        user_id: str | None = None,
+        graph_ids: list[str] | None = None,
+        search_filters: SearchFilters | None = None,
+        facts_limit: int = 20,
+        entity_limit: int = 5,
+        timeout: float | None = 2.0,
+        max_context_tokens: int | None = None,
+        token_estimator: TokenEstimator | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if not isinstance(client, AsyncZep):
+            raise TypeError("client must be an instance of AsyncZep")
+
+        if not user_id and not graph_ids:
+            raise ValueError("At least one of user_id or graph_ids is required")
+
+        self._client = client
+        self._user_id = user_id
+        self._graph_ids = list(graph_ids or [])
+        self._search_filters = search_filters
+        self._facts_limit = facts_limit
+        self._entity_limit = entity_limit
+        self._timeout = timeout
+        self._max_context_tokens = max_context_tokens
+        self._estimate_tokens = token_estimator or estimate_tokens
+
+        self._config = kwargs
+
+        # (user_id, graph_id) search target per source name; the user graph comes first
+        # so it wins rank ties
+        self._sources: dict[str, tuple[str | None, str | None]] = {}
+        if user_id:
+            self._sources[f"user:{user_id}"] = (user_id, None)
+        for graph_id in self._graph_ids:
+            self._sources[graph_id] = (None, graph_id)
+
+        self._last_timings: dict[str, float | None] = {}
+
+        # Set up module logger
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def sources(self) -> list[str]:
+        """Get the source names: user:<user_id> for the user graph, then the graph ids."""
+        return list(self._sources)
+
+    @property
+    def last_source_timings(self) -> dict[str, float | None]:
+        """
+        Get the per-source latencies of the most recent retrieval, in milliseconds.
+
+        Sources that missed the deadline or failed map to None.
+        """
+        return dict(self._last_timings)
+
+    async def add(
+        self,
+        content: MemoryContent,
+        cancellation_token: CancellationToken | None = None,
+    ) -> None:
+        """
+        Add data to one of the federated graphs.
+
+        The target is metadata["graph_id"] when set, otherwise the user graph.
+
+        Args:
+            content: The memory content to store
+            cancellation_token: Optional token; cancelling it aborts the in-flight Zep request
+
+        Raises:
+            ValueError: If the mime type is not supported or there is no target graph
+        """
+        supported_mime_types = {MemoryMimeType.TEXT, MemoryMimeType.MARKDOWN, MemoryMimeType.JSON}
+
+        if content.mime_type not in supported_mime_types:
+            raise ValueError(
+                f"Unsupported mime type: {content.mime_type}. "
+                f"ZepFederatedMemory only supports: "
+                f"{', '.join(str(mt) for mt in supported_mime_types)}"
+            )
+
+        metadata = content.metadata or {}
+        graph_id = metadata.get("graph_id")
+        if graph_id is not None and graph_id not in self._graph_ids:
+            raise ValueError(f"Graph {graph_id} is not one of this memory's graph_ids")
+        if graph_id is None and not self._user_id:
+            raise ValueError("metadata.graph_id is required when no user_id is configured")
+
+        if metadata.get("type") == "message":
+            data_type = "message"
+        elif content.mime_type == MemoryMimeType.JSON:
+            data_type = "json"
+        else:
+            data_type = "text"
+
+        if graph_id is not None:
+            await run_cancellable(
+                lambda: self._client.graph.add(
+                    graph_id=graph_id, type=data_type, data=str(content.content)
+                ),
+                cancellation_token,
+            )
+        else:
+            await run_cancellable(
+                lambda: self._client.graph.add(
+                    user_id=self._user_id, type=data_type, data=str(content.content)
+                ),
+                cancellation_token,
+            )
+
+    async def _search_sources(
+        self, query: str, scope_limits: dict[str, int]
+    ) -> dict[str, list[GraphSearchResults]]:
+        """
+        Search every source for every scope under the shared deadline.
+
+        Returns:
+            The search results per source that finished in time
+        """
+
+        async def search_source(
+            user_id: str | None, graph_id: str | None
+        ) -> list[GraphSearchResults]:
+            return list(
+                await asyncio.gather(
+                    *[
+                        self._client.graph.search(
+                            user_id=user_id,
+                            graph_id=graph_id,
+                            query=query,
+                            limit=limit,
+                            scope=scope,
+                            search_filters=self._search_filters,
+                        )
+                        for scope, limit in scope_limits.items()
+                    ]
+                )
+            )
+
+        started = time.perf_counter()
+        timings: dict[str, float | None] = dict.fromkeys(self._sources)
+
+        def record_latency(name: str, task: asyncio.Task[Any]) -> None:
+            if not task.cancelled() and task.exception() is None:
+                timings[name] = (time.perf_counter() - started) * 1000
+
+        tasks: dict[str, asyncio.Task[list[GraphSearchResults]]] = {}
+        for name, (user_id, graph_id) in self._sources.items():
+            task = asyncio.create_task(search_source(user_id, graph_id))
+            task.add_done_callback(functools.partial(record_latency, name))
+            tasks[name] = task
+
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self._timeout)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        results: dict[str, list[GraphSearchResults]] = {}
+        for name, task in tasks.items():
+            if task in pending:
+                self._logger.warning(f"Zep source {name} missed the retrieval deadline")
+            elif task.exception() is not None:
+                self._logger.error(f"Error searching Zep source {name}: {task.exception()}")
+            else:
+                results[name] = task.result()
+
+        self._last_timings = timings
+        self._logger.debug(f"Zep federated retrieval timings: {timings}")
+        return results
+
+    async def _retrieve_context(self, query: str) -> MemoryContent | None:
+        """Search all sources and compose the fused, budgeted context."""
+        source_results = await self._search_sources(
+            query, {"edges": self._facts_limit, "nodes": self._entity_limit}
+        )
+
+        edge_lists = []
+        node_lists = []
+        for results in source_results.values():
+            for result in results:
+                edge_lists.append(result.edges or [])
+                node_lists.append(result.nodes or [])
+
+        edges = reciprocal_rank_fusion(edge_lists)
+        nodes = reciprocal_rank_fusion(node_lists)
+        if self._max_context_tokens is not None:
+            edges, nodes = pack_graph_results(
+                edges, nodes, self._max_context_tokens, self._estimate_tokens
+            )
+        if not edges and not nodes:
+            return None
+
+        return MemoryContent(
+            content=compose_context_string(edges, nodes, []),
+            mime_type=MemoryMimeType.TEXT,
+            metadata={"source": "federated_context", "sources": list(source_results)},
+        )
+
+    async def query(
+        self,
+        query: str | MemoryContent,
+        cancellation_token: CancellationToken | None = None,
+        **kwargs: Any,
+    ) -> MemoryQueryResult:
+        """
+        Search all sources and return the fused facts and entities.
+
+        Args:
+            query: Search query string or MemoryContent
+            cancellation_token: Optional token; cancelling it aborts the in-flight searches
+            **kwargs: Additional query parameters; limit caps the number of results
+
+        Returns:
+            MemoryQueryResult containing matching memories, best first
+        """
+        query_str = str(query.content) if isinstance(query, MemoryContent) else query
+        limit = kwargs.pop("limit", 5)
+
+        results: list[MemoryContent] = []
+        try:
+            source_results = await run_cancellable(
+                lambda: self._search_sources(query_str, {"edges": limit, "nodes": limit}),
+                cancellation_token,
+            )
+        except Exception as e:
+            self._logger.error(f"Error querying Zep memory: {e}")
+            return MemoryQueryResult(results=results)
+
+        origin: dict[str, str] = {}
+        edge_lists = []
+        node_lists = []
+        for name, source in source_results.items():
+            for result in source:
+                for edge in result.edges or []:
+                    origin.setdefault(edge.uuid_, name)
+                for node in result.nodes or []:
+                    origin.setdefault(node.uuid_, name)
+                edge_lists.append(result.edges or [])
+                node_lists.append(result.nodes or [])
+
+        for edge in reciprocal_rank_fusion(edge_lists)[:limit]:
+            results.append(
+                MemoryContent(
+                    content=edge.fact,
+                    mime_type=MemoryMimeType.TEXT,
+                    metadata={
+                        "source": origin[edge.uuid_],
+                        "edge_name": edge.name,
+                        "created_at": edge.created_at,
+                        "valid_at": edge.valid_at,
+                        "invalid_at": edge.invalid_at,
+                    },
+                )
+            )
+        for node in reciprocal_rank_fusion(node_lists)[: max(0, limit - len(results))]:
+            results.append(
+                MemoryContent(
+                    content=f"{node.name}:\n {node.summary}",
+                    mime_type=MemoryMimeType.TEXT,
+                    metadata={
+                        "source": origin[node.uuid_],
+                        "node_name": node.name,
+                        "created_at": node.created_at,
+                    },
+                )
+            )
+
+        return MemoryQueryResult(results=results)
+
+    async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
+        """
+        Update the agent's model context with context merged from all sources.
+
+        The search query is built from the most recent messages in the model context.
+
+        Args:
+            model_context: The model context to update
+
+        Returns:
+            UpdateContextResult with the memories that were retrieved
+        """
+        try:
+            messages = await model_context.get_messages()
+            recent = [
+                message.content
+                for message in messages[-4:]
+                if not isinstance(message, SystemMessage) and isinstance(message.content, str)
+            ]
+            if not recent:
+                return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+            # trim query to 400 chars
+            query = "\n".join(recent)[-400:]
+            context = await self._retrieve_context(query)
+            if context is None:
+                return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+            await model_context.add_message(SystemMessage(content=str(context.content)))
+            return UpdateContextResult(memories=MemoryQueryResult(results=[context]))
+
+        except Exception as e:
+            # Log error but don't fail completely
+            self._logger.error(f"Error updating context with Zep memory: {e}")
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
+    async def clear(self) -> None:
+        """
+        Clear the state held by this memory.
+
+        The federated graphs are shared with other memories and are left untouched;
+        clear them individually, e.g. with ZepGraphMemory.clear(), to delete their data.
+        """
+        self._last_timings = {}
+        self._logger.info(
+            f"Cleared ZepFederatedMemory state; its source graphs were left intact: "
+            f"{', '.join(self._sources)}"
+        )
+
+    async def close(self) -> None:
+        """
+        Clean up Zep client resources.
+
+        Note: This method does not close the AsyncZep instance since it was
+        provided externally. The caller is responsible for managing the client lifecycle.
+        """
+        pass
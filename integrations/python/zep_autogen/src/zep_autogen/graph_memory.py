@@ -5,8 +5,11 @@ This module provides memory classes that integrate Zep with AutoGen's memory sys
 """
 
 import asyncio
+import functools
 import logging
-from typing import Any
+import time
+from collections.abc import Awaitable, Sequence
+from typing import Any, TypeVar
 
 from autogen_core import CancellationToken
 from autogen_core.memory import (
@@ -21,6 +24,24 @@ from autogen_core.models import SystemMessage
 from zep_cloud import GraphSearchResults, SearchFilters
 from zep_cloud.client import AsyncZep
 from zep_cloud.graph.utils import compose_context_string
+from zep_cloud.types import EpisodeData
+
+from .batch import DEFAULT_MAX_CONCURRENCY, write_in_chunks
+from .budget import TokenEstimator, estimate_tokens, pack_graph_results
+from .buffer import MAX_EPISODES_PER_BATCH, WriteBuffer
+from .exceptions import ZepBatchAddError
+from .ingestion import IngestionQueue
+from .query_builder import QueryBuilder
+from .results import (
+    graph_results_to_memory_content,
+    merge_scope_results,
+    resolve_scope_limits,
+    to_query_result,
+)
+from .telemetry import TelemetrySink, report_cache_hit, timed_call
+from .utils import run_cancellable
+
+T = TypeVar("T")
 
 
 class ZepGraphMemory(Memory):
@@ -42,6 +63,18 @@ class ZepGraphMemory(Memory):
         search_filters: SearchFilters | None = None,
         facts_limit: int = 20,
         entity_limit: int = 5,
+        buffer_size: int | None = None,
+        flush_interval: float = 1.0,
+        background_refresh: bool = False,
+        ingestion_queue_size: int | None = None,
+        ingestion_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_context_tokens: int | None = None,
+        token_estimator: TokenEstimator | None = None,
+        warm_start: bool = False,
+        telemetry_sink: TelemetrySink | None = None,
+        query_window: int = 4,
+        context_cache_ttl: float = 30.0,
+        extraction_delay: float = 5.0,
         **kwargs: Any,
     ) -> None:
         """
@@ -50,6 +83,34 @@ class ZepGraphMemory(Memory):
         Args:
             client: An initialized AsyncZep instance
             graph_id: Identifier of the graph in Zep (required)
+            search_filters: Optional filters for graph searches
+            facts_limit: Maximum number of facts (edges) retrieved for context
+            entity_limit: Maximum number of entities (nodes) retrieved for context
+            buffer_size: Enables buffered writes. Adds are accumulated and written with
+                graph.add_batch in batches of up to this many items (at most 20)
+            flush_interval: Maximum time in seconds a buffered add waits before being written
+            background_refresh: Refresh the cached graph context in the background after
+                each add() and update_context(), so the next turn usually finds it warm
+            ingestion_queue_size: Enables background ingestion. add() queues the data and
+                returns, and background workers write it with graph.add_batch. add() only
+                waits when this many items are waiting. Cannot be combined with buffer_size
+            ingestion_concurrency: Number of graph.add_batch calls made at the same time by
+                the background ingestion workers
+            max_context_tokens: Optional token budget for the graph context. Facts are kept
+                first, then entities, in rank order
+            token_estimator: Optional callable returning the token count of a string, e.g.
+                a tokenizer for the agent's model. Defaults to about four characters per token
+            warm_start: Start prefetch() in the background when the memory is created inside
+                a running event loop, so the first update_context finds a warm graph context
+            telemetry_sink: Optional callable receiving a ZepCallEvent with the timing,
+                result count, size and cache status of every Zep call, e.g.
+                log_to_autogen_events or a LatencyAggregator
+            query_window: Number of recent turns (added data and model context messages)
+                the graph context search query is built from
+            context_cache_ttl: Maximum age in seconds of the cached graph context
+            extraction_delay: Time in seconds Zep is given to extract facts from added data.
+                A graph context retrieved sooner after a write is only cached until then,
+                and with background_refresh it is refreshed again once it has passed
             **kwargs: Additional configuration options
         """
         if not isinstance(client, AsyncZep):
@@ -58,17 +119,89 @@ class ZepGraphMemory(Memory):
         if not graph_id:
             raise ValueError("graph_id is required")
 
+        if buffer_size and ingestion_queue_size:
+            raise ValueError("buffer_size and ingestion_queue_size cannot be combined")
+
+        if context_cache_ttl <= 0:
+            raise ValueError("context_cache_ttl must be positive")
+
         self._client = client
         self._graph_id = graph_id
         self._search_filters = search_filters
         self._facts_limit = facts_limit
         self._entity_limit = entity_limit
+        self._max_context_tokens = max_context_tokens
+        self._estimate_tokens = token_estimator or estimate_tokens
+        self._telemetry_sink = telemetry_sink
 
         self._config = kwargs
 
+        # Search query built locally from recent turns, and the graph context cached under
+        # the salient terms of the query it was retrieved with, until it expires
+        self._query_builder = QueryBuilder(max_turns=query_window)
+        self._context_cache: tuple[frozenset[str], MemoryContent | None, float] | None = None
+        self._context_cache_ttl = context_cache_ttl
+        self._extraction_delay = extraction_delay
+        self._last_write_at: float | None = None
+        self._background_refresh = background_refresh
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._delayed_refresh: asyncio.TimerHandle | None = None
+        # Set by prefetch(): the next update_context serves the cached context even though
+        # its own messages changed the query terms
+        self._warm_start = False
+
+        # Optional write buffer; reads flush it first so they see their own writes
+        self._buffer: WriteBuffer[EpisodeData] | None = None
+        if buffer_size:
+            self._buffer = WriteBuffer(
+                self._write_batch,
+                max_batch_size=min(buffer_size, MAX_EPISODES_PER_BATCH),
+                flush_interval=flush_interval,
+            )
+
+        # Optional background ingestion; reads do not wait for it
+        self._ingestion: IngestionQueue[EpisodeData] | None = None
+        if ingestion_queue_size:
+            self._ingestion = IngestionQueue(
+                self._write_batch,
+                max_size=ingestion_queue_size,
+                max_batch_size=MAX_EPISODES_PER_BATCH,
+                max_concurrency=ingestion_concurrency,
+            )
+
         # Set up module logger
         self._logger = logging.getLogger(__name__)
 
+        if warm_start:
+            self.start_prefetch()
+
+    async def prefetch(self) -> None:
+        """
+        Build the graph context ahead of the first model call.
+
+        Builds the search query (seeding it from the graph's latest episodes when no turn
+        has been seen yet) and runs the fact and entity searches, caching the composed
+        context. The next update_context reuses it while it has not expired, even if the
+        turn's messages change the query terms. Errors are logged, not raised.
+        """
+        await self._flush_before_read()
+        await self._refresh_context()
+        self._warm_start = self._context_cache is not None
+
+    def start_prefetch(self) -> None:
+        """
+        Run prefetch() as a background task.
+
+        Does nothing if a prefetch or refresh is already running or there is no running
+        event loop.
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.prefetch())
+        except RuntimeError:
+            self._logger.debug("No running event loop, call prefetch() to warm the memory")
+
     async def add(
         self,
         content: MemoryContent,
@@ -80,11 +213,82 @@ class ZepGraphMemory(Memory):
         Uses metadata.type to determine the data type:
 
         Args:
-            entry: The memory content to store
+            content: The memory content to store
+            cancellation_token: Optional token; cancelling it aborts the in-flight Zep request
 
         Raises:
             ValueError: If the memory content mime type or metadata type is not supported
         """
+        episode = self._to_episode(content)
+        self._query_builder.add(episode.data)
+
+        # Add data to user's graph
+        if self._ingestion is not None:
+            await run_cancellable(
+                functools.partial(self._ingestion.put, episode), cancellation_token
+            )
+        elif self._buffer is not None:
+            await run_cancellable(functools.partial(self._buffer.put, episode), cancellation_token)
+        else:
+            await run_cancellable(
+                lambda: self._timed(
+                    "graph.add",
+                    self._client.graph.add(
+                        graph_id=self._graph_id, type=episode.type, data=episode.data
+                    ),
+                    sent=episode.data,
+                ),
+                cancellation_token,
+            )
+            self._after_write()
+
+    async def add_many(
+        self,
+        contents: list[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Add several memory entries with graph.add_batch.
+
+        Items are written up to 20 per call, with at most max_concurrency calls in
+        flight. Buffered writes are flushed first.
+
+        Args:
+            contents: The memory contents to store
+            cancellation_token: Optional token; cancelling it aborts the in-flight Zep requests
+            max_concurrency: Largest number of graph.add_batch calls in flight
+
+        Raises:
+            ValueError: If a content's mime type is not supported. Nothing is written
+                in that case
+            ZepBatchAddError: If some items could not be written; the others were
+        """
+        episodes = [self._to_episode(content) for content in contents]
+        for episode in episodes:
+            self._query_builder.add(episode.data)
+
+        await run_cancellable(self.flush, cancellation_token)
+        chunk_errors = await run_cancellable(
+            lambda: write_in_chunks(
+                episodes, self._write_batch, MAX_EPISODES_PER_BATCH, max_concurrency
+            ),
+            cancellation_token,
+        )
+
+        errors = {index: error for index, error in enumerate(chunk_errors) if error is not None}
+        if errors:
+            raise ZepBatchAddError(errors, total=len(episodes))
+
+    def _to_episode(self, content: MemoryContent) -> EpisodeData:
+        """
+        Convert memory content to a graph episode.
+
+        Uses metadata.type "message" for message episodes, otherwise maps the mime type.
+
+        Raises:
+            ValueError: If the memory content mime type is not supported
+        """
         # Validate mime type - only support TEXT, MARKDOWN, and JSON
         supported_mime_types = {MemoryMimeType.TEXT, MemoryMimeType.MARKDOWN, MemoryMimeType.JSON}
 
@@ -111,67 +315,75 @@ class ZepGraphMemory(Memory):
         else:
             data_type = "text"  # Default for string or unknown types
 
-        # Add data to user's graph
-        await self._client.graph.add(
-            graph_id=self._graph_id, type=data_type, data=str(content.content)
+        return EpisodeData(data=str(content.content), type=data_type)
+
+    async def _write_batch(self, episodes: list[EpisodeData]) -> None:
+        """Add a batch of data to the graph."""
+        await self._timed(
+            "graph.add_batch",
+            self._client.graph.add_batch(graph_id=self._graph_id, episodes=episodes),
+            sent=episodes,
         )
+        self._after_write()
 
-    def _graph_results_to_memory_content(
-        self, graph_results: GraphSearchResults
-    ) -> list[MemoryContent]:
+    async def flush(self) -> None:
         """
-        Helper method to convert graph search results to MemoryContent.
+        Write all buffered or queued data to Zep. A no-op when neither is enabled.
+
+        Raises:
+            Exception: The error of a write that failed. The failed data is not written
+                again; it is kept in failed_writes
         """
-        results = []
-        # Add graph search results
-        if graph_results.edges:
-            for edge in graph_results.edges:
-                results.append(
-                    MemoryContent(
-                        content=edge.fact,
-                        mime_type=MemoryMimeType.TEXT,
-                        metadata={
-                            "source": "graph",
-                            "edge_name": edge.name,
-                            "edge_attributes": edge.attributes or {},
-                            "created_at": edge.created_at,
-                            "expired_at": edge.expired_at,
-                            "valid_at": edge.valid_at,
-                            "invalid_at": edge.invalid_at,
-                        },
-                    )
-                )
-        if graph_results.nodes:
-            for node in graph_results.nodes:
-                results.append(
-                    MemoryContent(
-                        content=f"{node.name}:\n {node.summary}",
-                        mime_type=MemoryMimeType.TEXT,
-                        metadata={
-                            "source": "graph",
-                            "node_name": node.name,
-                            "node_attributes": node.attributes or {},
-                            "created_at": node.created_at,
-                        },
-                    )
-                )
-        if graph_results.episodes:
-            for episode in graph_results.episodes:
-                results.append(
-                    MemoryContent(
-                        content=episode.content,
-                        mime_type=MemoryMimeType.TEXT,
-                        metadata={
-                            "source": "graph",
-                            "episode_type": episode.source,
-                            "episode_role": episode.role_type,
-                            "episode_name": episode.role,
-                            "created_at": episode.created_at,
-                        },
-                    )
-                )
+        if self._buffer is not None:
+            await self._buffer.flush()
+        if self._ingestion is not None:
+            await self._ingestion.flush()
+
+    @property
+    def failed_writes(self) -> list[EpisodeData]:
+        """Get the buffered or queued data that could not be written, oldest first."""
+        if self._buffer is not None:
+            return self._buffer.dead_letters
+        if self._ingestion is not None:
+            return self._ingestion.failed
+        return []
+
+    def clear_failed_writes(self) -> list[EpisodeData]:
+        """Remove and return the data that could not be written, e.g. to add it again."""
+        if self._buffer is not None:
+            return self._buffer.clear_dead_letters()
+        if self._ingestion is not None:
+            return self._ingestion.clear_failed()
+        return []
+
+    @property
+    def ingestion_stats(self) -> dict[str, float] | None:
+        """
+        Get the state of background ingestion, or None when it is off.
+
+        Keys are depth (items not yet written), lag_s (age in seconds of the oldest of
+        them), and counts of items enqueued, written and failed, batches and retries.
+        """
+        return self._ingestion.stats if self._ingestion is not None else None
+
+    def _timed(self, operation: str, call: Awaitable[T], **fields: Any) -> Awaitable[T]:
+        """Time a Zep call, reporting it to the telemetry sink."""
+        return timed_call(
+            self._telemetry_sink, operation, call, component=type(self).__name__, **fields
+        )
+
+    async def _flush_before_read(self) -> None:
+        """
+        Flush buffered writes so reads see them, logging rather than raising errors.
 
-        return results
+        Queued background writes are not waited for; flush() does that.
+        """
+        if self._buffer is None:
+            return
+        try:
+            await self._buffer.flush()
+        except Exception as e:
+            self._logger.error(f"Error flushing buffered writes to Zep: {e}")
 
     async def query(
         self,
@@ -184,11 +396,18 @@ class ZepGraphMemory(Memory):
 
         Args:
             query: Search query string or MemoryContent
-            cancellation_token: Optional cancellation token
-            **kwargs: Additional query parameters
+            cancellation_token: Optional token; cancelling it aborts the in-flight search
+            **kwargs: Additional query parameters. scopes (a list of "edges", "nodes" and
+                "episodes", or a mapping of scope to limit) searches each scope
+                concurrently and merges the results by score, with the scope and score
+                of each result in its metadata. lazy=True returns a LazyMemoryQueryResult
+                that builds each MemoryContent only when it is accessed
 
         Returns:
             MemoryQueryResult containing matching memories
+
+        Raises:
+            ValueError: If scopes contains an unsupported scope
         """
         # Convert query to string if it's MemoryContent
         if isinstance(query, MemoryContent):
@@ -198,56 +417,128 @@ class ZepGraphMemory(Memory):
 
         # Extract limit from kwargs for backward compatibility
         limit = kwargs.pop("limit", 5)
+        scopes = kwargs.pop("scopes", None)
+        scope_limits = resolve_scope_limits(scopes, limit) if scopes is not None else None
+        lazy = kwargs.pop("lazy", False)
+
+        results: Sequence[MemoryContent] = []
 
-        results = []
+        await self._flush_before_read()
 
         try:
-            # Search the user's graph
-            graph_results = await self._client.graph.search(
-                graph_id=self._graph_id,
-                query=query_str,
-                limit=limit,
-                search_filters=self._search_filters,
-                **kwargs,
-            )
-            results = self._graph_results_to_memory_content(graph_results)
+            if scope_limits is not None:
+                # Search the graph once per scope, concurrently
+                scope_results = await run_cancellable(
+                    lambda: asyncio.gather(
+                        *[
+                            self._timed(
+                                "graph.search",
+                                self._client.graph.search(
+                                    graph_id=self._graph_id,
+                                    query=query_str,
+                                    limit=scope_limit,
+                                    scope=scope,
+                                    search_filters=self._search_filters,
+                                    **kwargs,
+                                ),
+                                scope=scope,
+                            )
+                            for scope, scope_limit in scope_limits.items()
+                        ]
+                    ),
+                    cancellation_token,
+                )
+                results = merge_scope_results(
+                    dict(zip(scope_limits, scope_results, strict=True)),
+                    source="graph",
+                    lazy=lazy,
+                )
+            else:
+                # Search the graph
+                graph_results = await run_cancellable(
+                    lambda: self._timed(
+                        "graph.search",
+                        self._client.graph.search(
+                            graph_id=self._graph_id,
+                            query=query_str,
+                            limit=limit,
+                            search_filters=self._search_filters,
+                            **kwargs,
+                        ),
+                        scope=kwargs.get("scope"),
+                    ),
+                    cancellation_token,
+                )
+                results = graph_results_to_memory_content(graph_results, source="graph", lazy=lazy)
 
         except Exception as e:
             # Log error but don't fail completely
             self._logger.error(f"Error querying Zep memory: {e}")
 
-        return MemoryQueryResult(results=results)
+        return to_query_result(results)
 
     async def _retrieve_graph_context(self) -> MemoryContent | None:
-        recent_messages = await self._client.graph.episode.get_by_graph_id(
-            graph_id=self._graph_id, lastn=2
-        )
-        if not recent_messages.episodes:
+        """
+        Build the graph context from the recent turns.
+
+        The search query is built locally from the salient terms of the data added and
+        the messages seen recently; the graph's latest episodes are only fetched to seed
+        it when nothing has been added or seen yet. The composed context is cached under
+        the query's terms, and while those are unchanged the edge and node searches are
+        skipped and the cached context is returned, until it expires. The expiry is what
+        picks up data written to the graph by other clients, which this cache cannot see.
+        """
+        if not len(self._query_builder):
+            recent_messages = await self._timed(
+                "graph.episode.get_by_graph_id",
+                self._client.graph.episode.get_by_graph_id(graph_id=self._graph_id, lastn=2),
+            )
+            for episode in recent_messages.episodes or []:
+                self._query_builder.add(episode.content)
+
+        query = self._query_builder.query()
+        if not query:
             return None
-        query = ""
-        for msg in recent_messages.episodes:
-            query += f"{msg.content}\n"
 
-        # trim query to 400 chars
-        query = query[-400:]
+        cache_key = self._query_builder.cache_key()
+        if (
+            self._context_cache is not None
+            and self._context_cache[0] == cache_key
+            and time.monotonic() < self._context_cache[2]
+        ):
+            self._logger.debug("Recent turns unchanged, reusing cached graph context")
+            self._report_context_cache_hit()
+            return self._context_cache[1]
+
+        started = time.monotonic()
         search_functions = []
 
         search_functions.append(
-            self._client.graph.search(
-                graph_id=self._graph_id,
-                query=query,
-                limit=self._facts_limit,
+            self._timed(
+                "graph.search",
+                self._client.graph.search(
+                    graph_id=self._graph_id,
+                    query=query,
+                    limit=self._facts_limit,
+                    scope="edges",
+                    search_filters=self._search_filters,
+                ),
                 scope="edges",
-                search_filters=self._search_filters,
+                cache="miss",
             )
         )
         search_functions.append(
-            self._client.graph.search(
-                graph_id=self._graph_id,
-                query=query,
-                limit=self._entity_limit,
+            self._timed(
+                "graph.search",
+                self._client.graph.search(
+                    graph_id=self._graph_id,
+                    query=query,
+                    limit=self._entity_limit,
+                    scope="nodes",
+                    search_filters=self._search_filters,
+                ),
                 scope="nodes",
-                search_filters=self._search_filters,
+                cache="miss",
             )
         )
 
@@ -261,21 +552,84 @@ class ZepGraphMemory(Memory):
                 edges.extend(result.edges)
             if result.nodes:
                 nodes.extend(result.nodes)
-        if not edges and not nodes:
-            return None
-        context = compose_context_string(edges, nodes, [])
-        return MemoryContent(
-            content=context,
-            mime_type=MemoryMimeType.TEXT,
-            metadata={"source": "graph_context"},
-        )
+
+        if self._max_context_tokens is not None:
+            edges, nodes = pack_graph_results(
+                edges, nodes, self._max_context_tokens, self._estimate_tokens
+            )
+
+        graph_context = None
+        if edges or nodes:
+            context = compose_context_string(edges, nodes, [])
+            graph_context = MemoryContent(
+                content=context,
+                mime_type=MemoryMimeType.TEXT,
+                metadata={"source": "graph_context"},
+            )
+
+        expires_at = started + self._context_cache_ttl
+        if self._last_write_at is not None:
+            # Facts from a recent write may not be extracted yet
+            settled_at = self._last_write_at + self._extraction_delay
+            if started < settled_at:
+                expires_at = min(expires_at, settled_at)
+        self._context_cache = (cache_key, graph_context, expires_at)
+        return graph_context
+
+    def _report_context_cache_hit(self) -> None:
+        """Report the searches skipped by reusing the cached graph context."""
+        for scope in ("edges", "nodes"):
+            report_cache_hit(
+                self._telemetry_sink,
+                "graph.search",
+                None,
+                component=type(self).__name__,
+                scope=scope,
+            )
+
+    def _after_write(self) -> None:
+        """
+        Note a write to the graph.
+
+        The cached context is kept at most until the written data has had time to be
+        extracted. With background_refresh it is refreshed now, for the turns until
+        then, and again once extraction should be done.
+        """
+        self._last_write_at = time.monotonic()
+        settled_at = self._last_write_at + self._extraction_delay
+        if self._context_cache is not None and self._context_cache[2] > settled_at:
+            cache_key, graph_context, _ = self._context_cache
+            self._context_cache = (cache_key, graph_context, settled_at)
+
+        self._schedule_context_refresh()
+        if self._background_refresh:
+            if self._delayed_refresh is not None:
+                self._delayed_refresh.cancel()
+            self._delayed_refresh = asyncio.get_running_loop().call_later(
+                self._extraction_delay, self._schedule_context_refresh
+            )
+
+    def _schedule_context_refresh(self) -> None:
+        """Start a background refresh of the cached graph context, if none is running."""
+        if not self._background_refresh:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_context())
+
+    async def _refresh_context(self) -> None:
+        try:
+            await self._retrieve_graph_context()
+        except Exception as e:
+            self._logger.debug(f"Background graph context refresh failed: {e}")
 
     async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
         """
         Update the agent's model context with retrieved memories.
 
         Gets memory from Zep, and if memory exists, includes up to 10 last messages
-        from history and adds the memory context as a system message.
+        from history and adds the memory context as a system message. The most recent
+        messages of the model context join the window the search query is built from.
 
         Args:
             model_context: The model context to update
@@ -288,7 +642,27 @@ class ZepGraphMemory(Memory):
             messages = await model_context.get_messages()
             if not messages:
                 return UpdateContextResult(memories=MemoryQueryResult(results=[]))
-            graph_context = await self._retrieve_graph_context()
+            await self._flush_before_read()
+            for message in messages[-self._query_builder.max_turns :]:
+                if not isinstance(message, SystemMessage) and isinstance(message.content, str):
+                    self._query_builder.add(message.content)
+            if self._refresh_task is not None and not self._refresh_task.done():
+                # A background refresh is already warming the cache; reuse its work. If
+                # close() cancels it, this turn retrieves the context itself
+                await asyncio.wait([self._refresh_task])
+            warm_start, self._warm_start = self._warm_start, False
+            if (
+                warm_start
+                and self._context_cache is not None
+                and time.monotonic() < self._context_cache[2]
+            ):
+                # The first turn after prefetch() is served from it, though the turn's
+                # messages changed the query terms
+                graph_context = self._context_cache[1]
+                self._report_context_cache_hit()
+            else:
+                graph_context = await self._retrieve_graph_context()
+            self._schedule_context_refresh()
             if not graph_context:
                 return UpdateContextResult(memories=MemoryQueryResult(results=[]))
             await model_context.add_message(SystemMessage(content=str(graph_context.content)))
@@ -306,19 +680,35 @@ class ZepGraphMemory(Memory):
         This will delete the entire session and all its messages.
         Note: This operation cannot be undone.
         """
+        if self._buffer is not None:
+            self._buffer.discard()
+        if self._ingestion is not None:
+            self._ingestion.discard()
+        self._context_cache = None
+        self._warm_start = False
+        self._query_builder.clear()
+        if self._delayed_refresh is not None:
+            self._delayed_refresh.cancel()
+            self._delayed_refresh = None
+
         try:
-            await self._client.graph.delete(graph_id=self._graph_id)
+            await self._timed("graph.delete", self._client.graph.delete(graph_id=self._graph_id))
         except Exception as e:
             self._logger.error(f"Error clearing Zep graph: {e}")
             raise
 
     async def close(self) -> None:
         """
-        Clean up Zep client resources.
+        Flush buffered writes and clean up Zep client resources.
 
         Note: This method does not close the AsyncZep instance since it was
         provided externally. The caller is responsible for managing the client lifecycle.
         """
-        # The client was provided externally, so we don't close it here
-        # The caller is responsible for closing the client when appropriate
-        pass
+        if self._buffer is not None:
+            await self._buffer.close()
+        if self._ingestion is not None:
+            await self._ingestion.close()
+        if self._delayed_refresh is not None:
+            self._delayed_refresh.cancel()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
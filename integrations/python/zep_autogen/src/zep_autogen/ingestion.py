@@ -0,0 +1,202 @@
+"""
+Background ingestion for Zep AutoGen memories.
+
+This module provides a bounded queue drained by background workers, so that
+writes to Zep do not hold up the agent that makes them.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from .batch import DEFAULT_MAX_CONCURRENCY
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionQueue(Generic[T]):
+    """
+    Bounded queue of writes drained in batches by background workers.
+
+    put() returns as soon as the item is queued. Up to max_concurrency workers
+    take whatever is waiting, up to max_batch_size items at a time, and write it.
+    When max_size items are waiting, put() blocks until the workers make room
+    (backpressure). A failed batch is retried with exponential backoff; if it
+    still fails, its items are moved to failed and the next flush() raises the
+    error once. They are not written again unless the caller takes them with
+    clear_failed() and queues them again.
+
+    Args:
+        write_batch: Coroutine function that writes one batch of items to Zep
+        max_size: Largest number of items waiting to be written, and of failed items kept
+        max_batch_size: Largest number of items written per call
+        max_concurrency: Number of batches written at the same time
+        max_retries: Number of times a failed batch is retried
+        retry_delay: Delay in seconds before the first retry, doubled for each retry
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[T]], Awaitable[None]],
+        max_size: int = 1000,
+        max_batch_size: int = 20,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = 2,
+        retry_delay: float = 0.5,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._write_batch = write_batch
+        self._max_size = max_size
+        self._max_batch_size = max_batch_size
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+
+        # Waiting items with the time they were queued
+        self._items: deque[tuple[float, T]] = deque()
+        # Queue time of the oldest item of each batch being written
+        self._in_flight: list[float] = []
+        self._in_flight_items = 0
+        # Items whose batch failed all its retries, oldest dropped beyond max_size
+        self._failed: deque[T] = deque(maxlen=max_size)
+        self._error: BaseException | None = None
+
+        self._condition = asyncio.Condition()
+        self._workers: list[asyncio.Task[None]] = []
+        self._closed = False
+        self._stats = {"enqueued": 0, "written": 0, "failed": 0, "batches": 0, "retries": 0}
+
+    @property
+    def depth(self) -> int:
+        """Get the number of items not yet written, including batches being written."""
+        return len(self._items) + self._in_flight_items
+
+    @property
+    def failed(self) -> list[T]:
+        """Get the items of batches that failed all their retries, oldest first."""
+        return list(self._failed)
+
+    def clear_failed(self) -> list[T]:
+        """Remove and return the items of failed batches, e.g. to queue them again."""
+        items = list(self._failed)
+        self._failed.clear()
+        return items
+
+    @property
+    def lag(self) -> float:
+        """Get the time in seconds the oldest item not yet written has been queued."""
+        oldest = [*self._in_flight, *([self._items[0][0]] if self._items else [])]
+        return time.monotonic() - min(oldest) if oldest else 0.0
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Get the depth and lag, and counts of items queued, written and failed."""
+        return {"depth": self.depth, "lag_s": self.lag, **self._stats}
+
+    async def put(self, item: T) -> None:
+        """
+        Queue an item, waiting for room if max_size items are already waiting.
+
+        Raises:
+            RuntimeError: If the queue is closed
+        """
+        if self._closed:
+            raise RuntimeError("IngestionQueue is closed")
+        self._start_workers()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: len(self._items) < self._max_size)
+            self._items.append((time.monotonic(), item))
+            self._stats["enqueued"] += 1
+            self._condition.notify_all()
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued item is written.
+
+        Raises:
+            Exception: The last error of a batch that could not be written since the
+                previous flush(). Its items are in failed
+        """
+        if self._items or self._in_flight_items:
+            self._start_workers()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._items and not self._in_flight_items)
+            error, self._error = self._error, None
+
+        if error is not None:
+            raise error
+
+    def discard(self) -> None:
+        """Drop all waiting and failed items without writing them."""
+        self._items.clear()
+        self._failed.clear()
+        self._error = None
+
+    async def close(self) -> None:
+        """Write all queued items and stop the workers."""
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            async with self._condition:
+                self._condition.notify_all()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers.clear()
+
+    def _start_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self._max_concurrency:
+            self._workers.append(asyncio.create_task(self._work()))
+
+    async def _work(self) -> None:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: bool(self._items) or self._closed)
+                if not self._items:
+                    return
+                count = min(len(self._items), self._max_batch_size)
+                batch = [self._items.popleft() for _ in range(count)]
+                queued_at = batch[0][0]
+                self._in_flight.append(queued_at)
+                self._in_flight_items += count
+                # Wake writers waiting for room
+                self._condition.notify_all()
+
+            try:
+                await self._write([item for _, item in batch])
+            finally:
+                async with self._condition:
+                    self._in_flight.remove(queued_at)
+                    self._in_flight_items -= count
+                    self._condition.notify_all()
+
+    async def _write(self, items: list[T]) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._write_batch(items)
+            except Exception as e:
+                if attempt < self._max_retries:
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(self._retry_delay * 2**attempt)
+                    continue
+                logger.error(f"Failed to write {len(items)} queued items to Zep: {e}")
+                self._stats["failed"] += len(items)
+                self._failed.extend(items)
+                self._error = e
+                return
+            self._stats["written"] += len(items)
+            self._stats["batches"] += 1
+            return
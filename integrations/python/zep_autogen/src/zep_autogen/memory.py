@@ -4,9 +4,15 @@ Zep Memory integration for AutoGen.
 This module provides memory classes that integrate Zep with AutoGen's memory system.
 """
 
+import asyncio
+import functools
+import itertools
 import logging
+import time
 import uuid
-from typing import Any, Literal
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Sequence
+from typing import Any, Literal, TypeVar, cast
 
 from autogen_core import CancellationToken
 from autogen_core.memory import (
@@ -18,8 +24,93 @@ from autogen_core.memory import (
 )
 from autogen_core.model_context import ChatCompletionContext
 from autogen_core.models import SystemMessage
+from zep_cloud import NotFoundError
 from zep_cloud.client import AsyncZep
-from zep_cloud.types import Message
+from zep_cloud.types import EpisodeData, Message
+
+from .batch import DEFAULT_MAX_CONCURRENCY, write_in_chunks
+from .budget import TokenEstimator, estimate_tokens, truncate_to_tokens
+from .buffer import MAX_EPISODES_PER_BATCH, MAX_MESSAGES_PER_BATCH, WriteBuffer
+from .coordinator import ZepMemoryCoordinator
+from .exceptions import ZepBatchAddError
+from .results import (
+    graph_results_to_memory_content,
+    merge_scope_results,
+    resolve_scope_limits,
+    to_query_result,
+)
+from .telemetry import TelemetrySink, report_cache_hit, timed_call
+from .utils import run_cancellable
+
+T = TypeVar("T")
+
+# Largest number of threads whose state is shared between memories
+MAX_TRACKED_THREADS = 10_000
+
+
+class _ThreadRegistry:
+    """
+    State of threads shared by all ZepUserMemory instances in the process.
+
+    Records which threads are known to exist, so that memories writing to the same
+    thread only check for it once, and the version of each thread's message writes.
+    A memory whose history buffer was synced at an older version has missed another
+    memory's write. Only the max_threads most recently used threads are kept; a
+    thread dropped and seen again gets a new generation, so versions never repeat.
+    """
+
+    def __init__(self, max_threads: int = MAX_TRACKED_THREADS) -> None:
+        self._max_threads = max_threads
+        self._known: OrderedDict[str, None] = OrderedDict()
+        # (generation, write count) of each thread
+        self._writes: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._generations = itertools.count(1)
+
+    def is_known(self, thread_id: str) -> bool:
+        """Check whether the thread is known to exist."""
+        if thread_id not in self._known:
+            return False
+        self._known.move_to_end(thread_id)
+        return True
+
+    def add_known(self, thread_id: str) -> None:
+        """Remember that the thread exists."""
+        self._known[thread_id] = None
+        self._known.move_to_end(thread_id)
+        if len(self._known) > self._max_threads:
+            self._known.popitem(last=False)
+
+    def discard_known(self, thread_id: str) -> None:
+        """Forget that the thread exists, e.g. after it was deleted."""
+        self._known.pop(thread_id, None)
+
+    def version(self, thread_id: str) -> tuple[int, int]:
+        """Get the thread's write version, (0, 0) if none is recorded."""
+        if thread_id not in self._writes:
+            return (0, 0)
+        self._writes.move_to_end(thread_id)
+        return self._writes[thread_id]
+
+    def record_write(self, thread_id: str) -> tuple[int, int]:
+        """Count a message write to the thread and return its new version."""
+        generation, count = self._writes.get(thread_id) or (next(self._generations), 0)
+        self._writes[thread_id] = (generation, count + 1)
+        self._writes.move_to_end(thread_id)
+        if len(self._writes) > self._max_threads:
+            self._writes.popitem(last=False)
+        return self._writes[thread_id]
+
+    def writes_since(self, thread_id: str, version: tuple[int, int]) -> int | None:
+        """Count the writes to the thread since the version, or None if unknown."""
+        generation, count = self.version(thread_id)
+        if version == (0, 0):
+            return count
+        if generation != version[0]:
+            return None
+        return count - version[1]
+
+
+_threads = _ThreadRegistry()
 
 
 class ZepUserMemory(Memory):
@@ -40,6 +131,16 @@ class ZepUserMemory(Memory):
         user_id: str,
         thread_id: str | None = None,
         thread_context_mode: Literal["basic", "summary"] = "summary",
+        recent_messages_limit: int = 10,
+        context_timeout: float | None = None,
+        buffer_size: int | None = None,
+        flush_interval: float = 1.0,
+        max_context_tokens: int | None = None,
+        token_estimator: TokenEstimator | None = None,
+        coordinator: ZepMemoryCoordinator | None = None,
+        warm_start: bool = False,
+        telemetry_sink: TelemetrySink | None = None,
+        history_ttl: float | None = 60.0,
         **kwargs: Any,
     ) -> None:
         """
@@ -49,6 +150,28 @@ class ZepUserMemory(Memory):
             client: An initialized AsyncZep instance
             user_id: User ID for memory isolation (required)
             thread_id: Optional thread ID. If not provided, will be created automatically
+            thread_context_mode: Mode for thread context retrieval ("basic" or "summary")
+            recent_messages_limit: Number of recent messages included by update_context
+            context_timeout: Optional deadline in seconds for the retrieval in update_context
+            buffer_size: Enables buffered writes. Adds are accumulated and written in
+                batches of up to this many items (messages are capped at 30 per batch)
+            flush_interval: Maximum time in seconds a buffered add waits before being written
+            max_context_tokens: Optional token budget for the system message added by
+                update_context. The thread context is kept first (truncated if needed),
+                then as many of the most recent messages as fit
+            token_estimator: Optional callable returning the token count of a string, e.g.
+                a tokenizer for the agent's model. Defaults to about four characters per token
+            coordinator: Optional ZepMemoryCoordinator shared by the memories of a team's
+                agents, so their thread context and history reads are fetched once per turn
+            warm_start: Start prefetch() in the background when the memory is created inside
+                a running event loop, so the first update_context is served warm
+            telemetry_sink: Optional callable receiving a ZepCallEvent with the timing,
+                result count, size and cache status of every Zep call, e.g.
+                log_to_autogen_events or a LatencyAggregator
+            history_ttl: Time in seconds the local buffer of recent messages is trusted
+                after it was synced with the thread, so messages added by other clients
+                are picked up. None trusts it until another memory in the process writes
+                to the thread
             **kwargs: Additional configuration options
         """
         if not isinstance(client, AsyncZep):
@@ -61,11 +184,124 @@ class ZepUserMemory(Memory):
         self._user_id = user_id
         self._thread_id = thread_id
         self._thread_context_mode = thread_context_mode
+        self._recent_messages_limit = recent_messages_limit
+        self._context_timeout = context_timeout
+        self._max_context_tokens = max_context_tokens
+        self._estimate_tokens = token_estimator or estimate_tokens
+        self._coordinator = coordinator
+        self._telemetry_sink = telemetry_sink
+        self._history_ttl = history_ttl
         self._config = kwargs
 
+        # Ring buffer of the thread's most recent messages, fed by add(). Once it has been
+        # seeded from the thread (or the thread was created here) it is kept in sync and
+        # update_context can skip fetching the history remotely, until another memory
+        # writes to the thread or history_ttl passes.
+        self._recent_messages: deque[Message] = deque(maxlen=recent_messages_limit)
+        self._history_synced = False
+        self._synced_thread_version = (0, 0)
+        self._synced_at = 0.0
+        self._message_writes = 0
+        self._last_timings: dict[str, float] = {}
+
+        # Result of prefetch(), used by the first update_context. Messages written since
+        # the prefetch started are collected so they can be merged into its history; the
+        # count records how many were written while it was being fetched.
+        self._warm_result: tuple[Any, list[Message], int] | None = None
+        self._warm_messages: list[Message] | None = None
+        # Write count of this memory and version of the thread when the prefetch started
+        self._warm_write_counts: tuple[int, tuple[int, int]] = (0, (0, 0))
+        self._prefetch_task: asyncio.Task[None] | None = None
+
+        # Optional write buffers; reads flush them first so they see their own writes
+        self._message_buffer: WriteBuffer[Message] | None = None
+        self._data_buffer: WriteBuffer[EpisodeData] | None = None
+        if buffer_size:
+            self._message_buffer = WriteBuffer(
+                self._write_messages,
+                max_batch_size=min(buffer_size, MAX_MESSAGES_PER_BATCH),
+                flush_interval=flush_interval,
+            )
+            self._data_buffer = WriteBuffer(
+                self._write_data,
+                max_batch_size=min(buffer_size, MAX_EPISODES_PER_BATCH),
+                flush_interval=flush_interval,
+            )
+
         # Set up module logger
         self._logger = logging.getLogger(__name__)
 
+        if warm_start:
+            self.start_prefetch()
+
+    async def prefetch(self) -> None:
+        """
+        Fetch the thread context and recent messages ahead of the first model call.
+
+        The result is used by the next update_context, with the messages added through
+        this memory in between merged into its history. Without a thread_id the thread is
+        created instead, so the first add does not pay for it. Errors are logged, not
+        raised.
+        """
+        try:
+            if not self._thread_id:
+                await self._ensure_thread()
+                return
+
+            await self._flush_before_read()
+            self._warm_result = None
+            self._warm_messages = []
+            self._warm_write_counts = (self._message_writes, _threads.version(self._thread_id))
+            memory_result, recent_messages = await self._retrieve_thread_memory(self._thread_id)
+            self._warm_result = (memory_result, recent_messages, len(self._warm_messages))
+        except Exception as e:
+            self._warm_messages = None
+            self._logger.warning(f"Error prefetching Zep memory: {e}")
+
+    def _take_warm_result(self) -> tuple[Any, list[Message]] | None:
+        """
+        Get the result of prefetch() for this turn, with the messages added since.
+
+        Returns None, making the turn retrieve remotely, if there is no result or another
+        memory in the process wrote to the thread since the prefetch started.
+        """
+        warm_result, self._warm_result = self._warm_result, None
+        written, self._warm_messages = self._warm_messages or [], None
+        if warm_result is None:
+            return None
+        memory_result, recent_messages, written_during_fetch = warm_result
+
+        own_writes, thread_version = self._warm_write_counts
+        thread_writes = _threads.writes_since(str(self._thread_id), thread_version)
+        if thread_writes != self._message_writes - own_writes:
+            return None
+
+        # Messages written while fetching may already be in the fetched history
+        fetched = {(message.role, message.content) for message in recent_messages}
+        merged = [
+            *recent_messages,
+            *(
+                message
+                for message in written[:written_during_fetch]
+                if (message.role, message.content) not in fetched
+            ),
+            *written[written_during_fetch:],
+        ]
+        return memory_result, list(deque(merged, maxlen=self._recent_messages_limit))
+
+    def start_prefetch(self) -> None:
+        """
+        Run prefetch() as a background task.
+
+        Does nothing if a prefetch is already running or there is no running event loop.
+        """
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            return
+        try:
+            self._prefetch_task = asyncio.get_running_loop().create_task(self.prefetch())
+        except RuntimeError:
+            self._logger.debug("No running event loop, call prefetch() to warm the memory")
+
     async def add(
         self, content: MemoryContent, cancellation_token: CancellationToken | None = None
     ) -> None:
@@ -78,6 +314,101 @@ class ZepUserMemory(Memory):
 
         Args:
             content: The memory content to store
+            cancellation_token: Optional token; cancelling it aborts the in-flight Zep requests
+
+        Raises:
+            ValueError: If the memory content mime type or metadata type is not supported
+        """
+        item = self._to_zep_item(content)
+
+        if isinstance(item, Message):
+            # Add message to user's thread in Zep
+            if self._message_buffer is not None:
+                await run_cancellable(
+                    functools.partial(self._message_buffer.put, item), cancellation_token
+                )
+            else:
+                await run_cancellable(lambda: self._write_messages([item]), cancellation_token)
+        else:
+            # Add data to user's graph
+            if self._data_buffer is not None:
+                await run_cancellable(
+                    functools.partial(self._data_buffer.put, item), cancellation_token
+                )
+            else:
+                await run_cancellable(
+                    lambda: self._timed(
+                        "graph.add",
+                        self._client.graph.add(
+                            user_id=self._user_id, type=item.type, data=item.data
+                        ),
+                        sent=item.data,
+                    ),
+                    cancellation_token,
+                )
+
+    async def add_many(
+        self,
+        contents: list[MemoryContent],
+        cancellation_token: CancellationToken | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Add several memory entries with batched Zep calls.
+
+        Messages are written to the thread in order, up to 30 per add_messages call;
+        if a call fails, the later messages are not sent, so the thread has no gap.
+        Data is written to the user's graph with graph.add_batch, up to 20 items per
+        call and max_concurrency calls at a time. Buffered writes are flushed first.
+
+        Args:
+            contents: The memory contents to store
+            cancellation_token: Optional token; cancelling it aborts the in-flight Zep requests
+            max_concurrency: Largest number of graph.add_batch calls in flight
+
+        Raises:
+            ValueError: If a content's mime type or metadata type is not supported.
+                Nothing is written in that case
+            ZepBatchAddError: If some items could not be written; the others were. Messages
+                after a failed add_messages call are in its not_attempted_indices
+        """
+        items = [self._to_zep_item(content) for content in contents]
+        message_indices = [i for i, item in enumerate(items) if isinstance(item, Message)]
+        data_indices = [i for i, item in enumerate(items) if isinstance(item, EpisodeData)]
+        messages = [cast(Message, items[i]) for i in message_indices]
+        episodes = [cast(EpisodeData, items[i]) for i in data_indices]
+
+        await run_cancellable(self.flush, cancellation_token)
+        message_errors, data_errors = await run_cancellable(
+            lambda: asyncio.gather(
+                write_in_chunks(
+                    messages, self._write_messages, MAX_MESSAGES_PER_BATCH, ordered=True
+                ),
+                write_in_chunks(
+                    episodes, self._write_data, MAX_EPISODES_PER_BATCH, max_concurrency
+                ),
+            ),
+            cancellation_token,
+        )
+
+        errors = {
+            index: error
+            for indices, chunk_errors in (
+                (message_indices, message_errors),
+                (data_indices, data_errors),
+            )
+            for index, error in zip(indices, chunk_errors, strict=True)
+            if error is not None
+        }
+        if errors:
+            raise ZepBatchAddError(errors, total=len(items))
+
+    def _to_zep_item(self, content: MemoryContent) -> Message | EpisodeData:
+        """
+        Convert memory content to a thread message or graph episode.
+
+        Uses metadata.type: "message" becomes a Message, "data" (the default) an
+        EpisodeData whose type is mapped from the mime type.
 
         Raises:
             ValueError: If the memory content mime type or metadata type is not supported
@@ -96,23 +427,13 @@ class ZepUserMemory(Memory):
         content_type = metadata_copy.get("type", "data")  # Default to "data" if no type specified
 
         if content_type == "message":
-            if self._thread_id:
-                # Ensure thread exists
-                await self._client.thread.get(self._thread_id)
-
-            if not self._thread_id:
-                self._thread_id = f"thread_{uuid.uuid4().hex[:16]}"
-                await self._client.thread.create(thread_id=self._thread_id, user_id=self._user_id)
             # Store as message in thread session
             role = metadata_copy.get("role", "user")
             name = metadata_copy.get("name")
 
-            message = Message(name=name, content=str(content.content), role=role)
-
-            # Add message to user's thread in Zep
-            await self._client.thread.add_messages(thread_id=self._thread_id, messages=[message])
+            return Message(name=name, content=str(content.content), role=role)
 
-        elif content_type == "data":
+        if content_type == "data":
             # Store as data in the user's graph - map mime type to Zep data type
             mime_to_data_type: dict[MemoryMimeType, str] = {
                 MemoryMimeType.TEXT: "text",
@@ -126,15 +447,126 @@ class ZepUserMemory(Memory):
             else:
                 data_type = "text"  # Default for string or unknown types
 
-            # Add data to user's graph
-            await self._client.graph.add(
-                user_id=self._user_id, type=data_type, data=str(content.content)
+            return EpisodeData(data=str(content.content), type=data_type)
+
+        raise ValueError(
+            f"Unsupported metadata type: {content_type}. Supported types: 'message', 'data'"
+        )
+
+    async def _write_messages(self, messages: list[Message]) -> None:
+        """
+        Add messages to the thread, creating the thread if needed.
+
+        Thread existence is memoized process-wide, so the happy path is a single
+        add_messages call. The memo is only invalidated when the write itself
+        reports that the thread was not found.
+        """
+        await self._ensure_thread()
+        thread_id = str(self._thread_id)
+
+        try:
+            await self._timed(
+                "thread.add_messages",
+                self._client.thread.add_messages(thread_id=thread_id, messages=messages),
+                sent=messages,
+            )
+        except NotFoundError:
+            # The thread was deleted since it was checked; recreate it and retry once
+            _threads.discard_known(thread_id)
+            self._recent_messages.clear()
+            self._history_synced = False
+            self._warm_result = None
+            self._warm_messages = None
+            await self._ensure_thread()
+            await self._timed(
+                "thread.add_messages",
+                self._client.thread.add_messages(thread_id=thread_id, messages=messages),
+                sent=messages,
             )
 
+        self._message_writes += 1
+        if self._warm_messages is not None:
+            self._warm_messages.extend(messages)
+        in_sync = self._history_in_sync()
+        thread_version = _threads.record_write(thread_id)
+        if in_sync:
+            self._recent_messages.extend(messages)
+            self._synced_thread_version = thread_version
         else:
-            raise ValueError(
-                f"Unsupported metadata type: {content_type}. Supported types: 'message', 'data'"
-            )
+            self._history_synced = False
+        if self._coordinator is not None:
+            self._coordinator.invalidate(thread_id)
+
+    async def _write_data(self, episodes: list[EpisodeData]) -> None:
+        """Add a batch of data to the user's graph."""
+        await self._timed(
+            "graph.add_batch",
+            self._client.graph.add_batch(user_id=self._user_id, episodes=episodes),
+            sent=episodes,
+        )
+
+    async def flush(self) -> None:
+        """Write all buffered messages and data to Zep. A no-op when buffering is off."""
+        if self._message_buffer is not None:
+            await self._message_buffer.flush()
+        if self._data_buffer is not None:
+            await self._data_buffer.flush()
+
+    async def _flush_before_read(self) -> None:
+        """Flush buffered writes so reads see them, logging rather than raising errors."""
+        try:
+            await self.flush()
+        except Exception as e:
+            self._logger.error(f"Error flushing buffered writes to Zep: {e}")
+
+    async def _ensure_thread(self) -> None:
+        """Make sure the thread exists, checking Zep only the first time it is seen."""
+        if not self._thread_id:
+            self._thread_id = f"thread_{uuid.uuid4().hex[:16]}"
+            await self._create_thread()
+            _threads.add_known(self._thread_id)
+            # A new thread has no history beyond what is added through this instance
+            self._mark_history_synced(_threads.version(self._thread_id))
+            return
+
+        if _threads.is_known(self._thread_id):
+            return
+
+        try:
+            await self._timed("thread.get", self._client.thread.get(self._thread_id))
+        except NotFoundError:
+            await self._create_thread()
+            self._mark_history_synced(_threads.version(self._thread_id))
+        _threads.add_known(self._thread_id)
+
+    def _mark_history_synced(self, thread_version: tuple[int, int]) -> None:
+        """Trust the message buffer as of the given thread write version."""
+        self._history_synced = True
+        self._synced_thread_version = thread_version
+        self._synced_at = time.monotonic()
+
+    def _history_in_sync(self) -> bool:
+        """Check whether the message buffer can still stand in for the thread's history."""
+        if not self._history_synced:
+            return False
+        if _threads.version(str(self._thread_id)) != self._synced_thread_version:
+            # Another memory in the process wrote to the thread
+            return False
+        if self._history_ttl is not None:
+            return time.monotonic() - self._synced_at <= self._history_ttl
+        return True
+
+    async def _create_thread(self) -> None:
+        await self._timed(
+            "thread.create",
+            self._client.thread.create(thread_id=str(self._thread_id), user_id=self._user_id),
+        )
+
+    def _timed(self, operation: str, call: Awaitable[T], **fields: Any) -> Awaitable[T]:
+        """Time a Zep call, reporting it to the telemetry sink."""
+        return timed_call(
+            self._telemetry_sink, operation, call, component=type(self).__name__, **fields
+        )
 
     async def query(
         self,
@@ -147,11 +579,18 @@ class ZepUserMemory(Memory):
 
         Args:
             query: Search query string or MemoryContent
-            cancellation_token: Optional cancellation token
-            **kwargs: Additional query parameters
+            cancellation_token: Optional token; cancelling it aborts the in-flight search
+            **kwargs: Additional query parameters. scopes (a list of "edges", "nodes" and
+                "episodes", or a mapping of scope to limit) searches each scope
+                concurrently and merges the results by score, with the scope and score
+                of each result in its metadata. lazy=True returns a LazyMemoryQueryResult
+                that builds each MemoryContent only when it is accessed
 
         Returns:
             MemoryQueryResult containing matching memories
+
+        Raises:
+            ValueError: If scopes contains an unsupported scope
         """
         # Convert query to string if it's MemoryContent
         if isinstance(query, MemoryContent):
@@ -161,74 +600,79 @@ class ZepUserMemory(Memory):
 
         # Extract limit from kwargs for backward compatibility
         limit = kwargs.pop("limit", 5)
+        scopes = kwargs.pop("scopes", None)
+        scope_limits = resolve_scope_limits(scopes, limit) if scopes is not None else None
+        lazy = kwargs.pop("lazy", False)
 
-        results = []
+        results: Sequence[MemoryContent] = []
 
-        try:
-            # Search the user's graph
-            graph_results = await self._client.graph.search(
-                user_id=self._user_id, query=query_str, limit=limit, **kwargs
-            )
+        await self._flush_before_read()
 
-            # Add graph search results
-            if graph_results.edges:
-                for edge in graph_results.edges:
-                    results.append(
-                        MemoryContent(
-                            content=edge.fact,
-                            mime_type=MemoryMimeType.TEXT,
-                            metadata={
-                                "source": "user_graph",
-                                "edge_name": edge.name,
-                                "edge_attributes": edge.attributes or {},
-                                "created_at": edge.created_at,
-                                "expired_at": edge.expired_at,
-                                "valid_at": edge.valid_at,
-                                "invalid_at": edge.invalid_at,
-                            },
-                        )
-                    )
-            if graph_results.nodes:
-                for node in graph_results.nodes:
-                    results.append(
-                        MemoryContent(
-                            content=f"{node.name}:\n {node.summary}",
-                            mime_type=MemoryMimeType.TEXT,
-                            metadata={
-                                "source": "user_graph",
-                                "node_name": node.name,
-                                "node_attributes": node.attributes or {},
-                                "created_at": node.created_at,
-                            },
-                        )
-                    )
-            if graph_results.episodes:
-                for episode in graph_results.episodes:
-                    results.append(
-                        MemoryContent(
-                            content=episode.content,
-                            mime_type=MemoryMimeType.TEXT,
-                            metadata={
-                                "source": "user_graph",
-                                "episode_type": episode.source,
-                                "episode_role": episode.role_type,
-                                "episode_name": episode.role,
-                                "created_at": episode.created_at,
-                            },
-                        )
-                    )
+        try:
+            if scope_limits is not None:
+                # Search the user's graph once per scope, concurrently
+                scope_results = await run_cancellable(
+                    lambda: asyncio.gather(
+                        *[
+                            self._timed(
+                                "graph.search",
+                                self._client.graph.search(
+                                    user_id=self._user_id,
+                                    query=query_str,
+                                    limit=scope_limit,
+                                    scope=scope,
+                                    **kwargs,
+                                ),
+                                scope=scope,
+                            )
+                            for scope, scope_limit in scope_limits.items()
+                        ]
+                    ),
+                    cancellation_token,
+                )
+                results = merge_scope_results(
+                    dict(zip(scope_limits, scope_results, strict=True)),
+                    source="user_graph",
+                    lazy=lazy,
+                )
+            else:
+                # Search the user's graph
+                graph_results = await run_cancellable(
+                    lambda: self._timed(
+                        "graph.search",
+                        self._client.graph.search(
+                            user_id=self._user_id, query=query_str, limit=limit, **kwargs
+                        ),
+                        scope=kwargs.get("scope"),
+                    ),
+                    cancellation_token,
+                )
+                results = graph_results_to_memory_content(
+                    graph_results, source="user_graph", lazy=lazy
+                )
         except Exception as e:
             # Log error but don't fail completely
             self._logger.error(f"Error querying Zep memory: {e}")
 
-        return MemoryQueryResult(results=results)
+        return to_query_result(results)
 
     async def update_context(self, model_context: ChatCompletionContext) -> UpdateContextResult:
         """
         Update the agent's model context with retrieved memories.
 
-        Gets memory from Zep, and if memory exists, includes up to 10 last messages
-        from history and adds the memory context as a system message.
+        Fetches the thread context from Zep concurrently with the recent message
+        history and adds both as a system message. The history is served from the
+        local buffer of messages added through this instance once it is in sync with
+        the thread, so the remote history fetch is usually skipped. Both retrievals
+        share the context_timeout deadline; per-phase timings are available from
+        last_update_timings.
+
+        Recent messages already present in the model context are left out, and the
+        system message is trimmed to max_context_tokens when a budget is set.
+
+        The history is fetched remotely again once another ZepUserMemory in the process
+        writes to the thread, and history_ttl seconds after the last fetch, so messages
+        written by other clients are picked up.
 
         Args:
             model_context: The model context to update
@@ -242,35 +686,53 @@ class ZepUserMemory(Memory):
             if not messages:
                 return UpdateContextResult(memories=MemoryQueryResult(results=[]))
 
+            await self._flush_before_read()
+
+            if self._prefetch_task is not None and not self._prefetch_task.done():
+                # A warm start is in flight; reuse its retrieval instead of starting another.
+                # If close() cancels it, this turn retrieves remotely instead
+                await asyncio.wait([self._prefetch_task])
+
             # Get memory from Zep session
             if not self._thread_id:
                 return UpdateContextResult(memories=MemoryQueryResult(results=[]))
-            memory_result = await self._client.thread.get_user_context(
-                thread_id=self._thread_id,
-                mode=self._thread_context_mode,
-            )
-            thread = await self._client.thread.get(thread_id=self._thread_id, lastn=10)
+
+            warm_result = self._take_warm_result()
+            if warm_result is not None:
+                memory_result, recent_messages = warm_result
+                self._last_timings = {"total_ms": 0.0, "prefetched": 1.0}
+            else:
+                memory_result, recent_messages = await self._retrieve_thread_memory(self._thread_id)
+
+            # Skip messages the agent already has in its model context
+            present = {message.content for message in messages if isinstance(message.content, str)}
+            message_history = []
+            for msg in recent_messages:
+                if msg.content in present:
+                    continue
+                name_prefix = f"{msg.name} " if msg.name else ""
+                message_history.append(f"{name_prefix}{msg.role}: {msg.content}")
+
+            context = memory_result.context or ""
+            if self._max_context_tokens is not None:
+                context, message_history = self._fit_to_budget(context, message_history)
 
             memory_contents = []
             memory_parts = []
 
             # If we have memory context, include it
-            if memory_result.context:
+            if context:
                 memory_contents.append(
                     MemoryContent(
-                        content=memory_result.context,
+                        content=context,
                         mime_type=MemoryMimeType.TEXT,
                         metadata={"source": "thread_context"},
                     )
                 )
-                memory_parts.append(f"Memory context: {memory_result.context}")
+                memory_parts.append(f"Memory context: {context}")
 
             # Only include recent messages if we have memory
-            if thread.messages:
-                message_history = []
-                for msg in thread.messages:
-                    name_prefix = f"{msg.name} " if msg.name else ""
-                    message_history.append(f"{name_prefix}{msg.role}: {msg.content}")
+            if message_history:
                 memory_parts.append("Recent conversation:\n" + "\n".join(message_history))
 
             # If we have memory parts, add them to the context as a system message
@@ -279,11 +741,136 @@ class ZepUserMemory(Memory):
                 await model_context.add_message(SystemMessage(content=memory_context))
             return UpdateContextResult(memories=MemoryQueryResult(results=memory_contents))
 
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                f"Zep memory retrieval exceeded {self._context_timeout}s deadline, skipping"
+            )
+            return UpdateContextResult(memories=MemoryQueryResult(results=[]))
+
         except Exception as e:
             # Log error but don't fail completely
             self._logger.error(f"Error updating context with Zep memory: {e}")
             return UpdateContextResult(memories=MemoryQueryResult(results=[]))
 
+    def _fit_to_budget(self, context: str, message_history: list[str]) -> tuple[str, list[str]]:
+        """
+        Trim the thread context and recent messages to max_context_tokens.
+
+        The context has priority and is truncated if it alone exceeds the budget;
+        the remainder is filled with the most recent messages.
+        """
+        assert self._max_context_tokens is not None
+        context = truncate_to_tokens(context, self._max_context_tokens, self._estimate_tokens)
+        remaining = self._max_context_tokens - self._estimate_tokens(context)
+
+        kept: list[str] = []
+        for line in reversed(message_history):
+            tokens = self._estimate_tokens(line)
+            if tokens > remaining:
+                break
+            kept.append(line)
+            remaining -= tokens
+        kept.reverse()
+        return context, kept
+
+    async def _retrieve_thread_memory(self, thread_id: str) -> tuple[Any, list[Message]]:
+        """
+        Fetch the thread context and recent messages concurrently under one deadline.
+
+        Returns:
+            The thread context response and the recent messages, oldest first
+        """
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def fetch_context() -> Any:
+            phase_started = time.perf_counter()
+            try:
+                if self._coordinator is not None:
+                    # The coordinator reports whether the read made a Zep call
+                    return await self._coordinator.get_user_context(
+                        thread_id,
+                        self._thread_context_mode,
+                        telemetry_sink=self._telemetry_sink,
+                        component=type(self).__name__,
+                    )
+                return await self._timed(
+                    "thread.get_user_context",
+                    self._client.thread.get_user_context(
+                        thread_id=thread_id,
+                        mode=self._thread_context_mode,
+                    ),
+                )
+            finally:
+                timings["context_ms"] = (time.perf_counter() - phase_started) * 1000
+
+        async def fetch_recent_messages() -> list[Message]:
+            phase_started = time.perf_counter()
+            try:
+                if self._coordinator is not None:
+                    # Other agents write to the thread too, so the local buffer is not used
+                    timings["messages_from_buffer"] = 0.0
+                    return await self._coordinator.get_recent_messages(
+                        thread_id,
+                        self._recent_messages_limit,
+                        telemetry_sink=self._telemetry_sink,
+                        component=type(self).__name__,
+                    )
+
+                if self._history_in_sync():
+                    timings["messages_from_buffer"] = 1.0
+                    buffered = list(self._recent_messages)
+                    report_cache_hit(
+                        self._telemetry_sink,
+                        "thread.get",
+                        buffered,
+                        component=type(self).__name__,
+                    )
+                    return buffered
+
+                writes_before = self._message_writes
+                thread_version_before = _threads.version(thread_id)
+                thread = await self._timed(
+                    "thread.get",
+                    self._client.thread.get(thread_id=thread_id, lastn=self._recent_messages_limit),
+                    cache="miss",
+                )
+                recent_messages = list(thread.messages or [])
+                # Only trust the buffer if no message was written while fetching
+                if self._message_writes == writes_before:
+                    self._recent_messages.clear()
+                    self._recent_messages.extend(recent_messages)
+                    # Writes by other memories during the fetch trigger another sync
+                    self._mark_history_synced(thread_version_before)
+                timings["messages_from_buffer"] = 0.0
+                return recent_messages
+            finally:
+                timings["messages_ms"] = (time.perf_counter() - phase_started) * 1000
+
+        try:
+            memory_result, recent_messages = await asyncio.wait_for(
+                asyncio.gather(fetch_context(), fetch_recent_messages()),
+                timeout=self._context_timeout,
+            )
+        finally:
+            timings["total_ms"] = (time.perf_counter() - started) * 1000
+            self._last_timings = timings
+            self._logger.debug(f"Zep memory retrieval timings: {timings}")
+
+        return memory_result, recent_messages
+
+    @property
+    def last_update_timings(self) -> dict[str, float]:
+        """
+        Get the per-phase timings of the most recent update_context retrieval.
+
+        Keys are context_ms, messages_ms and total_ms (milliseconds), plus
+        messages_from_buffer (1.0 when the history was served locally). When the
+        turn was served from a prefetch() result, only total_ms and prefetched
+        (1.0) are set.
+        """
+        return dict(self._last_timings)
+
     async def clear(self) -> None:
         """
         Clear all memories from Zep storage by deleting the session.
@@ -291,10 +878,22 @@ class ZepUserMemory(Memory):
         This will delete the entire session and all its messages.
         Note: This operation cannot be undone.
         """
+        if self._message_buffer is not None:
+            self._message_buffer.discard()
+        self._warm_result = None
+        self._warm_messages = None
+
         try:
             # Delete the session - this clears all messages and memory for this session
             if self._thread_id:
-                await self._client.thread.delete(thread_id=self._thread_id)
+                await self._timed(
+                    "thread.delete", self._client.thread.delete(thread_id=self._thread_id)
+                )
+                _threads.discard_known(self._thread_id)
+                self._recent_messages.clear()
+                self._history_synced = False
+                if self._coordinator is not None:
+                    self._coordinator.invalidate(self._thread_id)
 
         except Exception as e:
             self._logger.error(f"Error clearing Zep memory: {e}")
@@ -302,11 +901,14 @@ class ZepUserMemory(Memory):
 
     async def close(self) -> None:
         """
-        Clean up Zep client resources.
+        Flush buffered writes and clean up Zep client resources.
 
         Note: This method does not close the AsyncZep instance since it was
         provided externally. The caller is responsible for managing the client lifecycle.
         """
-        # The client was provided externally, so we don't close it here
-        # The caller is responsible for closing the client when appropriate
-        pass
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        if self._message_buffer is not None:
+            await self._message_buffer.close()
+        if self._data_buffer is not None:
+            await self._data_buffer.close()
@@ -0,0 +1,146 @@
+"""
+Local construction of graph search queries from recent conversation turns.
+"""
+
+import re
+from collections import deque
+
+# Function words and conversational boilerplate that carry no search signal
+_STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been
+    before being below between both but by can could did do does doing done down during
+    each else even ever few for from further get gets got had has have having he her here
+    hers herself him himself his how i if in into is it its itself just let lets like
+    may me might more most much must my myself no nor not now of off on once only or
+    other our ours ourselves out over own please really same say says said she should so
+    some still such than thank thanks that the their theirs them themselves then there
+    these they thing things this those through to too under until up us use used very
+    want wants was we well were what when where which while who whom why will with would
+    yes yet you your yours yourself yourselves hi hello hey okay ok sure tell know think
+    need make made go going see let's i'm it's that's don't can't i'd i'll i've you're
+    """.split()
+)
+
+_TOKEN = re.compile(r"\w[\w'’-]*\w|\w")
+
+
+class QueryBuilder:
+    """
+    Builds graph search queries from a rolling window of recent turns.
+
+    Keeps the last max_turns distinct texts and extracts their salient terms
+    locally: stopwords and conversational boilerplate are dropped, and the rest
+    are ranked by frequency, weighted by recency (decay per turn of age) with a
+    boost for capitalized terms. The terms are cached until the window changes.
+
+    Args:
+        max_turns: Number of recent turns in the window
+        max_terms: Largest number of terms in a query
+        max_chars: Largest length of a query
+        decay: Weight of a turn relative to the next more recent one
+    """
+
+    def __init__(
+        self, max_turns: int = 4, max_terms: int = 24, max_chars: int = 400, decay: float = 0.7
+    ) -> None:
+        if max_turns < 1:
+            raise ValueError("max_turns must be at least 1")
+
+        self._max_turns = max_turns
+        self._max_terms = max_terms
+        self._max_chars = max_chars
+        self._decay = decay
+
+        self._turns: deque[str] = deque(maxlen=max_turns)
+        # Texts seen recently, so turns that are seen again (e.g. messages that stay in the
+        # model context across turns) do not re-enter the window
+        self._seen: deque[str] = deque(maxlen=max_turns * 4)
+        self._terms: tuple[str, ...] | None = None
+
+    @property
+    def max_turns(self) -> int:
+        """Get the number of recent turns kept in the window."""
+        return self._max_turns
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def add(self, text: str) -> bool:
+        """
+        Add a turn to the window, unless it is empty or was seen recently.
+
+        Returns:
+            Whether the window changed
+        """
+        text = text.strip()
+        if not text or text in self._seen:
+            return False
+        self._seen.append(text)
+        self._turns.append(text)
+        self._terms = None
+        return True
+
+    def clear(self) -> None:
+        """Empty the window."""
+        self._turns.clear()
+        self._seen.clear()
+        self._terms = None
+
+    def terms(self) -> tuple[str, ...]:
+        """Get the salient terms of the window, most salient first."""
+        if self._terms is None:
+            self._terms = self._extract_terms()
+        return self._terms
+
+    def query(self) -> str:
+        """
+        Get the search query for the window; empty when the window is.
+
+        A window without salient terms (e.g. "What should I do?") is searched with its
+        latest turn as is.
+        """
+        terms = self.terms()
+        if terms:
+            return " ".join(terms)
+        return self._turns[-1][: self._max_chars] if self._turns else ""
+
+    def cache_key(self) -> frozenset[str]:
+        """Get a key that changes only when the salient terms of the window change."""
+        terms = self.terms()
+        if terms:
+            return frozenset(term.lower() for term in terms)
+        return frozenset([self.query()])
+
+    def _extract_terms(self) -> tuple[str, ...]:
+        scores: dict[str, float] = {}
+        first_seen: dict[str, int] = {}
+        display: dict[str, str] = {}
+
+        position = 0
+        for age, turn in enumerate(reversed(self._turns)):
+            weight = self._decay**age
+            for match in _TOKEN.finditer(turn):
+                token = match.group().removesuffix("'s").removesuffix("’s")
+                key = token.lower()
+                if key in _STOPWORDS or (len(key) < 3 and not key.isdigit()):
+                    continue
+                boost = 1.5 if token[0].isupper() else 1.0
+                scores[key] = scores.get(key, 0.0) + weight * boost
+                if key not in first_seen:
+                    first_seen[key] = position
+                    display[key] = token
+                position += 1
+
+        ranked = sorted(scores, key=lambda key: (-scores[key], first_seen[key]))
+
+        terms: list[str] = []
+        length = 0
+        for key in ranked[: self._max_terms]:
+            # Terms are joined with single spaces
+            added = len(display[key]) + (1 if terms else 0)
+            if length + added > self._max_chars:
+                break
+            terms.append(display[key])
+            length += added
+        return tuple(terms)
@@ -0,0 +1,220 @@
+"""
+Conversion of Zep graph search results to AutoGen memory content.
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any, overload
+
+from autogen_core.memory import MemoryContent, MemoryMimeType, MemoryQueryResult
+from pydantic import field_serializer
+from zep_cloud import EntityEdge, EntityNode, Episode, GraphSearchResults
+
+SEARCH_SCOPES = ("edges", "nodes", "episodes")
+
+
+def edge_to_memory_content(edge: EntityEdge, source: str) -> MemoryContent:
+    """Convert a graph edge (fact) to MemoryContent."""
+    return MemoryContent(
+        content=edge.fact,
+        mime_type=MemoryMimeType.TEXT,
+        metadata={
+            "source": source,
+            "edge_name": edge.name,
+            "edge_attributes": edge.attributes or {},
+            "created_at": edge.created_at,
+            "expired_at": edge.expired_at,
+            "valid_at": edge.valid_at,
+            "invalid_at": edge.invalid_at,
+        },
+    )
+
+
+def node_to_memory_content(node: EntityNode, source: str) -> MemoryContent:
+    """Convert a graph node (entity) to MemoryContent."""
+    return MemoryContent(
+        content=f"{node.name}:\n {node.summary}",
+        mime_type=MemoryMimeType.TEXT,
+        metadata={
+            "source": source,
+            "node_name": node.name,
+            "node_attributes": node.attributes or {},
+            "created_at": node.created_at,
+        },
+    )
+
+
+def episode_to_memory_content(episode: Episode, source: str) -> MemoryContent:
+    """Convert a graph episode to MemoryContent."""
+    return MemoryContent(
+        content=episode.content,
+        mime_type=MemoryMimeType.TEXT,
+        metadata={
+            "source": source,
+            "episode_type": episode.source,
+            "episode_role": episode.role_type,
+            "episode_name": episode.role,
+            "created_at": episode.created_at,
+        },
+    )
+
+
+_CONVERTERS: dict[str, Callable[[Any, str], MemoryContent]] = {
+    "edges": edge_to_memory_content,
+    "nodes": node_to_memory_content,
+    "episodes": episode_to_memory_content,
+}
+
+
+class LazyMemoryContents(Sequence[MemoryContent]):
+    """
+    Read-only sequence of search results that builds MemoryContent on access.
+
+    The raw edges, nodes and episodes are kept and each one is converted the
+    first time it is indexed or iterated, so results that are never read cost
+    nothing to construct. It compares equal to a list with the same contents.
+
+    Args:
+        entries: (scope, item) pairs in result order
+        source: Value of the "source" metadata key
+        annotate: Add the scope and score of each result to its metadata
+    """
+
+    def __init__(self, entries: list[tuple[str, Any]], source: str, annotate: bool = False):
+        self._entries = entries
+        self._source = source
+        self._annotate = annotate
+        self._contents: list[MemoryContent | None] = [None] * len(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @overload
+    def __getitem__(self, index: int) -> MemoryContent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[MemoryContent]: ...
+
+    def __getitem__(self, index: int | slice) -> MemoryContent | list[MemoryContent]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        content = self._contents[index]
+        if content is None:
+            scope, item = self._entries[index]
+            content = _CONVERTERS[scope](item, self._source)
+            if self._annotate:
+                assert content.metadata is not None
+                content.metadata["scope"] = scope
+                content.metadata["score"] = item.score
+            self._contents[index] = content
+        return content
+
+    def __iter__(self) -> Iterator[MemoryContent]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyMemoryContents(<{len(self)} results>)"
+
+
+class LazyMemoryQueryResult(MemoryQueryResult):
+    """
+    MemoryQueryResult whose results are a LazyMemoryContents view.
+
+    Serializing it materializes the results. Use materialize() to get a plain
+    MemoryQueryResult before nesting it in another model.
+    """
+
+    @field_serializer("results")
+    def _serialize_results(self, results: Sequence[MemoryContent]) -> list[MemoryContent]:
+        return list(results)
+
+    def materialize(self) -> MemoryQueryResult:
+        """Build every result and return them as a plain MemoryQueryResult."""
+        return MemoryQueryResult(results=list(self.results))
+
+
+def to_query_result(results: Sequence[MemoryContent]) -> MemoryQueryResult:
+    """Wrap query results, without validating them when they are a lazy view."""
+    if isinstance(results, LazyMemoryContents):
+        return LazyMemoryQueryResult.model_construct(results=results)
+    return MemoryQueryResult(results=list(results))
+
+
+def graph_results_to_memory_content(
+    graph_results: GraphSearchResults, source: str, lazy: bool = False
+) -> Sequence[MemoryContent]:
+    """
+    Convert graph search results to MemoryContent: facts, then entities, then episodes.
+
+    Args:
+        graph_results: Results of a graph.search call
+        source: Value of the "source" metadata key
+        lazy: Return a LazyMemoryContents view instead of a list
+    """
+    entries = [
+        (scope, item) for scope in SEARCH_SCOPES for item in getattr(graph_results, scope) or []
+    ]
+    contents = LazyMemoryContents(entries, source)
+    return contents if lazy else list(contents)
+
+
+def resolve_scope_limits(scopes: list[str] | dict[str, int], limit: int) -> dict[str, int]:
+    """
+    Get the per-scope limits of a multi-scope query.
+
+    Args:
+        scopes: Scopes to search, or a mapping of scope to limit
+        limit: Limit used for scopes given without one
+
+    Returns:
+        Limit per scope, in the order given
+
+    Raises:
+        ValueError: If a scope is not one of edges, nodes or episodes
+    """
+    scope_limits = dict(scopes) if isinstance(scopes, dict) else dict.fromkeys(scopes, limit)
+    unknown = [scope for scope in scope_limits if scope not in SEARCH_SCOPES]
+    if unknown:
+        raise ValueError(
+            f"Unsupported search scopes: {', '.join(unknown)}. "
+            f"Supported scopes: {', '.join(SEARCH_SCOPES)}"
+        )
+    return scope_limits
+
+
+def merge_scope_results(
+    scope_results: dict[str, GraphSearchResults], source: str, lazy: bool = False
+) -> Sequence[MemoryContent]:
+    """
+    Merge the results of per-scope searches into one list.
+
+    Results are deduplicated by UUID and ordered by descending score; results
+    without a score keep their scope order after the scored ones. The scope and
+    score of each result are added to its metadata.
+
+    Args:
+        scope_results: Search results keyed by the scope that was searched
+        source: Value of the "source" metadata key
+        lazy: Return a LazyMemoryContents view instead of a list
+
+    Returns:
+        The merged results
+    """
+    seen: set[str] = set()
+    entries: list[tuple[str, Any]] = []
+    for scope, graph_results in scope_results.items():
+        for item in getattr(graph_results, scope) or []:
+            if item.uuid_ in seen:
+                continue
+            seen.add(item.uuid_)
+            entries.append((scope, item))
+
+    entries.sort(key=lambda entry: (entry[1].score is None, -(entry[1].score or 0.0)))
+    contents = LazyMemoryContents(entries, source, annotate=True)
+    return contents if lazy else list(contents)
@@ -0,0 +1,257 @@
+"""
+Latency telemetry for the Zep calls made by the AutoGen memories and tools.
+
+Every remote call is reported to an optional sink as a ZepCallEvent. Sinks are plain
+callables; log_to_autogen_events forwards events to AutoGen's event logger and
+LatencyAggregator collects latency percentiles per operation.
+"""
+
+import json
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Literal, TypeVar
+
+from autogen_core import EVENT_LOGGER_NAME
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+CacheStatus = Literal["hit", "miss"]
+
+# Fields holding the text of Zep request and response items, and the lists of items
+_TEXT_FIELDS = ("content", "fact", "summary", "data", "context")
+_LIST_FIELDS = ("edges", "nodes", "episodes", "messages")
+
+
+@dataclass
+class ZepCallEvent:
+    """
+    Timing of one Zep call.
+
+    Attributes:
+        operation: Zep API method, e.g. "graph.search" or "thread.add_messages"
+        component: Memory class or tool function that made the call
+        duration_ms: Wall time of the call in milliseconds, 0 for cache hits
+        scope: Search scope for graph.search calls
+        result_count: Number of items written, or returned by a read
+        bytes: UTF-8 size of the text written, or returned by a read
+        cache: "hit" if a local cache answered without a call, "miss" if a cache was
+            checked first, None if the call is not cached
+        error: Exception type name if the call failed
+    """
+
+    operation: str
+    component: str
+    duration_ms: float
+    scope: str | None = None
+    result_count: int | None = None
+    bytes: int | None = None
+    cache: CacheStatus | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the event as a JSON-serializable dict, tagged like AutoGen's events."""
+        return {"type": "ZepCall", **asdict(self)}
+
+    def __str__(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+TelemetrySink = Callable[[ZepCallEvent], None]
+
+
+def log_to_autogen_events(event: ZepCallEvent) -> None:
+    """Telemetry sink that logs events to AutoGen's event logger (autogen_core.events)."""
+    logging.getLogger(EVENT_LOGGER_NAME).info(event)
+
+
+class LatencyAggregator:
+    """
+    Telemetry sink that reports p50/p95/p99 latency per operation.
+
+    The most recent max_samples durations of each operation are kept. Cache hits and
+    errors are counted; cache hits are left out of the percentiles since they make no
+    remote call.
+
+    Args:
+        max_samples: Number of durations kept per operation
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self._max_samples = max_samples
+        self._durations: dict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._max_samples)
+        )
+        self._counts: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "errors": 0, "cache_hits": 0}
+        )
+
+    def __call__(self, event: ZepCallEvent) -> None:
+        counts = self._counts[event.operation]
+        if event.cache == "hit":
+            counts["cache_hits"] += 1
+            return
+        counts["calls"] += 1
+        if event.error is not None:
+            counts["errors"] += 1
+        self._durations[event.operation].append(event.duration_ms)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Get the latency percentiles of each operation.
+
+        Returns:
+            Per operation: calls, errors, cache_hits, and p50_ms, p95_ms and p99_ms over
+            the kept durations (absent when there are none)
+        """
+        summary: dict[str, dict[str, float]] = {}
+        for operation, counts in self._counts.items():
+            stats: dict[str, float] = dict(counts)
+            durations = sorted(self._durations.get(operation, ()))
+            if durations:
+                for percentile in (50, 95, 99):
+                    stats[f"p{percentile}_ms"] = _nearest_rank(durations, percentile)
+            summary[operation] = stats
+        return summary
+
+    def reset(self) -> None:
+        """Drop all collected durations and counts."""
+        self._durations.clear()
+        self._counts.clear()
+
+
+def _nearest_rank(sorted_values: list[float], percentile: float) -> float:
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure_payload(payload: Any) -> tuple[int | None, int | None]:
+    """
+    Count the items in a Zep request or response and the UTF-8 size of their text.
+
+    Handles strings, lists of messages or episodes, and responses holding lists of
+    edges, nodes, episodes or messages, or a context string.
+
+    Returns:
+        The item count and byte size, or (None, None) for no payload
+    """
+    if payload is None:
+        return None, None
+
+    if isinstance(payload, list | tuple):
+        items = list(payload)
+    else:
+        lists = [getattr(payload, field, None) for field in _LIST_FIELDS]
+        items = [item for value in lists if isinstance(value, list) for item in value]
+        if not any(isinstance(value, list) for value in lists):
+            size = _text_bytes(payload)
+            return (1 if size else 0), size
+
+    return len(items), sum(_text_bytes(item) for item in items)
+
+
+def _text_bytes(item: Any) -> int:
+    if isinstance(item, str):
+        return len(item.encode())
+    for field in _TEXT_FIELDS:
+        value = getattr(item, field, None)
+        if isinstance(value, str):
+            return len(value.encode())
+    return 0
+
+
+def emit(sink: TelemetrySink | None, event: ZepCallEvent) -> None:
+    """Send an event to a sink. Sink errors are logged so they never fail the call."""
+    if sink is None:
+        return
+    try:
+        sink(event)
+    except Exception as e:
+        logger.debug(f"Telemetry sink failed for {event.operation}: {e}")
+
+
+def report_cache_hit(
+    sink: TelemetrySink | None,
+    operation: str,
+    result: Any,
+    *,
+    component: str,
+    scope: str | None = None,
+) -> None:
+    """Report a read served from a local cache instead of a Zep call."""
+    if sink is None:
+        return
+    count, size = measure_payload(result)
+    emit(
+        sink,
+        ZepCallEvent(
+            operation=operation,
+            component=component,
+            duration_ms=0.0,
+            scope=scope,
+            result_count=count,
+            bytes=size,
+            cache="hit",
+        ),
+    )
+
+
+async def timed_call(
+    sink: TelemetrySink | None,
+    operation: str,
+    call: Awaitable[T],
+    *,
+    component: str,
+    scope: str | None = None,
+    cache: CacheStatus | None = None,
+    sent: Any = None,
+) -> T:
+    """
+    Await a Zep call and report its timing to a sink.
+
+    Args:
+        sink: Sink to report to; the call is awaited untimed when None
+        operation: Zep API method being called
+        call: Coroutine performing the request
+        component: Memory class or tool function making the call
+        scope: Search scope, for graph.search
+        cache: Cache status, if a local cache was checked before calling
+        sent: Items written by the call; their count and size are reported instead of
+            those of the response
+
+    Returns:
+        The result of the call
+    """
+    if sink is None:
+        return await call
+
+    started = time.perf_counter()
+    result: Any = None
+    error: str | None = None
+    try:
+        response = await call
+        result = response
+        return response
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        count, size = measure_payload(sent if sent is not None else result)
+        emit(
+            sink,
+            ZepCallEvent(
+                operation=operation,
+                component=component,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                scope=scope,
+                result_count=count,
+                bytes=size,
+                cache=cache,
+                error=error,
+            ),
+        )
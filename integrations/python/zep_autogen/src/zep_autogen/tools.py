@@ -5,15 +5,129 @@ This module provides AutoGen tools for interacting with Zep memory storage,
 including graph and user memory operations.
 """
 
+import asyncio
+import base64
+import hashlib
 import logging
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
+from autogen_core import CancellationToken
 from autogen_core.tools import FunctionTool
+from pydantic import BaseModel, Field
 from zep_cloud.client import AsyncZep
+from zep_cloud.types import EpisodeData
+
+from .batch import DEFAULT_MAX_CONCURRENCY, write_in_chunks
+from .buffer import MAX_EPISODES_PER_BATCH
+from .telemetry import TelemetrySink, timed_call
+from .utils import run_cancellable
 
 logger = logging.getLogger(__name__)
 
 
+SEARCH_SCOPES = ("edges", "nodes", "episodes")
+
+# Largest limit accepted by graph.search
+MAX_SEARCH_LIMIT = 50
+
+
+def _parse_scopes(scope: str | None) -> list[str]:
+    """Split a comma-separated scope argument, defaulting to edges."""
+    scopes = [part.strip() for part in (scope or "edges").split(",") if part.strip()]
+    unknown = [part for part in scopes if part not in SEARCH_SCOPES]
+    if unknown or not scopes:
+        raise ValueError(
+            f"Unsupported search scope: {scope}. Use one or more of {', '.join(SEARCH_SCOPES)}"
+        )
+    return list(dict.fromkeys(scopes))
+
+
+def _search_result_items(search_results: Any) -> list[tuple[str, dict[str, Any]]]:
+    """Convert graph search results to (uuid, result dict) pairs."""
+    items: list[tuple[str, dict[str, Any]]] = []
+
+    if search_results.edges:
+        for edge in search_results.edges:
+            items.append(
+                (
+                    edge.uuid_,
+                    {
+                        "content": edge.fact,
+                        "type": "edge",
+                        "name": edge.name,
+                        "attributes": edge.attributes or {},
+                        "created_at": edge.created_at,
+                        "valid_at": edge.valid_at,
+                        "invalid_at": edge.invalid_at,
+                        "expired_at": edge.expired_at,
+                    },
+                )
+            )
+
+    if search_results.nodes:
+        for node in search_results.nodes:
+            items.append(
+                (
+                    node.uuid_,
+                    {
+                        "content": f"{node.name}: {node.summary}",
+                        "type": "node",
+                        "name": node.name,
+                        "attributes": node.attributes or {},
+                        "created_at": node.created_at,
+                    },
+                )
+            )
+
+    if search_results.episodes:
+        for episode in search_results.episodes:
+            items.append(
+                (
+                    episode.uuid_,
+                    {
+                        "content": episode.content,
+                        "type": "episode",
+                        "source": episode.source,
+                        "role": episode.role,
+                        "created_at": episode.created_at,
+                    },
+                )
+            )
+
+    return items
+
+
+async def _search_scopes(
+    client: AsyncZep,
+    query: str,
+    graph_id: str | None,
+    user_id: str | None,
+    limit: int,
+    scopes: list[str],
+    telemetry_sink: TelemetrySink | None = None,
+    component: str = "search_memory",
+) -> list[list[tuple[str, dict[str, Any]]]]:
+    """Search every scope concurrently and return the results of each scope."""
+    if graph_id:
+        searches = [
+            client.graph.search(graph_id=graph_id, query=query, limit=limit, scope=scope)
+            for scope in scopes
+        ]
+    else:
+        searches = [
+            client.graph.search(user_id=user_id, query=query, limit=limit, scope=scope)
+            for scope in scopes
+        ]
+    searches = [
+        timed_call(telemetry_sink, "graph.search", search, component=component, scope=scope)
+        for scope, search in zip(scopes, searches, strict=True)
+    ]
+
+    return [
+        _search_result_items(search_results) for search_results in await asyncio.gather(*searches)
+    ]
+
+
 async def search_memory(
     client: AsyncZep,
     query: Annotated[str, "The search query to find relevant memories"],
@@ -22,22 +136,27 @@ async def search_memory(
     limit: Annotated[int, "Maximum number of results to return"] = 10,
     scope: Annotated[
         str | None,
-        "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes' (for knowledge graph). Defaults to edges",
+        "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes', or several separated by commas. Defaults to edges",
     ] = "edges",
+    cancellation_token: CancellationToken | None = None,
+    telemetry_sink: TelemetrySink | None = None,
 ) -> list[dict[str, Any]]:
     """
     Search Zep memory storage for relevant information.
 
     Searches either graph memory (if graph_id provided) or user memory (if user_id provided).
-    Exactly one of graph_id or user_id must be provided.
+    Exactly one of graph_id or user_id must be provided. Several comma-separated
+    scopes are searched concurrently, each with the given limit.
 
     Args:
         client: AsyncZep client instance
         query: Search query string
         graph_id: Graph ID for graph memory search
         user_id: User ID for user memory search
-        limit: Maximum results to return
-        scope: Optional search filters
+        limit: Maximum results to return per scope
+        scope: Scope or comma-separated scopes to search
+        cancellation_token: Optional token; cancelling it aborts the in-flight search
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
 
     Returns:
         List of memory results with content and metadata
@@ -52,63 +171,142 @@ async def search_memory(
         raise ValueError("Only one of graph_id or user_id should be provided")
 
     try:
-        results = []
-        if graph_id:
-            # Search graph memory
-            search_results = await client.graph.search(
-                graph_id=graph_id, query=query, limit=limit, scope=scope
-            )
+        scope_items = await run_cancellable(
+            lambda: _search_scopes(
+                client, query, graph_id, user_id, limit, _parse_scopes(scope), telemetry_sink
+            ),
+            cancellation_token,
+        )
+        results = [result for items in scope_items for _, result in items]
 
-        else:  # user_id provided
-            # Search user memory
-            search_results = await client.graph.search(user_id=user_id, query=query, limit=limit)
+        logger.info(f"Found {len(results)} memories for query: {query}")
+        return results
 
-        # Process graph results
-        if search_results.edges:
-            for edge in search_results.edges:
-                results.append(
-                    {
-                        "content": edge.fact,
-                        "type": "edge",
-                        "name": edge.name,
-                        "attributes": edge.attributes or {},
-                        "created_at": edge.created_at,
-                        "valid_at": edge.valid_at,
-                        "invalid_at": edge.invalid_at,
-                        "expired_at": edge.expired_at,
-                    }
-                )
+    except Exception as e:
+        logger.error(f"Error searching memory: {e}")
+        return []
 
-        if search_results.nodes:
-            for node in search_results.nodes:
-                results.append(
-                    {
-                        "content": f"{node.name}: {node.summary}",
-                        "type": "node",
-                        "name": node.name,
-                        "attributes": node.attributes or {},
-                        "created_at": node.created_at,
-                    }
-                )
 
-        if search_results.episodes:
-            for episode in search_results.episodes:
-                results.append(
-                    {
-                        "content": episode.content,
-                        "type": "episode",
-                        "source": episode.source,
-                        "role": episode.role,
-                        "created_at": episode.created_at,
-                    }
-                )
+def _encode_cursor(fingerprint: bytes, page: int, seen: list[bytes]) -> str:
+    """Pack the query fingerprint, page number and seen result ids into a cursor."""
+    payload = fingerprint + page.to_bytes(2, "big") + b"".join(seen)
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: bytes) -> tuple[int, set[bytes]]:
+    """Unpack a cursor created by _encode_cursor for the same query."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+
+    if len(payload) < 6 or payload[:4] != fingerprint or (len(payload) - 6) % 4:
+        raise ValueError("Invalid cursor for this query")
+
+    page = int.from_bytes(payload[4:6], "big")
+    seen = {payload[i : i + 4] for i in range(6, len(payload), 4)}
+    return page, seen
 
-        logger.info(f"Found {len(results)} memories for query: {query}")
-        return results
 
+def _short_id(uuid: str) -> bytes:
+    """Four-byte digest of a result UUID, used in the cursor's dedupe set."""
+    return hashlib.blake2b(uuid.encode(), digest_size=4).digest()
+
+
+async def search_memory_page(
+    client: AsyncZep,
+    query: Annotated[str, "The search query to find relevant memories"],
+    graph_id: Annotated[str | None, "Graph ID to search in (for generic knowledge graph)"] = None,
+    user_id: Annotated[str | None, "User ID to search graph for (for user knowledge graph)"] = None,
+    page_size: Annotated[int, "Maximum number of new results to return"] = 10,
+    scope: Annotated[
+        str | None,
+        "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes', or several separated by commas. Defaults to edges",
+    ] = "edges",
+    cursor: Annotated[str | None, "Cursor from a previous page to get the next results"] = None,
+    cancellation_token: CancellationToken | None = None,
+    telemetry_sink: TelemetrySink | None = None,
+) -> dict[str, Any]:
+    """
+    Search Zep memory storage one page at a time.
+
+    Each page returns up to page_size results that earlier pages did not return.
+    The cursor carries a compact set of the results already returned (four bytes
+    per result), so follow-up pages only send new items to the agent.
+
+    Args:
+        client: AsyncZep client instance
+        query: Search query string
+        graph_id: Graph ID for graph memory search
+        user_id: User ID for user memory search
+        page_size: Maximum new results per page
+        scope: Scope or comma-separated scopes to search
+        cursor: next_cursor of the previous page, or None for the first page
+        cancellation_token: Optional token; cancelling it aborts the in-flight search
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
+
+    Returns:
+        Dictionary with the page's results and next_cursor, which is None when
+        there are no more results. Like search_memory, a failed search (including an
+        unknown scope or a cursor from a different search) returns no results
+
+    Raises:
+        ValueError: If neither or both graph_id and user_id are provided
+    """
+    if not graph_id and not user_id:
+        raise ValueError("Either graph_id or user_id must be provided")
+
+    if graph_id and user_id:
+        raise ValueError("Only one of graph_id or user_id should be provided")
+
+    try:
+        scopes = _parse_scopes(scope)
+        fingerprint = hashlib.blake2b(
+            f"{graph_id}|{user_id}|{query}|{','.join(scopes)}".encode(), digest_size=4
+        ).digest()
+        page, seen = _decode_cursor(cursor, fingerprint) if cursor else (0, set())
+
+        # Zep has no offsets, so each page asks for enough results to cover earlier pages
+        limit = min((page + 1) * page_size, MAX_SEARCH_LIMIT)
+        scope_items = await run_cancellable(
+            lambda: _search_scopes(
+                client,
+                query,
+                graph_id,
+                user_id,
+                limit,
+                scopes,
+                telemetry_sink,
+                component="search_memory_page",
+            ),
+            cancellation_token,
+        )
     except Exception as e:
         logger.error(f"Error searching memory: {e}")
-        return []
+        return {"results": [], "next_cursor": None}
+
+    results: list[dict[str, Any]] = []
+    has_more = False
+    for uuid, result in (item for items in scope_items for item in items):
+        short_id = _short_id(uuid)
+        if short_id in seen:
+            continue
+        if len(results) == page_size:
+            has_more = True
+            break
+        seen.add(short_id)
+        results.append(result)
+
+    # A scope that filled its limit may have more results beyond it
+    if limit < MAX_SEARCH_LIMIT and any(len(items) == limit for items in scope_items):
+        has_more = True
+
+    next_cursor = None
+    if results and has_more:
+        next_cursor = _encode_cursor(fingerprint, page + 1, sorted(seen))
+
+    logger.info(f"Found {len(results)} new memories for query: {query}")
+    return {"results": results, "next_cursor": next_cursor}
 
 
 async def add_graph_data(
@@ -117,6 +315,8 @@ async def add_graph_data(
     graph_id: Annotated[str | None, "Graph ID to store data in (for graph memory)"] = None,
     user_id: Annotated[str | None, "User ID to store data for (for user memory)"] = None,
     data_type: Annotated[str, "Type of data: 'text', 'json', or 'message'"] = "text",
+    cancellation_token: CancellationToken | None = None,
+    telemetry_sink: TelemetrySink | None = None,
 ) -> dict[str, Any]:
     """
     Add data to Zep memory storage.
@@ -129,6 +329,8 @@ async def add_graph_data(
         graph_id: Graph ID for non-user graph storage
         user_id: User ID for user graph storage
         data_type: Type of data being stored
+        cancellation_token: Optional token; cancelling it aborts the in-flight request
+        telemetry_sink: Optional callable receiving a ZepCallEvent for the Zep call
 
     Returns:
         Dictionary with operation result
@@ -145,7 +347,16 @@ async def add_graph_data(
     try:
         if graph_id:
             # Add to graph memory
-            await client.graph.add(graph_id=graph_id, type=data_type, data=data)
+            await run_cancellable(
+                lambda: timed_call(
+                    telemetry_sink,
+                    "graph.add",
+                    client.graph.add(graph_id=graph_id, type=data_type, data=data),
+                    component="add_graph_data",
+                    sent=data,
+                ),
+                cancellation_token,
+            )
 
             logger.debug(f"Added data to graph {graph_id}")
             return {
@@ -157,7 +368,16 @@ async def add_graph_data(
 
         else:  # user_id provided
             # Add to user graph memory
-            await client.graph.add(user_id=user_id, type=data_type, data=data)
+            await run_cancellable(
+                lambda: timed_call(
+                    telemetry_sink,
+                    "graph.add",
+                    client.graph.add(user_id=user_id, type=data_type, data=data),
+                    component="add_graph_data",
+                    sent=data,
+                ),
+                cancellation_token,
+            )
 
             logger.debug(f"Added data to user graph {user_id}")
             return {
@@ -172,8 +392,101 @@ async def add_graph_data(
         return {"success": False, "message": f"Failed to add data: {str(e)}"}
 
 
+class GraphDataItem(BaseModel):
+    """One item for add_graph_data_batch."""
+
+    data: str = Field(description="The data/information to store")
+    data_type: Literal["text", "json", "message"] = Field(
+        default="text", description="Type of data: 'text', 'json', or 'message'"
+    )
+
+
+async def add_graph_data_batch(
+    client: AsyncZep,
+    items: Annotated[list[GraphDataItem], "The items to store, each with data and data_type"],
+    graph_id: Annotated[str | None, "Graph ID to store data in (for graph memory)"] = None,
+    user_id: Annotated[str | None, "User ID to store data for (for user memory)"] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cancellation_token: CancellationToken | None = None,
+    telemetry_sink: TelemetrySink | None = None,
+) -> dict[str, Any]:
+    """
+    Add several items to Zep memory storage with batch ingestion.
+
+    Items are submitted with graph.add_batch in chunks of up to 20, with at most
+    max_concurrency chunks in flight. A failed chunk does not stop the others.
+
+    Args:
+        client: AsyncZep client instance
+        items: Items to store
+        graph_id: Graph ID for non-user graph storage
+        user_id: User ID for user graph storage
+        max_concurrency: Largest number of add_batch calls in flight
+        cancellation_token: Optional token; cancelling it aborts the in-flight requests
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
+
+    Returns:
+        Dictionary with the overall result and the status of each item
+
+    Raises:
+        ValueError: If neither or both graph_id and user_id are provided
+    """
+    if not graph_id and not user_id:
+        raise ValueError("Either graph_id or user_id must be provided")
+
+    if graph_id and user_id:
+        raise ValueError("Only one of graph_id or user_id should be provided")
+
+    episodes = [EpisodeData(data=item.data, type=item.data_type) for item in items]
+
+    async def write_chunk(chunk: list[EpisodeData]) -> None:
+        if graph_id:
+            call = client.graph.add_batch(graph_id=graph_id, episodes=chunk)
+        else:
+            call = client.graph.add_batch(user_id=user_id, episodes=chunk)
+        await timed_call(
+            telemetry_sink,
+            "graph.add_batch",
+            call,
+            component="add_graph_data_batch",
+            sent=chunk,
+        )
+
+    errors = await run_cancellable(
+        lambda: write_in_chunks(episodes, write_chunk, MAX_EPISODES_PER_BATCH, max_concurrency),
+        cancellation_token,
+    )
+
+    statuses: list[dict[str, Any]] = []
+    for index, error in enumerate(errors):
+        if error is None:
+            statuses.append({"index": index, "success": True})
+        else:
+            statuses.append({"index": index, "success": False, "error": str(error)})
+
+    failed = sum(1 for error in errors if error is not None)
+    if failed:
+        logger.error(f"Failed to add {failed} of {len(items)} items to memory")
+    else:
+        logger.debug(
+            f"Added {len(items)} items to {'graph ' + graph_id if graph_id else 'user graph'}"
+        )
+
+    return {
+        "success": failed == 0,
+        "message": f"Added {len(items) - failed} of {len(items)} items to memory",
+        "added": len(items) - failed,
+        "failed": failed,
+        "items": statuses,
+    }
+
+
 def create_search_graph_tool(
-    client: AsyncZep, graph_id: str | None = None, user_id: str | None = None
+    client: AsyncZep,
+    graph_id: str | None = None,
+    user_id: str | None = None,
+    paginate: bool = False,
+    telemetry_sink: TelemetrySink | None = None,
 ) -> FunctionTool:
     """
     Create a search memory tool bound to a Zep client.
@@ -182,6 +495,9 @@ def create_search_graph_tool(
         client: AsyncZep client instance
         graph_id: Optional graph ID to bind to this tool
         user_id: Optional user ID to bind to this tool
+        paginate: Return pages of new results with a next_cursor (see search_memory_page)
+            instead of a plain list
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
 
     Returns:
         FunctionTool for searching memory
@@ -202,19 +518,64 @@ def create_search_graph_tool(
         limit: Annotated[int, "Maximum number of results to return"] = 10,
         scope: Annotated[
             str | None,
-            "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes' (for knowledge graph). Defaults to edges",
+            "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes', or several separated by commas. Defaults to edges",
         ] = "edges",
+        cancellation_token: CancellationToken | None = None,
     ) -> list[dict[str, Any]]:
-        return await search_memory(client, query, graph_id, user_id, limit, scope)
+        return await search_memory(
+            client,
+            query,
+            graph_id,
+            user_id,
+            limit,
+            scope,
+            cancellation_token=cancellation_token,
+            telemetry_sink=telemetry_sink,
+        )
+
+    async def bound_search_memory_page(
+        query: Annotated[str, "The search query to find relevant memories"],
+        page_size: Annotated[int, "Maximum number of new results to return"] = 10,
+        scope: Annotated[
+            str | None,
+            "Scope of search: 'edges' (facts), 'nodes' (entities), 'episodes', or several separated by commas. Defaults to edges",
+        ] = "edges",
+        cursor: Annotated[
+            str | None, "next_cursor from a previous search to get more results, or null"
+        ] = None,
+        cancellation_token: CancellationToken | None = None,
+    ) -> dict[str, Any]:
+        return await search_memory_page(
+            client,
+            query,
+            graph_id,
+            user_id,
+            page_size,
+            scope,
+            cursor,
+            cancellation_token=cancellation_token,
+            telemetry_sink=telemetry_sink,
+        )
+
+    target = "graph " + (graph_id or "") if graph_id else "user " + (user_id or "")
+    if paginate:
+        return FunctionTool(
+            bound_search_memory_page,
+            description=f"Search Zep memory storage for relevant information in {target}. "
+            "Pass next_cursor back to get more results without repeating earlier ones.",
+        )
 
     return FunctionTool(
         bound_search_memory,
-        description=f"Search Zep memory storage for relevant information in {'graph ' + (graph_id or '') if graph_id else 'user ' + (user_id or '')}.",
+        description=f"Search Zep memory storage for relevant information in {target}.",
     )
 
 
 def create_add_graph_data_tool(
-    client: AsyncZep, graph_id: str | None = None, user_id: str | None = None
+    client: AsyncZep,
+    graph_id: str | None = None,
+    user_id: str | None = None,
+    telemetry_sink: TelemetrySink | None = None,
 ) -> FunctionTool:
     """
     Create an add memory data tool bound to a Zep client.
@@ -223,6 +584,7 @@ def create_add_graph_data_tool(
         client: AsyncZep client instance
         graph_id: Optional graph ID to bind to this tool
         user_id: Optional user ID to bind to this tool
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
 
     Returns:
         FunctionTool for adding memory data
@@ -241,10 +603,72 @@ def create_add_graph_data_tool(
     async def bound_add_memory_data(
         data: Annotated[str, "The data/information to store in memory"],
         data_type: Annotated[str, "Type of data: 'text', 'json', or 'message'"] = "text",
+        cancellation_token: CancellationToken | None = None,
     ) -> dict[str, Any]:
-        return await add_graph_data(client, data, graph_id, user_id, data_type)
+        return await add_graph_data(
+            client,
+            data,
+            graph_id,
+            user_id,
+            data_type,
+            cancellation_token=cancellation_token,
+            telemetry_sink=telemetry_sink,
+        )
 
     return FunctionTool(
         bound_add_memory_data,
         description=f"Add data to Zep memory storage in {'graph ' + (graph_id or '') if graph_id else 'user ' + (user_id or '')}.",
     )
+
+
+def create_add_graph_data_batch_tool(
+    client: AsyncZep,
+    graph_id: str | None = None,
+    user_id: str | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    telemetry_sink: TelemetrySink | None = None,
+) -> FunctionTool:
+    """
+    Create a bulk add memory data tool bound to a Zep client.
+
+    The tool lets an agent store many items in one call instead of one call per item.
+
+    Args:
+        client: AsyncZep client instance
+        graph_id: Optional graph ID to bind to this tool
+        user_id: Optional user ID to bind to this tool
+        max_concurrency: Largest number of add_batch calls in flight per tool call
+        telemetry_sink: Optional callable receiving a ZepCallEvent for each Zep call
+
+    Returns:
+        FunctionTool for adding several memory items at once
+
+    Raises:
+        ValueError: If neither or both graph_id and user_id are provided
+    """
+    if not graph_id and not user_id:
+        raise ValueError("Either graph_id or user_id must be provided when creating the tool")
+
+    if graph_id and user_id:
+        raise ValueError(
+            "Only one of graph_id or user_id should be provided when creating the tool"
+        )
+
+    async def bound_add_memory_data_batch(
+        items: Annotated[list[GraphDataItem], "The items to store, each with data and data_type"],
+        cancellation_token: CancellationToken | None = None,
+    ) -> dict[str, Any]:
+        return await add_graph_data_batch(
+            client,
+            items,
+            graph_id,
+            user_id,
+            max_concurrency=max_concurrency,
+            cancellation_token=cancellation_token,
+            telemetry_sink=telemetry_sink,
+        )
+
+    return FunctionTool(
+        bound_add_memory_data_batch,
+        description=f"Add several items to Zep memory storage in one call in {'graph ' + (graph_id or '') if graph_id else 'user ' + (user_id or '')}.",
+    )
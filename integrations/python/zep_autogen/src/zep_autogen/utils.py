@@ -0,0 +1,60 @@
+"""
+Utility functions for Zep AutoGen integration.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+from autogen_core import CancellationToken
+from zep_cloud.core.api_error import ApiError
+
+T = TypeVar("T")
+
+
+async def run_cancellable(
+    call: Callable[[], Awaitable[T]], cancellation_token: CancellationToken | None
+) -> T:
+    """
+    Make a Zep call, linking it to an AutoGen cancellation token.
+
+    The call runs as a task that is cancelled as soon as the token is, which aborts
+    the in-flight HTTP request (or, for a gather, every request in it) and raises
+    asyncio.CancelledError in the caller. If the token is already cancelled the
+    call is never made, so no request is created or sent.
+
+    Args:
+        call: Makes the Zep request(s), e.g. a lambda around the client call
+        cancellation_token: Optional token to link the call to
+
+    Returns:
+        The result of the call
+    """
+    if cancellation_token is None:
+        return await call()
+
+    if cancellation_token.is_cancelled():
+        raise asyncio.CancelledError()
+
+    future = asyncio.ensure_future(call())
+    cancellation_token.link_future(future)
+    return await future
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Tell whether a failed Zep call may succeed if made again.
+
+    Timeouts, connection errors, rate limiting (429) and server errors (5xx) are
+    retryable. Other API errors, such as 400 or 404, and any other exception are not.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    if isinstance(error, ApiError):
+        return (
+            error.status_code is None
+            or error.status_code in (408, 429)
+            or (error.status_code >= 500)
+        )
+    return False
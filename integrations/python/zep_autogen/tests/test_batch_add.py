@@ -0,0 +1,177 @@
+"""
+Tests for batch adds in the Zep AutoGen tools and memories.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import (
+    ZepBatchAddError,
+    ZepGraphMemory,
+    ZepUserMemory,
+    ZepWriteNotAttemptedError,
+    create_add_graph_data_batch_tool,
+)
+
+
+def _mock_client() -> MagicMock:
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.add_batch = AsyncMock()
+    mock_client.thread = MagicMock()
+    mock_client.thread.get = AsyncMock()
+    mock_client.thread.add_messages = AsyncMock()
+    return mock_client
+
+
+def _text(text: str, **metadata) -> MemoryContent:
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT, metadata=metadata or None)
+
+
+class TestAddGraphDataBatchTool:
+    """Test the bulk add tool."""
+
+    @pytest.mark.asyncio
+    async def test_reports_per_item_status(self):
+        """Test that items are chunked and a failed chunk only fails its own items."""
+        mock_client = _mock_client()
+
+        async def add_batch(**kwargs):
+            if kwargs["episodes"][0].data == "fact 20":
+                raise RuntimeError("rate limited")
+
+        mock_client.graph.add_batch.side_effect = add_batch
+        tool = create_add_graph_data_batch_tool(mock_client, graph_id="test-graph")
+
+        result = await tool.run_json(
+            {"items": [{"data": f"fact {i}"} for i in range(25)]}, CancellationToken()
+        )
+
+        assert mock_client.graph.add_batch.await_count == 2
+        assert result["added"] == 20 and result["failed"] == 5
+        assert result["success"] is False
+        assert all(status["success"] for status in result["items"][:20])
+        assert result["items"][24] == {"index": 24, "success": False, "error": "rate limited"}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that at most max_concurrency batches are in flight."""
+        mock_client = _mock_client()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def add_batch(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        mock_client.graph.add_batch.side_effect = add_batch
+        tool = create_add_graph_data_batch_tool(mock_client, user_id="test-user", max_concurrency=2)
+
+        result = await tool.run_json(
+            {"items": [{"data": f"fact {i}", "data_type": "text"} for i in range(100)]},
+            CancellationToken(),
+        )
+
+        assert result["success"] is True
+        assert mock_client.graph.add_batch.await_count == 5
+        assert max_in_flight == 2
+        assert mock_client.graph.add_batch.await_args.kwargs["user_id"] == "test-user"
+
+
+class TestAddMany:
+    """Test add_many on the memory classes."""
+
+    @pytest.mark.asyncio
+    async def test_graph_memory_add_many_uses_add_batch(self):
+        """Test that ZepGraphMemory.add_many writes chunks of 20 with add_batch."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        await memory.add_many([_text(f"fact {i}") for i in range(45)])
+
+        sizes = [
+            len(call.kwargs["episodes"]) for call in mock_client.graph.add_batch.await_args_list
+        ]
+        assert sorted(sizes) == [5, 20, 20]
+        mock_client.graph.add.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_user_memory_add_many_splits_messages_and_data(self):
+        """Test that messages go to the thread in order and data to the user graph."""
+        mock_client = _mock_client()
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="batch-thread")
+        contents = [_text(f"message {i}", type="message") for i in range(35)]
+        contents.insert(3, _text("likes hiking"))
+
+        await memory.add_many(contents)
+
+        message_batches = [
+            [message.content for message in call.kwargs["messages"]]
+            for call in mock_client.thread.add_messages.await_args_list
+        ]
+        assert message_batches == [
+            [f"message {i}" for i in range(30)],
+            [f"message {i}" for i in range(30, 35)],
+        ]
+        episodes = mock_client.graph.add_batch.await_args.kwargs["episodes"]
+        assert [(episode.data, episode.type) for episode in episodes] == [("likes hiking", "text")]
+
+    @pytest.mark.asyncio
+    async def test_add_many_reports_failed_items(self):
+        """Test that failed items are reported while the rest are still written."""
+        mock_client = _mock_client()
+
+        async def add_batch(**kwargs):
+            if kwargs["episodes"][0].data == "fact 0":
+                raise RuntimeError("boom")
+
+        mock_client.graph.add_batch.side_effect = add_batch
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        with pytest.raises(ZepBatchAddError) as exc_info:
+            await memory.add_many([_text(f"fact {i}") for i in range(25)])
+
+        assert exc_info.value.failed_indices == list(range(20))
+        assert mock_client.graph.add_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_add_many_stops_messages_at_first_failure(self):
+        """Test that messages after a failed chunk are not sent, leaving no gap."""
+        mock_client = _mock_client()
+
+        async def add_messages(**kwargs):
+            if kwargs["messages"][0].content == "message 30":
+                raise RuntimeError("boom")
+
+        mock_client.thread.add_messages.side_effect = add_messages
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="batch-thread")
+
+        with pytest.raises(ZepBatchAddError) as exc_info:
+            await memory.add_many([_text(f"message {i}", type="message") for i in range(70)])
+
+        assert mock_client.thread.add_messages.await_count == 2
+        assert exc_info.value.failed_indices == list(range(30, 70))
+        assert exc_info.value.not_attempted_indices == list(range(60, 70))
+        assert isinstance(exc_info.value.errors[60], ZepWriteNotAttemptedError)
+
+    @pytest.mark.asyncio
+    async def test_invalid_content_writes_nothing(self):
+        """Test that validation happens before any write."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        with pytest.raises(ValueError, match="Unsupported mime type"):
+            await memory.add_many(
+                [_text("fact"), MemoryContent(content="x", mime_type=MemoryMimeType.IMAGE)]
+            )
+
+        mock_client.graph.add_batch.assert_not_awaited()
@@ -0,0 +1,175 @@
+"""
+Tests for WriteBuffer.
+"""
+
+import asyncio
+
+import pytest
+from zep_cloud import BadRequestError, InternalServerError
+
+from zep_autogen.buffer import WriteBuffer
+
+
+class RecordingWriter:
+    """Batch writer that records batches and can be slowed down."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.batches: list[list] = []
+        self.delay = delay
+
+    async def __call__(self, batch: list) -> None:
+        await asyncio.sleep(self.delay)
+        self.batches.append(batch)
+
+
+class TestWriteBuffer:
+    """Test suite for WriteBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self):
+        """Test that reaching max_batch_size writes one batch."""
+        writer = RecordingWriter()
+        buffer = WriteBuffer(writer, max_batch_size=3, flush_interval=60)
+
+        for item in range(7):
+            await buffer.put(item)
+
+        assert writer.batches == [[0, 1, 2], [3, 4, 5]]
+        assert len(buffer) == 1
+
+        await buffer.close()
+        assert writer.batches[-1] == [6]
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self):
+        """Test that buffered items are written after flush_interval."""
+        writer = RecordingWriter()
+        buffer = WriteBuffer(writer, max_batch_size=10, flush_interval=0.02)
+
+        await buffer.put(1)
+        await buffer.put(2)
+        assert writer.batches == []
+
+        await asyncio.sleep(0.1)
+        assert writer.batches == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_waits_for_in_progress_flush(self):
+        """Test that a writer filling the buffer waits for a running flush."""
+        writer = RecordingWriter(delay=0.05)
+        buffer = WriteBuffer(writer, max_batch_size=2, flush_interval=60)
+
+        await buffer.put(1)
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await buffer.put(2)
+        await buffer.put(3)
+        assert loop.time() - started >= 0.04
+
+        await flush
+        await buffer.close()
+        assert [item for batch in writer.batches for item in batch] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_retryable_failure_is_retried(self):
+        """Test that a batch failing with a retryable error is written by a retry."""
+        writer = RecordingWriter()
+        attempts = 0
+
+        async def write(batch: list[int]) -> None:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise InternalServerError(body="unavailable")
+            await writer(batch)
+
+        buffer = WriteBuffer(write, max_batch_size=10, flush_interval=60, retry_delay=0)
+
+        await buffer.put(1)
+        await buffer.flush()
+
+        assert attempts == 2
+        assert writer.batches == [[1]]
+        assert buffer.dead_letters == []
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_dropped(self):
+        """Test that a batch rejected with a 400 is not retried and does not block later adds."""
+        writer = RecordingWriter()
+        attempts: list[list[str]] = []
+
+        async def write(batch: list[str]) -> None:
+            attempts.append(batch)
+            if "a" in batch:
+                raise BadRequestError(body="invalid message")
+            await writer(batch)
+
+        buffer = WriteBuffer(write, max_batch_size=2, flush_interval=60, max_size=2)
+
+        await buffer.put("a")
+        with pytest.raises(BadRequestError):
+            await buffer.put("b")
+        for item in "cdefg":
+            await buffer.put(item)
+        await buffer.close()
+
+        assert attempts[0] == ["a", "b"]
+        assert writer.batches == [["c", "d"], ["e", "f"], ["g"]]
+        assert buffer.clear_dead_letters() == ["a", "b"]
+        assert buffer.dead_letters == []
+        # Nothing is left to fail a later flush
+        await buffer.flush()
+
+    @pytest.mark.asyncio
+    async def test_retries_are_capped(self):
+        """Test that a batch is dropped once its retries are used up."""
+        attempts = 0
+
+        async def write(batch: list[int]) -> None:
+            nonlocal attempts
+            attempts += 1
+            raise ConnectionError("Zep is down")
+
+        buffer = WriteBuffer(
+            write, max_batch_size=10, flush_interval=60, max_retries=2, retry_delay=0
+        )
+
+        await buffer.put(1)
+        with pytest.raises(ConnectionError):
+            await buffer.flush()
+
+        assert attempts == 3
+        assert len(buffer) == 0
+        assert buffer.dead_letters == [1]
+
+    @pytest.mark.asyncio
+    async def test_put_only_raises_for_own_failed_item(self):
+        """Test that put() does not raise when only a batch after its own item failed."""
+        writer = RecordingWriter(delay=0.02)
+
+        async def write(batch: list[int]) -> None:
+            if 3 in batch:
+                raise RuntimeError("write failed")
+            await writer(batch)
+
+        buffer = WriteBuffer(write, max_batch_size=2, flush_interval=60)
+
+        async def add_while_flushing() -> None:
+            await asyncio.sleep(0.01)
+            await buffer.put(3)
+            await buffer.put(4)
+
+        await buffer.put(1)
+        other = asyncio.create_task(add_while_flushing())
+        # Writes [1, 2], then [3, 4] added meanwhile, which fails
+        await buffer.put(2)
+        # Only the caller whose item was in the failed batch gets the error
+        with pytest.raises(RuntimeError):
+            await other
+
+        assert writer.batches == [[1, 2]]
+        assert buffer.dead_letters == [3, 4]
+        assert len(buffer) == 0
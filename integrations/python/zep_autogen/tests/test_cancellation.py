@@ -0,0 +1,133 @@
+"""
+Tests for cancellation token support in the Zep AutoGen memories and tools.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import ZepGraphMemory, ZepUserMemory
+from zep_autogen.telemetry import timed_call
+from zep_autogen.tools import add_graph_data, search_memory
+from zep_autogen.utils import run_cancellable
+
+
+class _SlowGraph:
+    """Graph API whose requests hang until cancelled, tracking open requests."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.started = asyncio.Event()
+
+    async def _request(self, *args, **kwargs):
+        self.in_flight += 1
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        finally:
+            self.in_flight -= 1
+
+    search = _request
+    add = _request
+
+
+def _slow_client() -> tuple[MagicMock, _SlowGraph]:
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = _SlowGraph()
+    return mock_client, mock_client.graph
+
+
+async def _cancel_when_started(graph: _SlowGraph, token: CancellationToken) -> None:
+    await graph.started.wait()
+    token.cancel()
+
+
+def _text_content() -> MemoryContent:
+    return MemoryContent(content="Likes hiking", mime_type=MemoryMimeType.TEXT)
+
+
+class TestCancellation:
+    """Test that cancelling a token aborts in-flight Zep requests."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("operation", ["query", "add"])
+    async def test_graph_memory_aborts_request(self, operation):
+        """Test that ZepGraphMemory query and add release their request on cancel."""
+        mock_client, graph = _slow_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+        token = CancellationToken()
+
+        if operation == "query":
+            call = memory.query("hiking", cancellation_token=token)
+        else:
+            call = memory.add(_text_content(), cancellation_token=token)
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.gather(call, _cancel_when_started(graph, token))
+
+        assert graph.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_user_memory_query_aborts_request(self):
+        """Test that ZepUserMemory.query releases its search request on cancel."""
+        mock_client, graph = _slow_client()
+        memory = ZepUserMemory(client=mock_client, user_id="test-user")
+        token = CancellationToken()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.gather(
+                memory.query("hiking", cancellation_token=token),
+                _cancel_when_started(graph, token),
+            )
+
+        assert graph.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_already_cancelled_token_sends_no_request(self):
+        """Test that no request is sent when the token is already cancelled."""
+        mock_client, graph = _slow_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await memory.query("hiking", cancellation_token=token)
+
+        assert not graph.started.is_set()
+
+    @pytest.mark.asyncio
+    async def test_already_cancelled_token_makes_no_request(self):
+        """Test that a call is not made at all once the token is cancelled."""
+        _, graph = _slow_client()
+        token = CancellationToken()
+        token.cancel()
+        call = MagicMock(
+            side_effect=lambda: timed_call(
+                None, "graph.search", graph.search(query="hiking"), component="test"
+            )
+        )
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_cancellable(call, token)
+
+        call.assert_not_called()
+        assert not graph.started.is_set()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tool", [search_memory, add_graph_data])
+    async def test_tools_abort_request(self, tool):
+        """Test that the tool functions release their request on cancel."""
+        mock_client, graph = _slow_client()
+        token = CancellationToken()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.gather(
+                tool(mock_client, "hiking", graph_id="test-graph", cancellation_token=token),
+                _cancel_when_started(graph, token),
+            )
+
+        assert graph.in_flight == 0
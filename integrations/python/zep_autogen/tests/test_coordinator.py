@@ -0,0 +1,164 @@
+"""
+Tests for ZepMemoryCoordinator.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import UserMessage
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import Message
+
+from zep_autogen import ZepCallEvent, ZepMemoryCoordinator, ZepUserMemory
+
+
+def _mock_client() -> MagicMock:
+    """Create an AsyncZep mock whose thread reads take a moment to complete."""
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.thread = MagicMock()
+
+    async def get_user_context(**_):
+        await asyncio.sleep(0.02)
+        return MagicMock(context="User likes hiking")
+
+    async def get_thread(*_, **__):
+        await asyncio.sleep(0.02)
+        return MagicMock(messages=[Message(role="user", content="Hi there")])
+
+    mock_client.thread.get_user_context = AsyncMock(side_effect=get_user_context)
+    mock_client.thread.get = AsyncMock(side_effect=get_thread)
+    mock_client.thread.add_messages = AsyncMock()
+    return mock_client
+
+
+async def _model_context() -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content="Where should I go?", source="user"))
+    return model_context
+
+
+def _history_fetches(mock_client: MagicMock) -> int:
+    return len([call for call in mock_client.thread.get.await_args_list if "lastn" in call.kwargs])
+
+
+class TestZepMemoryCoordinator:
+    """Test coalesced retrieval across a team's memories."""
+
+    def _team(self, mock_client, coordinator, size=3, telemetry_sink=None):
+        thread_id = f"thread-{uuid.uuid4()}"
+        return [
+            ZepUserMemory(
+                client=mock_client,
+                user_id="test-user",
+                thread_id=thread_id,
+                coordinator=coordinator,
+                telemetry_sink=telemetry_sink,
+            )
+            for _ in range(size)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_fetch(self):
+        """Test that N agents updating their context together cost one retrieval."""
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client)
+        memories = self._team(mock_client, coordinator)
+        contexts = [await _model_context() for _ in memories]
+
+        await asyncio.gather(
+            *[memory.update_context(ctx) for memory, ctx in zip(memories, contexts, strict=True)]
+        )
+
+        assert mock_client.thread.get_user_context.await_count == 1
+        assert _history_fetches(mock_client) == 1
+        for ctx in contexts:
+            content = (await ctx.get_messages())[-1].content
+            assert "User likes hiking" in content and "user: Hi there" in content
+        assert coordinator.stats["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_sequential_turns_reuse_result_within_ttl(self):
+        """Test that agents taking turns within the TTL reuse the fetched result."""
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client, ttl=60)
+        memories = self._team(mock_client, coordinator)
+
+        for memory in memories:
+            await memory.update_context(await _model_context())
+
+        assert mock_client.thread.get_user_context.await_count == 1
+        assert coordinator.stats["cache_hits"] == 4
+
+    @pytest.mark.asyncio
+    async def test_expired_reads_are_pruned(self):
+        """Test that expired reads are dropped when a new read is cached."""
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client, ttl=0.01)
+
+        await coordinator.get_user_context("thread-a", mode="basic")
+        await asyncio.sleep(0.02)
+        await coordinator.get_user_context("thread-b", mode="basic")
+        coordinator.invalidate("thread-c")
+
+        assert [key[1] for key in coordinator._cache] == ["thread-b"]
+        assert coordinator._generations == {}
+
+    @pytest.mark.asyncio
+    async def test_telemetry_reports_shared_reads_as_cache_hits(self):
+        """Test that only the caller that fetched from Zep reports a remote call."""
+        events: list[ZepCallEvent] = []
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client, ttl=60)
+        memories = self._team(mock_client, coordinator, telemetry_sink=events.append)
+        contexts = [await _model_context() for _ in memories]
+
+        await asyncio.gather(
+            *[memory.update_context(ctx) for memory, ctx in zip(memories, contexts, strict=True)]
+        )
+        await memories[0].update_context(await _model_context())
+
+        for operation in ("thread.get_user_context", "thread.get"):
+            reads = [event for event in events if event.operation == operation]
+            assert [event.cache for event in reads] == ["miss", "hit", "hit", "hit"]
+            assert reads[0].duration_ms > 0
+            assert all(event.duration_ms == 0.0 for event in reads[1:])
+            assert all(event.component == "ZepUserMemory" for event in reads)
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_cached_reads(self):
+        """Test that a message added through any memory forces a fresh retrieval."""
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client, ttl=60)
+        first, second = self._team(mock_client, coordinator, size=2)
+
+        await first.update_context(await _model_context())
+        await first.add(
+            MemoryContent(
+                content="Let's go to the Alps",
+                mime_type=MemoryMimeType.TEXT,
+                metadata={"type": "message", "role": "assistant"},
+            )
+        )
+        await second.update_context(await _model_context())
+
+        assert mock_client.thread.get_user_context.await_count == 2
+        assert _history_fetches(mock_client) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self):
+        """Test that cancelling one waiter leaves the fetch running for the others."""
+        mock_client = _mock_client()
+        coordinator = ZepMemoryCoordinator(mock_client, ttl=0)
+
+        first = asyncio.create_task(coordinator.get_user_context("thread", "summary"))
+        second = asyncio.create_task(coordinator.get_user_context("thread", "summary"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        result = await second
+        assert result.context == "User likes hiking"
+        assert mock_client.thread.get_user_context.await_count == 1
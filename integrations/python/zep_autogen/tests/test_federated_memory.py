@@ -0,0 +1,212 @@
+"""
+Tests for ZepFederatedMemory.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import SystemMessage, UserMessage
+from zep_cloud import EntityEdge, EntityNode, GraphSearchResults
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import ZepFederatedMemory
+from zep_autogen.federated_memory import reciprocal_rank_fusion
+
+
+def _edge(uuid: str, fact: str) -> EntityEdge:
+    return EntityEdge(
+        uuid_=uuid,
+        fact=fact,
+        name="RELATES_TO",
+        source_node_uuid="source",
+        target_node_uuid="target",
+        created_at="2025-01-01T00:00:00Z",
+    )
+
+
+def _node(uuid: str, name: str) -> EntityNode:
+    return EntityNode(uuid_=uuid, name=name, summary=f"About {name}", created_at="2025-01-01")
+
+
+def _mock_client(results: dict[str, GraphSearchResults], delays: dict[str, float] | None = None):
+    """Create an AsyncZep mock whose searches return results keyed by graph or user id."""
+    delays = delays or {}
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+
+    async def search(**kwargs):
+        source = kwargs.get("graph_id") or kwargs["user_id"]
+        await asyncio.sleep(delays.get(source, 0))
+        result = results.get(source, GraphSearchResults(edges=[], nodes=[]))
+        if kwargs["scope"] == "nodes":
+            return GraphSearchResults(nodes=result.nodes or [])
+        return GraphSearchResults(edges=result.edges or [])
+
+    mock_client.graph.search = AsyncMock(side_effect=search)
+    return mock_client
+
+
+async def _model_context() -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content="Plan my trip to Paris", source="user"))
+    return model_context
+
+
+class TestReciprocalRankFusion:
+    """Test the rank fusion helper."""
+
+    def test_dedupes_and_boosts_shared_results(self):
+        """Test that a result found by several sources outranks single-source results."""
+        shared = _edge("shared", "Paris is in France")
+        fused = reciprocal_rank_fusion(
+            [
+                [_edge("a", "A"), shared],
+                [_edge("b", "B"), shared],
+            ]
+        )
+
+        assert [edge.uuid_ for edge in fused] == ["shared", "a", "b"]
+
+
+class TestFederatedMemory:
+    """Test federated retrieval across a user graph and shared graphs."""
+
+    def test_requires_a_source(self):
+        """Test that at least one source must be configured."""
+        with pytest.raises(ValueError, match="At least one of"):
+            ZepFederatedMemory(client=MagicMock(spec=AsyncZep))
+
+    @pytest.mark.asyncio
+    async def test_update_context_merges_sources_into_one_message(self):
+        """Test that all sources are searched and merged into a single system message."""
+        mock_client = _mock_client(
+            {
+                "user-1": GraphSearchResults(
+                    edges=[_edge("e1", "User prefers trains")], nodes=[_node("n1", "Paris")]
+                ),
+                "travel": GraphSearchResults(
+                    edges=[_edge("e2", "Eurostar runs to Paris")], nodes=[_node("n1", "Paris")]
+                ),
+            }
+        )
+        memory = ZepFederatedMemory(
+            client=mock_client, user_id="user-1", graph_ids=["travel", "policies"]
+        )
+        model_context = await _model_context()
+
+        result = await memory.update_context(model_context)
+
+        system_messages = [
+            message
+            for message in await model_context.get_messages()
+            if isinstance(message, SystemMessage)
+        ]
+        assert len(system_messages) == 1
+        content = system_messages[0].content
+        assert "User prefers trains" in content and "Eurostar runs to Paris" in content
+        assert content.count("Name: Paris") == 1
+        assert result.memories.results[0].metadata["sources"] == [
+            "user:user-1",
+            "travel",
+            "policies",
+        ]
+        assert mock_client.graph.search.await_count == 6
+        assert set(memory.last_source_timings) == {"user:user-1", "travel", "policies"}
+        assert all(latency is not None for latency in memory.last_source_timings.values())
+
+    @pytest.mark.asyncio
+    async def test_slow_source_is_dropped_at_deadline(self):
+        """Test that a source missing the shared deadline is skipped and reported."""
+        mock_client = _mock_client(
+            {
+                "fast": GraphSearchResults(edges=[_edge("e1", "Fast fact")]),
+                "slow": GraphSearchResults(edges=[_edge("e2", "Slow fact")]),
+            },
+            delays={"slow": 5},
+        )
+        memory = ZepFederatedMemory(client=mock_client, graph_ids=["fast", "slow"], timeout=0.2)
+        model_context = await _model_context()
+
+        await memory.update_context(model_context)
+
+        content = (await model_context.get_messages())[-1].content
+        assert "Fast fact" in content and "Slow fact" not in content
+        assert memory.last_source_timings["slow"] is None
+        assert memory.last_source_timings["fast"] < 200
+
+    @pytest.mark.asyncio
+    async def test_context_respects_token_budget(self):
+        """Test that fused facts are trimmed to the token budget in rank order."""
+        mock_client = _mock_client(
+            {"kb": GraphSearchResults(edges=[_edge(f"e{i}", f"Fact number {i}") for i in range(5)])}
+        )
+        memory = ZepFederatedMemory(client=mock_client, graph_ids=["kb"], max_context_tokens=8)
+
+        result = await memory.update_context(await _model_context())
+
+        content = result.memories.results[0].content
+        assert "Fact number 0" in content and "Fact number 1" in content
+        assert "Fact number 2" not in content
+
+    @pytest.mark.asyncio
+    async def test_query_fuses_and_attributes_results(self):
+        """Test that query returns fused results labelled with their source."""
+        mock_client = _mock_client(
+            {
+                "user-1": GraphSearchResults(edges=[_edge("e1", "User prefers trains")]),
+                "travel": GraphSearchResults(edges=[_edge("e2", "Eurostar runs to Paris")]),
+            }
+        )
+        memory = ZepFederatedMemory(client=mock_client, user_id="user-1", graph_ids=["travel"])
+
+        result = await memory.query("trains", limit=2)
+
+        assert [(item.content, item.metadata["source"]) for item in result.results] == [
+            ("User prefers trains", "user:user-1"),
+            ("Eurostar runs to Paris", "travel"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_add_targets_graph_from_metadata(self):
+        """Test that adds go to metadata.graph_id, or the user graph by default."""
+        mock_client = _mock_client({})
+        memory = ZepFederatedMemory(client=mock_client, user_id="user-1", graph_ids=["travel"])
+
+        await memory.add(MemoryContent(content="Likes trains", mime_type=MemoryMimeType.TEXT))
+        await memory.add(
+            MemoryContent(
+                content="Eurostar is fast",
+                mime_type=MemoryMimeType.TEXT,
+                metadata={"graph_id": "travel"},
+            )
+        )
+
+        assert [call.kwargs for call in mock_client.graph.add.await_args_list] == [
+            {"user_id": "user-1", "type": "text", "data": "Likes trains"},
+            {"graph_id": "travel", "type": "text", "data": "Eurostar is fast"},
+        ]
+
+        with pytest.raises(ValueError, match="not one of"):
+            await memory.add(
+                MemoryContent(
+                    content="x", mime_type=MemoryMimeType.TEXT, metadata={"graph_id": "other"}
+                )
+            )
+
+    @pytest.mark.asyncio
+    async def test_clear_leaves_source_graphs_intact(self):
+        """Test that clear resets local state without deleting any graph."""
+        mock_client = _mock_client({"travel": GraphSearchResults(edges=[])})
+        mock_client.graph.delete = AsyncMock()
+        memory = ZepFederatedMemory(client=mock_client, graph_ids=["travel"])
+        await memory.query("trains")
+        assert memory.last_source_timings
+
+        await memory.clear()
+
+        assert memory.last_source_timings == {}
+        mock_client.graph.delete.assert_not_awaited()
@@ -0,0 +1,422 @@
+"""
+Tests for ZepGraphMemory.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import UserMessage
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import ZepGraphMemory
+
+
+def _mock_client() -> MagicMock:
+    """Create an AsyncZep mock with the graph APIs used by ZepGraphMemory."""
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.add_batch = AsyncMock()
+    mock_client.graph.search = AsyncMock(return_value=MagicMock(edges=[], nodes=[], episodes=[]))
+    mock_client.graph.episode = MagicMock()
+    mock_client.graph.episode.get_by_graph_id = AsyncMock(return_value=MagicMock(episodes=[]))
+    return mock_client
+
+
+class TestBufferedWrites:
+    """Test opt-in buffered writes."""
+
+    @pytest.mark.asyncio
+    async def test_adds_are_batched_and_flushed_before_query(self):
+        """Test that buffered adds are written with add_batch before a query."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", buffer_size=10)
+
+        await memory.add(MemoryContent(content="Paris is in France", mime_type=MemoryMimeType.TEXT))
+        await memory.add(MemoryContent(content='{"city": "Paris"}', mime_type=MemoryMimeType.JSON))
+        mock_client.graph.add_batch.assert_not_awaited()
+
+        await memory.query("Paris")
+
+        mock_client.graph.add.assert_not_awaited()
+        call = mock_client.graph.add_batch.await_args
+        assert call.kwargs["graph_id"] == "test-graph"
+        assert [(episode.type, episode.data) for episode in call.kwargs["episodes"]] == [
+            ("text", "Paris is in France"),
+            ("json", '{"city": "Paris"}'),
+        ]
+        mock_client.graph.search.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unbuffered_add_writes_immediately(self):
+        """Test that adds are written one by one when buffering is off."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        await memory.add(MemoryContent(content="Paris is in France", mime_type=MemoryMimeType.TEXT))
+
+        mock_client.graph.add.assert_awaited_once_with(
+            graph_id="test-graph", type="text", data="Paris is in France"
+        )
+
+
+def _episode(uuid: str, content: str) -> MagicMock:
+    episode = MagicMock(content=content)
+    episode.uuid_ = uuid
+    return episode
+
+
+async def _model_context() -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content="Tell me about Paris", source="user"))
+    return model_context
+
+
+class TestGraphContextCache:
+    """Test the change-detection cache in update_context."""
+
+    @pytest.mark.asyncio
+    async def test_searches_skipped_while_terms_unchanged(self):
+        """Test that turns adding no new salient terms reuse the cached context."""
+        mock_client = _mock_client()
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        first = await memory.update_context(await _model_context())
+        second = await memory.update_context(await _model_context())
+
+        assert mock_client.graph.search.await_count == 2  # edges + nodes, once
+        assert first.memories.results[0].content == second.memories.results[0].content
+        # The query is built locally, so episodes are never fetched on the hot path
+        mock_client.graph.episode.get_by_graph_id.assert_not_awaited()
+
+        # New salient terms change the key and trigger fresh searches
+        await memory.add(MemoryContent(content="Lyon is in France", mime_type=MemoryMimeType.TEXT))
+        await memory.update_context(await _model_context())
+        assert mock_client.graph.search.await_count == 4
+        assert mock_client.graph.search.await_args.kwargs["query"] == "Lyon France Paris"
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_warms_cache_after_add(self):
+        """Test that add() refreshes the cached context in the background."""
+        mock_client = _mock_client()
+        mock_client.graph.episode.get_by_graph_id.return_value = MagicMock(
+            episodes=[_episode("ep-1", "Paris is in France")]
+        )
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", background_refresh=True)
+
+        await memory.add(MemoryContent(content="Paris is in France", mime_type=MemoryMimeType.TEXT))
+        await asyncio.sleep(0)
+        await memory._refresh_task
+        assert mock_client.graph.search.await_count == 2
+
+        result = await memory.update_context(await _model_context())
+
+        # The turn was served from the warm cache
+        assert mock_client.graph.search.await_count == 2
+        assert "Paris is the capital of France" in result.memories.results[0].content
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_context_retrieved_right_after_write_expires(self):
+        """Test that a context retrieved before extraction completes is refreshed later."""
+        mock_client = _mock_client()
+        mock_client.graph.search.return_value = MagicMock(edges=[], nodes=[])
+
+        memory = ZepGraphMemory(
+            client=mock_client,
+            graph_id="test-graph",
+            background_refresh=True,
+            extraction_delay=0.02,
+        )
+
+        await memory.add(MemoryContent(content="Paris is in France", mime_type=MemoryMimeType.TEXT))
+        await asyncio.sleep(0)
+        await memory._refresh_task
+        assert mock_client.graph.search.await_count == 2
+
+        # Zep extracts the fact; the delayed refresh picks it up
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+        await asyncio.sleep(0.05)
+        await memory._refresh_task
+        assert mock_client.graph.search.await_count == 4
+
+        result = await memory.update_context(await _model_context())
+        assert mock_client.graph.search.await_count == 4
+        assert "Paris is the capital of France" in result.memories.results[0].content
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_cached_context_expires_after_ttl(self):
+        """Test that the cached context is searched again once it is older than the TTL."""
+        mock_client = _mock_client()
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", context_cache_ttl=0.02)
+
+        await memory.update_context(await _model_context())
+        await asyncio.sleep(0.05)
+        await memory.update_context(await _model_context())
+
+        assert mock_client.graph.search.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_external_writes_picked_up_after_ttl(self):
+        """Test that facts written by another client appear once the cached context expires."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", context_cache_ttl=0.05)
+
+        first = await memory.update_context(await _model_context())
+        assert first.memories.results == []
+
+        # Another client adds data; the query terms of this memory do not change
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+        cached = await memory.update_context(await _model_context())
+        assert cached.memories.results == []
+
+        await asyncio.sleep(0.1)
+        result = await memory.update_context(await _model_context())
+        assert "Paris is the capital of France" in result.memories.results[0].content
+
+
+class TestMultiScopeQuery:
+    """Test concurrent multi-scope queries."""
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_searched_concurrently_and_merged(self):
+        """Test that scopes run in parallel and results are deduped and ordered by score."""
+        from zep_cloud import EntityEdge, EntityNode, GraphSearchResults
+
+        edge = EntityEdge(
+            uuid_="e1",
+            fact="Paris is in France",
+            name="LOCATED_IN",
+            source_node_uuid="n1",
+            target_node_uuid="n2",
+            created_at="2025-01-01",
+            score=0.6,
+        )
+        node = EntityNode(
+            uuid_="n1",
+            name="Paris",
+            summary="Capital of France",
+            created_at="2025-01-01",
+            score=0.9,
+        )
+        in_flight = 0
+        max_in_flight = 0
+
+        async def search(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if kwargs["scope"] == "edges":
+                # The same edge returned twice is only kept once
+                return GraphSearchResults(edges=[edge, edge])
+            return GraphSearchResults(nodes=[node])
+
+        mock_client = _mock_client()
+        mock_client.graph.search = AsyncMock(side_effect=search)
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        result = await memory.query("Paris", scopes={"edges": 10, "nodes": 3})
+
+        assert max_in_flight == 2
+        limits = {
+            call.kwargs["scope"]: call.kwargs["limit"]
+            for call in mock_client.graph.search.await_args_list
+        }
+        assert limits == {"edges": 10, "nodes": 3}
+        assert [
+            (item.content, item.metadata["scope"], item.metadata["score"])
+            for item in result.results
+        ] == [
+            ("Paris:\n Capital of France", "nodes", 0.9),
+            ("Paris is in France", "edges", 0.6),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unknown_scope_is_rejected(self):
+        """Test that an unsupported scope raises instead of being silently ignored."""
+        memory = ZepGraphMemory(client=_mock_client(), graph_id="test-graph")
+
+        with pytest.raises(ValueError, match="Unsupported search scopes: facts"):
+            await memory.query("Paris", scopes=["edges", "facts"])
+
+
+class TestLazyQueryResults:
+    """Test lazily materialized query results."""
+
+    def _graph_results(self):
+        from zep_cloud import EntityEdge, EntityNode, GraphSearchResults
+
+        edges = [
+            EntityEdge(
+                uuid_=f"e{i}",
+                fact=f"Fact {i}",
+                name="RELATES_TO",
+                source_node_uuid="n1",
+                target_node_uuid="n2",
+                created_at="2025-01-01",
+                attributes={"index": i},
+            )
+            for i in range(3)
+        ]
+        nodes = [EntityNode(uuid_="n1", name="Paris", summary="A city", created_at="2025-01-01")]
+        return GraphSearchResults(edges=edges, nodes=nodes)
+
+    @pytest.mark.asyncio
+    async def test_results_are_built_on_access(self):
+        """Test that MemoryContent is only constructed for the results that are read."""
+        from unittest.mock import patch
+
+        from zep_autogen import LazyMemoryQueryResult
+        from zep_autogen import results as results_module
+
+        mock_client = _mock_client()
+        mock_client.graph.search.return_value = self._graph_results()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        eager = await memory.query("Paris", limit=3)
+        built = []
+        convert_edge = results_module._CONVERTERS["edges"]
+
+        def counting_convert(item, source):
+            built.append(item.uuid_)
+            return convert_edge(item, source)
+
+        with patch.dict(results_module._CONVERTERS, {"edges": counting_convert}):
+            lazy = await memory.query("Paris", limit=3, lazy=True)
+            assert isinstance(lazy, LazyMemoryQueryResult)
+            assert len(lazy.results) == 4
+            assert built == []
+
+            assert lazy.results[1] == eager.results[1]
+            assert lazy.results[1] is lazy.results[1]
+            assert built == ["e1"]
+
+        assert lazy.results == eager.results
+        assert lazy.model_dump() == eager.model_dump()
+        assert lazy.materialize() == eager
+
+
+class TestContextBudget:
+    """Test the token budget of the graph context."""
+
+    @pytest.mark.asyncio
+    async def test_budget_trims_facts_then_entities(self):
+        """Test that facts are kept before entities until the budget is used."""
+        mock_client = _mock_client()
+        mock_client.graph.episode.get_by_graph_id.return_value = MagicMock(
+            episodes=[_episode("ep-1", "Tell me about Paris")]
+        )
+        facts = [
+            MagicMock(fact=f"Paris fact {i}", valid_at=None, invalid_at=None) for i in range(4)
+        ]
+        entity = MagicMock(summary="Capital of France", labels=[], attributes={})
+        entity.name = "Paris"
+
+        async def search(**kwargs):
+            if kwargs["scope"] == "edges":
+                return MagicMock(edges=facts, nodes=[])
+            return MagicMock(edges=[], nodes=[entity])
+
+        mock_client.graph.search.side_effect = search
+        memory = ZepGraphMemory(
+            client=mock_client,
+            graph_id="test-graph",
+            max_context_tokens=6,
+            token_estimator=lambda text: len(text.split()),
+        )
+
+        result = await memory.update_context(await _model_context())
+
+        content = result.memories.results[0].content
+        assert "Paris fact 0" in content and "Paris fact 1" in content
+        assert "Paris fact 2" not in content
+        assert "Capital of France" not in content
+
+
+class TestPrefetch:
+    """Test warming the graph context before the first update_context."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_warms_first_turn(self):
+        """Test that prefetch runs the searches so the first turn reuses them."""
+        mock_client = _mock_client()
+        mock_client.graph.episode.get_by_graph_id.return_value = MagicMock(
+            episodes=[_episode("ep-1", "Paris is in France")]
+        )
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        await memory.prefetch()
+        assert mock_client.graph.search.await_count == 2
+
+        result = await memory.update_context(await _model_context())
+
+        assert mock_client.graph.search.await_count == 2
+        assert "Paris is the capital of France" in result.memories.results[0].content
+
+    @pytest.mark.asyncio
+    async def test_prefetch_serves_first_turn_with_new_message(self):
+        """Test that the first turn reuses the prefetch even if its query terms differ."""
+        mock_client = _mock_client()
+        mock_client.graph.episode.get_by_graph_id.return_value = MagicMock(
+            episodes=[_episode("ep-1", "Paris is in France")]
+        )
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph")
+
+        await memory.prefetch()
+        model_context = BufferedChatCompletionContext(buffer_size=20)
+        await model_context.add_message(
+            UserMessage(content="Recommend restaurants in Lyon", source="user")
+        )
+        result = await memory.update_context(model_context)
+
+        assert mock_client.graph.search.await_count == 2
+        assert "Paris is the capital of France" in result.memories.results[0].content
+
+        # Only the first turn ignores the query terms
+        await memory.update_context(model_context)
+        assert mock_client.graph.search.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_warm_start_runs_in_background(self):
+        """Test that warm_start prefetches and update_context waits for it."""
+        mock_client = _mock_client()
+        mock_client.graph.episode.get_by_graph_id.return_value = MagicMock(
+            episodes=[_episode("ep-1", "Paris is in France")]
+        )
+        mock_client.graph.search.return_value = MagicMock(
+            edges=[MagicMock(fact="Paris is the capital of France")], nodes=[]
+        )
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", warm_start=True)
+
+        await memory.update_context(await _model_context())
+
+        assert mock_client.graph.search.await_count == 2
+        await memory.close()
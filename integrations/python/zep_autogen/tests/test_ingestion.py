@@ -0,0 +1,242 @@
+"""
+Tests for IngestionQueue and background ingestion in ZepGraphMemory.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import ZepGraphMemory
+from zep_autogen.ingestion import IngestionQueue
+
+
+class RecordingWriter:
+    """Batch writer that records batches and can be slowed down or made to fail."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0) -> None:
+        self.batches: list[list[int]] = []
+        self.delay = delay
+        self.failures = failures
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, batch: list[int]) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("write failed")
+            self.batches.append(batch)
+        finally:
+            self.in_flight -= 1
+
+
+def _written(writer: RecordingWriter) -> list[int]:
+    return sorted(item for batch in writer.batches for item in batch)
+
+
+class TestIngestionQueue:
+    """Test suite for IngestionQueue."""
+
+    @pytest.mark.asyncio
+    async def test_put_returns_before_write(self):
+        """Test that put() does not wait for the write."""
+        writer = RecordingWriter(delay=0.05)
+        queue = IngestionQueue(writer)
+
+        await queue.put(1)
+
+        assert writer.batches == []
+        assert queue.depth == 1
+        await queue.flush()
+        assert writer.batches == [[1]]
+        assert queue.depth == 0
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_batches_with_bounded_concurrency(self):
+        """Test that waiting items are written in batches by at most max_concurrency workers."""
+        writer = RecordingWriter(delay=0.02)
+        queue = IngestionQueue(writer, max_batch_size=5, max_concurrency=2)
+
+        for item in range(30):
+            await queue.put(item)
+        await queue.close()
+
+        assert _written(writer) == list(range(30))
+        assert all(len(batch) <= 5 for batch in writer.batches)
+        assert writer.max_in_flight == 2
+        assert queue.stats["written"] == 30
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        """Test that put() waits while max_size items are waiting."""
+        writer = RecordingWriter(delay=0.05)
+        queue = IngestionQueue(writer, max_size=2, max_batch_size=1, max_concurrency=1)
+
+        await queue.put(1)
+        await asyncio.sleep(0)  # the worker takes item 1
+        await queue.put(2)
+        await queue.put(3)
+
+        put = asyncio.create_task(queue.put(4))
+        await asyncio.sleep(0.01)
+        assert not put.done()
+        assert queue.lag > 0
+
+        await put
+        await queue.close()
+        assert _written(writer) == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self):
+        """Test that a failed batch is retried with backoff before giving up."""
+        writer = RecordingWriter(failures=2)
+        queue = IngestionQueue(writer, max_retries=2, retry_delay=0.001)
+
+        await queue.put(1)
+        await queue.flush()
+
+        assert writer.batches == [[1]]
+        assert queue.stats["retries"] == 2
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_raises_once_and_keeps_failed_items(self):
+        """Test that flush() raises once for a batch that kept failing, and keeps its items."""
+        writer = RecordingWriter(failures=2)
+        queue = IngestionQueue(writer, max_retries=1, retry_delay=0.001)
+
+        await queue.put(1)
+        with pytest.raises(RuntimeError, match="write failed"):
+            await queue.flush()
+        assert queue.depth == 0
+        assert queue.failed == [1]
+
+        # Later flushes are not failed by it, and it is not written again
+        await queue.put(2)
+        await queue.flush()
+        assert writer.batches == [[2]]
+
+        for item in queue.clear_failed():
+            await queue.put(item)
+        await queue.flush()
+        assert queue.failed == []
+        assert writer.batches == [[2], [1]]
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_items_are_capped(self):
+        """Test that only the newest max_size failed items are kept."""
+        writer = RecordingWriter(failures=3)
+        queue = IngestionQueue(writer, max_size=2, max_concurrency=1, max_retries=0)
+
+        for item in range(3):
+            await queue.put(item)
+            with pytest.raises(RuntimeError):
+                await queue.flush()
+
+        assert queue.failed == [1, 2]
+        assert queue.stats["failed"] == 3
+        await queue.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_queue_rejects_items(self):
+        """Test that put() raises once the queue is closed."""
+        queue = IngestionQueue(RecordingWriter())
+        await queue.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            await queue.put(1)
+
+
+def _mock_client() -> MagicMock:
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.add_batch = AsyncMock()
+    return mock_client
+
+
+def _content(text: str) -> MemoryContent:
+    return MemoryContent(content=text, mime_type=MemoryMimeType.TEXT)
+
+
+class TestGraphMemoryIngestion:
+    """Test background ingestion in ZepGraphMemory.add."""
+
+    @pytest.mark.asyncio
+    async def test_add_enqueues_and_flush_delivers(self):
+        """Test that add() returns before the write and flush() delivers in batches."""
+        mock_client = _mock_client()
+        written = asyncio.Event()
+
+        async def add_batch(**_):
+            await written.wait()
+
+        mock_client.graph.add_batch.side_effect = add_batch
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", ingestion_queue_size=100)
+
+        for i in range(25):
+            await memory.add(_content(f"Fact {i}"))
+
+        mock_client.graph.add.assert_not_awaited()
+        assert memory.ingestion_stats["depth"] == 25
+
+        written.set()
+        await memory.flush()
+
+        episodes = [
+            episode.data
+            for call in mock_client.graph.add_batch.await_args_list
+            for episode in call.kwargs["episodes"]
+        ]
+        assert sorted(episodes) == sorted(f"Fact {i}" for i in range(25))
+        assert memory.ingestion_stats["depth"] == 0
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_close_delivers_queued_items(self):
+        """Test that close() writes everything still queued."""
+        mock_client = _mock_client()
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", ingestion_queue_size=10)
+
+        await memory.add(_content("Paris is in France"))
+        await memory.close()
+
+        mock_client.graph.add_batch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_can_be_added_again(self):
+        """Test that data that could not be written is exposed and can be cleared."""
+        mock_client = _mock_client()
+        mock_client.graph.add_batch.side_effect = [RuntimeError("unavailable"), None]
+        memory = ZepGraphMemory(client=mock_client, graph_id="test-graph", ingestion_queue_size=10)
+        memory._ingestion._max_retries = 0
+
+        await memory.add(_content("Paris is in France"))
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await memory.flush()
+
+        failed = memory.clear_failed_writes()
+        assert [episode.data for episode in failed] == ["Paris is in France"]
+        assert memory.failed_writes == []
+        await memory.flush()
+
+        mock_client.graph.add_batch.assert_awaited_once()
+        await memory.close()
+
+    def test_cannot_combine_with_buffer(self):
+        """Test that background ingestion and write buffering are exclusive."""
+        with pytest.raises(ValueError, match="cannot be combined"):
+            ZepGraphMemory(
+                client=_mock_client(),
+                graph_id="test-graph",
+                buffer_size=10,
+                ingestion_queue_size=10,
+            )
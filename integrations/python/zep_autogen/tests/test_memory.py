@@ -0,0 +1,554 @@
+"""
+Tests for ZepUserMemory.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import SystemMessage, UserMessage
+from zep_cloud import NotFoundError
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import Message
+
+from zep_autogen import ZepUserMemory
+from zep_autogen import memory as memory_module
+
+
+def _mock_client() -> MagicMock:
+    """Create an AsyncZep mock with the thread and graph APIs used by ZepUserMemory."""
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.thread = MagicMock()
+    mock_client.thread.get = AsyncMock()
+    mock_client.thread.create = AsyncMock()
+    mock_client.thread.add_messages = AsyncMock()
+    mock_client.thread.get_user_context = AsyncMock(
+        return_value=MagicMock(context="User likes hiking")
+    )
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.search = AsyncMock()
+    return mock_client
+
+
+def _message_content(text: str, role: str = "user") -> MemoryContent:
+    return MemoryContent(
+        content=text,
+        mime_type=MemoryMimeType.TEXT,
+        metadata={"type": "message", "role": role},
+    )
+
+
+async def _model_context() -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content="Where should I go?", source="user"))
+    return model_context
+
+
+class TestUpdateContext:
+    """Test the update_context retrieval pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_context_and_history_concurrently(self):
+        """Test that thread context and history are requested concurrently."""
+        mock_client = _mock_client()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_call(result):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return result
+
+        async def get_user_context(**_):
+            return await slow_call(MagicMock(context="User likes hiking"))
+
+        async def get_thread(**_):
+            return await slow_call(MagicMock(messages=[Message(role="user", content="Hi there")]))
+
+        mock_client.thread.get_user_context.side_effect = get_user_context
+        mock_client.thread.get.side_effect = get_thread
+
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+        model_context = await _model_context()
+
+        result = await memory.update_context(model_context)
+
+        assert max_in_flight == 2
+        assert len(result.memories.results) == 1
+        messages = await model_context.get_messages()
+        assert isinstance(messages[-1], SystemMessage)
+        assert "User likes hiking" in messages[-1].content
+        assert "user: Hi there" in messages[-1].content
+
+        timings = memory.last_update_timings
+        assert {"context_ms", "messages_ms", "total_ms"} <= timings.keys()
+        assert timings["messages_from_buffer"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_serves_history_from_buffer_after_sync(self):
+        """Test that the remote history fetch is skipped once the buffer is in sync."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content="First")]
+        )
+
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        await memory.update_context(await _model_context())
+        await memory.add(_message_content("Second", role="assistant"))
+
+        model_context = await _model_context()
+        await memory.update_context(model_context)
+
+        # Only the first update_context fetched the history
+        history_fetches = [
+            call for call in mock_client.thread.get.await_args_list if "lastn" in call.kwargs
+        ]
+        assert len(history_fetches) == 1
+        assert memory.last_update_timings["messages_from_buffer"] == 1.0
+
+        messages = await model_context.get_messages()
+        assert "user: First\nassistant: Second" in messages[-1].content
+
+    @pytest.mark.asyncio
+    async def test_new_thread_never_fetches_history(self):
+        """Test that a thread created by the memory is served from the buffer."""
+        mock_client = _mock_client()
+        memory = ZepUserMemory(client=mock_client, user_id="test-user")
+
+        await memory.add(_message_content("Hello"))
+        await memory.update_context(await _model_context())
+
+        mock_client.thread.create.assert_awaited_once()
+        mock_client.thread.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_deadline_skips_context(self):
+        """Test that retrieval exceeding context_timeout leaves the context untouched."""
+        mock_client = _mock_client()
+
+        async def never_returns(**_):
+            await asyncio.sleep(10)
+
+        mock_client.thread.get_user_context.side_effect = never_returns
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+
+        memory = ZepUserMemory(
+            client=mock_client,
+            user_id="test-user",
+            thread_id="test-thread",
+            context_timeout=0.05,
+        )
+        model_context = await _model_context()
+
+        result = await memory.update_context(model_context)
+
+        assert result.memories.results == []
+        assert len(await model_context.get_messages()) == 1
+        assert memory.last_update_timings["total_ms"] < 1000
+
+    @pytest.mark.asyncio
+    async def test_resyncs_history_after_write_by_other_instance(self):
+        """Test that a message another memory adds to the thread shows up in the context."""
+        mock_client = _mock_client()
+        thread_id = f"thread-{uuid.uuid4().hex}"
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content="First")]
+        )
+
+        first = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+        second = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+
+        await first.update_context(await _model_context())
+        await second.add(_message_content("From the other agent", role="assistant"))
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[
+                Message(role="user", content="First"),
+                Message(role="assistant", content="From the other agent"),
+            ]
+        )
+
+        model_context = await _model_context()
+        await first.update_context(model_context)
+
+        assert first.last_update_timings["messages_from_buffer"] == 0.0
+        messages = await model_context.get_messages()
+        assert "assistant: From the other agent" in messages[-1].content
+
+    @pytest.mark.asyncio
+    async def test_resyncs_history_after_ttl(self):
+        """Test that the buffer is not trusted past history_ttl."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+
+        memory = ZepUserMemory(
+            client=mock_client,
+            user_id="test-user",
+            thread_id=f"thread-{uuid.uuid4().hex}",
+            history_ttl=0.01,
+        )
+
+        await memory.update_context(await _model_context())
+        await asyncio.sleep(0.02)
+        await memory.update_context(await _model_context())
+
+        assert memory.last_update_timings["messages_from_buffer"] == 0.0
+        history_fetches = [
+            call for call in mock_client.thread.get.await_args_list if "lastn" in call.kwargs
+        ]
+        assert len(history_fetches) == 2
+
+
+class TestThreadExistence:
+    """Test memoization of thread existence checks in add()."""
+
+    @pytest.mark.asyncio
+    async def test_thread_checked_once_across_instances(self):
+        """Test that memories sharing a thread only check for it once."""
+        mock_client = _mock_client()
+        thread_id = f"thread-{uuid.uuid4().hex}"
+
+        first = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+        second = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+
+        await first.add(_message_content("Hello"))
+        await first.add(_message_content("Again"))
+        await second.add(_message_content("Hi", role="assistant"))
+
+        mock_client.thread.get.assert_awaited_once_with(thread_id)
+        assert mock_client.thread.add_messages.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_tracked_threads_are_bounded(self, monkeypatch):
+        """Test that only the most recently used threads are remembered."""
+        monkeypatch.setattr(memory_module, "_threads", memory_module._ThreadRegistry(2))
+        mock_client = _mock_client()
+        thread_ids = [f"thread-{uuid.uuid4().hex}" for _ in range(3)]
+
+        for thread_id in thread_ids:
+            memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+            await memory.add(_message_content("Hello"))
+        assert len(memory_module._threads._known) == 2
+        assert len(memory_module._threads._writes) == 2
+
+        # The least recently used thread was forgotten and is checked again
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_ids[0])
+        await memory.add(_message_content("Hello again"))
+        assert mock_client.thread.get.await_count == 4
+
+    def test_forgotten_thread_versions_do_not_repeat(self):
+        """Test that a thread seen again after being dropped gets a new generation."""
+        threads = memory_module._ThreadRegistry(1)
+        version = threads.record_write("thread-a")
+        threads.record_write("thread-b")
+        threads.record_write("thread-a")
+
+        assert threads.version("thread-a") != version
+        assert threads.writes_since("thread-a", version) is None
+
+    @pytest.mark.asyncio
+    async def test_missing_thread_is_created(self):
+        """Test that a thread which does not exist yet is created on first write."""
+        mock_client = _mock_client()
+        mock_client.thread.get.side_effect = NotFoundError(body="not found")
+        thread_id = f"thread-{uuid.uuid4().hex}"
+
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+        await memory.add(_message_content("Hello"))
+
+        mock_client.thread.create.assert_awaited_once_with(thread_id=thread_id, user_id="test-user")
+        mock_client.thread.add_messages.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_not_found_on_write_invalidates_and_retries(self):
+        """Test that a NotFoundError from the write recreates the thread and retries."""
+        mock_client = _mock_client()
+        thread_id = f"thread-{uuid.uuid4().hex}"
+
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id=thread_id)
+        await memory.add(_message_content("Hello"))
+
+        # The thread is deleted behind our back
+        mock_client.thread.get.side_effect = NotFoundError(body="not found")
+        mock_client.thread.add_messages.side_effect = [NotFoundError(body="not found"), None]
+
+        await memory.add(_message_content("Still there?"))
+
+        mock_client.thread.create.assert_awaited_once_with(thread_id=thread_id, user_id="test-user")
+        assert mock_client.thread.add_messages.await_count == 3
+
+
+class TestBufferedWrites:
+    """Test opt-in buffered writes."""
+
+    @pytest.mark.asyncio
+    async def test_messages_are_batched_and_flushed_before_reads(self):
+        """Test that buffered messages are written in one batch before update_context."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+        thread_id = f"thread-{uuid.uuid4().hex}"
+
+        memory = ZepUserMemory(
+            client=mock_client,
+            user_id="test-user",
+            thread_id=thread_id,
+            buffer_size=10,
+            flush_interval=60,
+        )
+
+        await memory.add(_message_content("Hello"))
+        await memory.add(_message_content("Hi!", role="assistant"))
+        mock_client.thread.add_messages.assert_not_awaited()
+
+        await memory.update_context(await _model_context())
+
+        mock_client.thread.add_messages.assert_awaited_once()
+        messages = mock_client.thread.add_messages.await_args.kwargs["messages"]
+        assert [message.content for message in messages] == ["Hello", "Hi!"]
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_buffered_data(self):
+        """Test that close() writes buffered graph data with add_batch."""
+        mock_client = _mock_client()
+        mock_client.graph.add_batch = AsyncMock()
+
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", buffer_size=5)
+
+        for text in ("Likes tea", "Lives in Paris"):
+            await memory.add(MemoryContent(content=text, mime_type=MemoryMimeType.TEXT))
+        mock_client.graph.add_batch.assert_not_awaited()
+
+        await memory.close()
+
+        mock_client.graph.add.assert_not_awaited()
+        call = mock_client.graph.add_batch.await_args
+        assert call.kwargs["user_id"] == "test-user"
+        assert [episode.data for episode in call.kwargs["episodes"]] == [
+            "Likes tea",
+            "Lives in Paris",
+        ]
+
+
+class TestMultiScopeQuery:
+    """Test concurrent multi-scope queries."""
+
+    @pytest.mark.asyncio
+    async def test_scopes_list_uses_limit_for_each_scope(self):
+        """Test that a list of scopes searches the user graph with the shared limit."""
+        mock_client = _mock_client()
+        mock_client.graph.search.return_value = MagicMock(edges=[], nodes=[], episodes=[])
+        memory = ZepUserMemory(client=mock_client, user_id="test-user")
+
+        await memory.query("hiking", scopes=["edges", "episodes"], limit=7)
+
+        calls = [call.kwargs for call in mock_client.graph.search.await_args_list]
+        assert [(call["user_id"], call["scope"], call["limit"]) for call in calls] == [
+            ("test-user", "edges", 7),
+            ("test-user", "episodes", 7),
+        ]
+
+
+class TestContextBudget:
+    """Test the token budget and duplicate message skipping in update_context."""
+
+    @pytest.mark.asyncio
+    async def test_skips_messages_already_in_model_context(self):
+        """Test that recent messages the agent already has are not injected again."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[
+                Message(role="assistant", content="Try the Alps"),
+                Message(role="user", content="Where should I go?"),
+            ]
+        )
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+        model_context = await _model_context()
+
+        await memory.update_context(model_context)
+
+        content = (await model_context.get_messages())[-1].content
+        assert "assistant: Try the Alps" in content
+        assert "Where should I go?" not in content
+
+    @pytest.mark.asyncio
+    async def test_budget_keeps_context_and_newest_messages(self):
+        """Test that the budget keeps the thread context, then the newest messages."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content=f"message {i}") for i in range(5)]
+        )
+        memory = ZepUserMemory(
+            client=mock_client,
+            user_id="test-user",
+            thread_id="test-thread",
+            max_context_tokens=9,
+            # Count words as tokens
+            token_estimator=lambda text: len(text.split()),
+        )
+        model_context = await _model_context()
+
+        result = await memory.update_context(model_context)
+
+        content = (await model_context.get_messages())[-1].content
+        assert "User likes hiking" in content
+        assert "user: message 4" in content and "user: message 3" in content
+        assert "message 2" not in content
+        assert result.memories.results[0].content == "User likes hiking"
+
+    @pytest.mark.asyncio
+    async def test_oversized_context_is_truncated(self):
+        """Test that a thread context larger than the budget is cut to fit."""
+        mock_client = _mock_client()
+        mock_client.thread.get_user_context.return_value = MagicMock(context="x" * 400)
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content="Hi")]
+        )
+        memory = ZepUserMemory(
+            client=mock_client,
+            user_id="test-user",
+            thread_id="test-thread",
+            max_context_tokens=25,
+        )
+
+        result = await memory.update_context(await _model_context())
+
+        assert result.memories.results[0].content == "x" * 100
+
+
+class TestPrefetch:
+    """Test warming the memory before the first update_context."""
+
+    @pytest.mark.asyncio
+    async def test_first_turn_served_from_prefetch(self):
+        """Test that a prefetched retrieval serves the first update_context."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content="I love the mountains")]
+        )
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        await memory.prefetch()
+        mock_client.thread.get_user_context.assert_awaited_once()
+        model_context = await _model_context()
+
+        await memory.update_context(model_context)
+
+        # No further remote calls were made for the first turn
+        mock_client.thread.get_user_context.assert_awaited_once()
+        assert memory.last_update_timings["prefetched"] == 1.0
+        content = (await model_context.get_messages())[-1].content
+        assert "User likes hiking" in content
+        assert "user: I love the mountains" in content
+
+        # The warm result is used once; later turns retrieve normally
+        await memory.update_context(await _model_context())
+        assert mock_client.thread.get_user_context.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_write_after_prefetch_is_merged(self):
+        """Test that messages added after prefetch are merged into the warm history."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(
+            messages=[Message(role="user", content="I love the mountains")]
+        )
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        await memory.prefetch()
+        await memory.add(_message_content("Plan a trip to Norway"))
+        model_context = await _model_context()
+        await memory.update_context(model_context)
+
+        mock_client.thread.get_user_context.assert_awaited_once()
+        assert memory.last_update_timings["prefetched"] == 1.0
+        content = (await model_context.get_messages())[-1].content
+        assert "User likes hiking" in content
+        assert "user: I love the mountains" in content
+        assert "user: Plan a trip to Norway" in content
+
+    @pytest.mark.asyncio
+    async def test_write_by_other_memory_after_prefetch_refetches(self):
+        """Test that another memory writing to the thread makes the warm result stale."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+        other = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        await memory.prefetch()
+        await other.add(_message_content("Plan a trip to Norway"))
+        await memory.update_context(await _model_context())
+
+        assert mock_client.thread.get_user_context.await_count == 2
+        assert "prefetched" not in memory.last_update_timings
+
+    @pytest.mark.asyncio
+    async def test_cancelled_prefetch_falls_back_to_remote(self):
+        """Test that a prefetch cancelled by close() leaves the turn to retrieve remotely."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+        started = asyncio.Event()
+
+        async def context(**_):
+            if not started.is_set():
+                # The prefetch hangs until close() cancels it
+                started.set()
+                await asyncio.sleep(10)
+            return MagicMock(context="User likes hiking")
+
+        mock_client.thread.get_user_context.side_effect = context
+        memory = ZepUserMemory(
+            client=mock_client, user_id="test-user", thread_id="test-thread", warm_start=True
+        )
+        await started.wait()
+
+        turn = asyncio.create_task(memory.update_context(await _model_context()))
+        await asyncio.sleep(0)
+        await memory.close()
+        result = await turn
+
+        assert result.memories.results[0].content == "User likes hiking"
+        assert "prefetched" not in memory.last_update_timings
+
+    @pytest.mark.asyncio
+    async def test_warm_start_runs_in_background(self):
+        """Test that warm_start prefetches and update_context waits for it."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+
+        async def slow_context(**_):
+            await asyncio.sleep(0.05)
+            return MagicMock(context="User likes hiking")
+
+        mock_client.thread.get_user_context.side_effect = slow_context
+        memory = ZepUserMemory(
+            client=mock_client, user_id="test-user", thread_id="test-thread", warm_start=True
+        )
+
+        result = await memory.update_context(await _model_context())
+
+        mock_client.thread.get_user_context.assert_awaited_once()
+        assert result.memories.results[0].content == "User likes hiking"
+        assert memory.last_update_timings["prefetched"] == 1.0
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_prefetch_errors_are_logged(self):
+        """Test that a failed prefetch leaves the first turn to retrieve normally."""
+        mock_client = _mock_client()
+        mock_client.thread.get.return_value = MagicMock(messages=[])
+        mock_client.thread.get_user_context.side_effect = [
+            RuntimeError("unavailable"),
+            MagicMock(context="User likes hiking"),
+        ]
+        memory = ZepUserMemory(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        await memory.prefetch()
+        result = await memory.update_context(await _model_context())
+
+        assert result.memories.results[0].content == "User likes hiking"
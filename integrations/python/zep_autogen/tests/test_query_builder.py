@@ -0,0 +1,68 @@
+"""
+Tests for QueryBuilder.
+"""
+
+from zep_autogen.query_builder import QueryBuilder
+
+
+class TestQueryBuilder:
+    """Test suite for QueryBuilder."""
+
+    def test_drops_boilerplate_and_ranks_salient_terms(self):
+        """Test that stopwords are dropped and repeated, recent, capitalized terms rank first."""
+        builder = QueryBuilder()
+        builder.add("I'm planning a trip to Lisbon with Anna.")
+        builder.add("Could you please tell me what the weather's like in Lisbon in June?")
+
+        terms = builder.terms()
+
+        assert terms[0] == "Lisbon"
+        assert {"Anna", "June", "weather", "trip"} <= set(terms)
+        assert not {"please", "tell", "the", "I'm", "weather's"} & set(terms)
+
+    def test_window_keeps_recent_distinct_turns(self):
+        """Test that old turns leave the window and repeated turns are not re-added."""
+        builder = QueryBuilder(max_turns=2)
+
+        assert builder.add("Berlin museums")
+        assert not builder.add("Berlin museums")
+        builder.add("Munich beer gardens")
+        builder.add("Hamburg harbour tours")
+
+        assert "Berlin" not in builder.terms()
+        assert len(builder) == 2
+
+    def test_terms_are_cached_until_window_changes(self):
+        """Test that the terms are only extracted again after a new turn."""
+        builder = QueryBuilder()
+        builder.add("Paris is in France")
+
+        first = builder.terms()
+        assert builder.terms() is first
+        assert builder.cache_key() == frozenset({"paris", "france"})
+
+        builder.add("Tell me about Paris")
+        assert builder.cache_key() == frozenset({"paris", "france"})
+
+        builder.add("Lyon too")
+        assert "lyon" in builder.cache_key()
+
+    def test_query_respects_max_chars(self):
+        """Test that the query is cut at a term boundary."""
+        builder = QueryBuilder(max_chars=20)
+        builder.add("Alpha Bravo Charlie Delta Echo Foxtrot")
+
+        query = builder.query()
+
+        assert len(query) <= 20
+        assert query == "Alpha Bravo Charlie"
+
+    def test_falls_back_to_latest_turn_without_salient_terms(self):
+        """Test that a window of boilerplate is searched with its latest turn."""
+        builder = QueryBuilder()
+        assert builder.query() == ""
+
+        builder.add("What should I do?")
+
+        assert builder.query() == "What should I do?"
+        assert builder.cache_key() == frozenset({"What should I do?"})
@@ -0,0 +1,259 @@
+"""
+Tests for the latency telemetry of the Zep AutoGen memories and tools.
+"""
+
+import json
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core import EVENT_LOGGER_NAME
+from autogen_core.memory import MemoryContent, MemoryMimeType
+from autogen_core.model_context import BufferedChatCompletionContext
+from autogen_core.models import UserMessage
+from zep_cloud import EntityEdge, GraphSearchResults
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import Message
+
+from zep_autogen import (
+    LatencyAggregator,
+    ZepCallEvent,
+    ZepGraphMemory,
+    ZepUserMemory,
+    log_to_autogen_events,
+)
+from zep_autogen.tools import add_graph_data, search_memory
+
+
+def _edge(i: int) -> EntityEdge:
+    return EntityEdge(
+        uuid_=f"edge-{i}",
+        fact=f"Fact {i}",
+        name="RELATES_TO",
+        source_node_uuid="source",
+        target_node_uuid="target",
+        created_at="2025-01-01",
+    )
+
+
+def _mock_client() -> MagicMock:
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.thread = MagicMock()
+    mock_client.thread.get = AsyncMock(
+        return_value=MagicMock(messages=[Message(role="user", content="Hi there")])
+    )
+    mock_client.thread.create = AsyncMock()
+    mock_client.thread.add_messages = AsyncMock()
+    mock_client.thread.get_user_context = AsyncMock(
+        return_value=MagicMock(context="User likes hiking")
+    )
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.add_batch = AsyncMock()
+    mock_client.graph.search = AsyncMock(
+        return_value=GraphSearchResults(edges=[_edge(0), _edge(1)])
+    )
+    mock_client.graph.episode = MagicMock()
+    mock_client.graph.episode.get_by_graph_id = AsyncMock(
+        return_value=MagicMock(episodes=[MagicMock(uuid_="ep-1", content="Paris")])
+    )
+    return mock_client
+
+
+async def _model_context() -> BufferedChatCompletionContext:
+    model_context = BufferedChatCompletionContext(buffer_size=20)
+    await model_context.add_message(UserMessage(content="Where should I go?", source="user"))
+    return model_context
+
+
+class TestMemoryTelemetry:
+    """Test the events emitted by the memory classes."""
+
+    @pytest.mark.asyncio
+    async def test_user_memory_reports_each_call(self):
+        """Test that retrieval reports both calls, then the buffered history as a cache hit."""
+        events: list[ZepCallEvent] = []
+        memory = ZepUserMemory(
+            client=_mock_client(),
+            user_id="test-user",
+            thread_id="test-thread",
+            telemetry_sink=events.append,
+        )
+
+        await memory.update_context(await _model_context())
+
+        by_operation = {event.operation: event for event in events}
+        context = by_operation["thread.get_user_context"]
+        assert context.component == "ZepUserMemory"
+        assert context.result_count == 1
+        assert context.bytes == len("User likes hiking")
+        history = by_operation["thread.get"]
+        assert history.cache == "miss"
+        assert history.result_count == 1
+        assert history.bytes == len("Hi there")
+
+        events.clear()
+        await memory.update_context(await _model_context())
+        history = next(event for event in events if event.operation == "thread.get")
+        assert history.cache == "hit"
+        assert history.duration_ms == 0.0
+
+    @pytest.mark.asyncio
+    async def test_writes_report_sent_items(self):
+        """Test that writes report the count and size of what was sent."""
+        events: list[ZepCallEvent] = []
+        memory = ZepUserMemory(
+            client=_mock_client(),
+            user_id="test-user",
+            thread_id="test-thread",
+            telemetry_sink=events.append,
+        )
+
+        await memory.add(
+            MemoryContent(
+                content="Héllo",
+                mime_type=MemoryMimeType.TEXT,
+                metadata={"type": "message", "role": "user"},
+            )
+        )
+
+        write = next(event for event in events if event.operation == "thread.add_messages")
+        assert write.result_count == 1
+        assert write.bytes == len("Héllo".encode())
+
+    @pytest.mark.asyncio
+    async def test_failed_call_reports_error(self):
+        """Test that a failing call is reported with its exception type."""
+        events: list[ZepCallEvent] = []
+        mock_client = _mock_client()
+        mock_client.graph.search.side_effect = RuntimeError("unavailable")
+        memory = ZepGraphMemory(
+            client=mock_client, graph_id="test-graph", telemetry_sink=events.append
+        )
+
+        await memory.query("Paris", scopes=["edges", "nodes"])
+
+        assert [(event.scope, event.error) for event in events] == [
+            ("edges", "RuntimeError"),
+            ("nodes", "RuntimeError"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_graph_context_cache_hits(self):
+        """Test that a reused graph context reports cache hits for the skipped searches."""
+        events: list[ZepCallEvent] = []
+        memory = ZepGraphMemory(
+            client=_mock_client(), graph_id="test-graph", telemetry_sink=events.append
+        )
+
+        await memory.update_context(await _model_context())
+        await memory.update_context(await _model_context())
+
+        searches = [
+            (event.scope, event.cache) for event in events if event.operation == "graph.search"
+        ]
+        assert searches == [
+            ("edges", "miss"),
+            ("nodes", "miss"),
+            ("edges", "hit"),
+            ("nodes", "hit"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sink_errors_do_not_fail_calls(self):
+        """Test that a failing sink does not break the memory."""
+
+        def broken_sink(event: ZepCallEvent) -> None:
+            raise RuntimeError("sink down")
+
+        memory = ZepGraphMemory(
+            client=_mock_client(), graph_id="test-graph", telemetry_sink=broken_sink
+        )
+
+        result = await memory.query("Paris")
+
+        assert len(result.results) == 2
+
+
+class TestToolTelemetry:
+    """Test the events emitted by the tool functions."""
+
+    @pytest.mark.asyncio
+    async def test_search_memory_reports_per_scope(self):
+        """Test that each searched scope is reported."""
+        events: list[ZepCallEvent] = []
+
+        await search_memory(
+            _mock_client(),
+            "Paris",
+            graph_id="test-graph",
+            scope="edges,nodes",
+            telemetry_sink=events.append,
+        )
+
+        assert [(event.component, event.scope) for event in events] == [
+            ("search_memory", "edges"),
+            ("search_memory", "nodes"),
+        ]
+        assert all(event.result_count == 2 for event in events)
+
+    @pytest.mark.asyncio
+    async def test_add_graph_data_reports_bytes(self):
+        """Test that add_graph_data reports the size of the data."""
+        events: list[ZepCallEvent] = []
+
+        await add_graph_data(
+            _mock_client(), "Paris is in France", user_id="test-user", telemetry_sink=events.append
+        )
+
+        assert len(events) == 1
+        assert events[0].operation == "graph.add"
+        assert events[0].bytes == len("Paris is in France")
+
+
+class TestSinks:
+    """Test the ready-made telemetry sinks."""
+
+    def test_aggregator_percentiles(self):
+        """Test that the aggregator reports nearest-rank percentiles per operation."""
+        aggregator = LatencyAggregator()
+        for duration in range(1, 101):
+            aggregator(ZepCallEvent("graph.search", "ZepGraphMemory", float(duration)))
+        aggregator(ZepCallEvent("graph.search", "ZepGraphMemory", 0.0, cache="hit"))
+        aggregator(ZepCallEvent("graph.add", "ZepGraphMemory", 7.0, error="RuntimeError"))
+
+        summary = aggregator.summary()
+
+        assert summary["graph.search"] == {
+            "calls": 100,
+            "errors": 0,
+            "cache_hits": 1,
+            "p50_ms": 50.0,
+            "p95_ms": 95.0,
+            "p99_ms": 99.0,
+        }
+        assert summary["graph.add"]["errors"] == 1
+        assert summary["graph.add"]["p99_ms"] == 7.0
+
+        aggregator.reset()
+        assert aggregator.summary() == {}
+
+    def test_aggregator_keeps_recent_samples(self):
+        """Test that only the most recent max_samples durations are used."""
+        aggregator = LatencyAggregator(max_samples=2)
+        for duration in (100.0, 1.0, 2.0):
+            aggregator(ZepCallEvent("graph.search", "search_memory", duration))
+
+        assert aggregator.summary()["graph.search"]["p99_ms"] == 2.0
+
+    def test_autogen_event_logger(self, caplog):
+        """Test that events are logged as JSON to AutoGen's event logger."""
+        with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+            log_to_autogen_events(
+                ZepCallEvent("thread.get", "ZepUserMemory", 12.5, result_count=3, bytes=42)
+            )
+
+        record = json.loads(caplog.records[0].getMessage())
+        assert record["type"] == "ZepCall"
+        assert record["operation"] == "thread.get"
+        assert record["duration_ms"] == 12.5
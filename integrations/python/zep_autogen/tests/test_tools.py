@@ -0,0 +1,144 @@
+"""
+Tests for the Zep AutoGen search tools.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from autogen_core import CancellationToken
+from zep_cloud import EntityEdge, EntityNode, GraphSearchResults
+from zep_cloud.client import AsyncZep
+
+from zep_autogen import create_search_graph_tool
+from zep_autogen.tools import search_memory, search_memory_page
+
+
+def _edge(i: int) -> EntityEdge:
+    return EntityEdge(
+        uuid_=f"edge-{i}",
+        fact=f"Fact {i}",
+        name="RELATES_TO",
+        source_node_uuid="source",
+        target_node_uuid="target",
+        created_at="2025-01-01",
+    )
+
+
+def _mock_client(edge_count: int = 25, node_count: int = 2) -> MagicMock:
+    """Create an AsyncZep mock whose searches return the top `limit` ranked items."""
+    edges = [_edge(i) for i in range(edge_count)]
+    nodes = [
+        EntityNode(uuid_=f"node-{i}", name=f"Entity {i}", summary="", created_at="2025-01-01")
+        for i in range(node_count)
+    ]
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.graph = MagicMock()
+
+    async def search(**kwargs):
+        await asyncio.sleep(0.01)
+        if kwargs["scope"] == "nodes":
+            return GraphSearchResults(nodes=nodes[: kwargs["limit"]])
+        return GraphSearchResults(edges=edges[: kwargs["limit"]])
+
+    mock_client.graph.search = AsyncMock(side_effect=search)
+    return mock_client
+
+
+class TestSearchMemory:
+    """Test scope handling in search_memory."""
+
+    @pytest.mark.asyncio
+    async def test_user_search_honours_scope(self):
+        """Test that the scope is passed on the user_id path too."""
+        mock_client = _mock_client()
+
+        results = await search_memory(mock_client, "entities", user_id="test-user", scope="nodes")
+
+        assert mock_client.graph.search.await_args.kwargs["scope"] == "nodes"
+        assert [result["type"] for result in results] == ["node", "node"]
+
+    @pytest.mark.asyncio
+    async def test_multiple_scopes_are_searched_concurrently(self):
+        """Test that comma-separated scopes run in parallel and are combined."""
+        mock_client = _mock_client()
+
+        results = await search_memory(
+            mock_client, "anything", graph_id="test-graph", limit=3, scope="edges, nodes"
+        )
+
+        assert [result["type"] for result in results] == ["edge"] * 3 + ["node"] * 2
+        assert {call.kwargs["scope"] for call in mock_client.graph.search.await_args_list} == {
+            "edges",
+            "nodes",
+        }
+
+
+class TestSearchMemoryPage:
+    """Test cursor pagination."""
+
+    @pytest.mark.asyncio
+    async def test_pages_only_return_new_results(self):
+        """Test that follow-up pages skip earlier results and the last page ends the cursor."""
+        mock_client = _mock_client(edge_count=25)
+        pages = []
+        cursor = None
+        while True:
+            page = await search_memory_page(
+                mock_client, "facts", graph_id="test-graph", page_size=10, cursor=cursor
+            )
+            pages.append([result["content"] for result in page["results"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == [
+            [f"Fact {i}" for i in range(10)],
+            [f"Fact {i}" for i in range(10, 20)],
+            [f"Fact {i}" for i in range(20, 25)],
+        ]
+        assert [call.kwargs["limit"] for call in mock_client.graph.search.await_args_list] == [
+            10,
+            20,
+            30,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_bound_to_its_query(self):
+        """Test that a cursor reused for a different search returns no results."""
+        mock_client = _mock_client()
+        page = await search_memory_page(mock_client, "facts", graph_id="test-graph", page_size=5)
+        searches = mock_client.graph.search.await_count
+
+        other = await search_memory_page(
+            mock_client, "other", graph_id="test-graph", cursor=page["next_cursor"]
+        )
+
+        assert other == {"results": [], "next_cursor": None}
+        assert mock_client.graph.search.await_count == searches
+
+    @pytest.mark.asyncio
+    async def test_unknown_scope_returns_no_results(self):
+        """Test that an unknown scope fails like it does in search_memory."""
+        mock_client = _mock_client()
+
+        page = await search_memory_page(mock_client, "facts", graph_id="test-graph", scope="bogus")
+
+        assert page == {"results": [], "next_cursor": None}
+        assert await search_memory(mock_client, "facts", graph_id="test-graph", scope="bogus") == []
+
+    @pytest.mark.asyncio
+    async def test_paginated_tool(self):
+        """Test that the paginated search tool returns results and a cursor."""
+        mock_client = _mock_client(edge_count=4)
+        tool = create_search_graph_tool(mock_client, user_id="test-user", paginate=True)
+
+        first = await tool.run_json({"query": "facts", "page_size": 3}, CancellationToken())
+        second = await tool.run_json(
+            {"query": "facts", "page_size": 3, "cursor": first["next_cursor"]},
+            CancellationToken(),
+        )
+
+        assert len(first["results"]) == 3
+        assert [result["content"] for result in second["results"]] == ["Fact 3"]
+        assert second["next_cursor"] is None
@@ -44,6 +44,7 @@ try:
     import crewai.tools  # noqa: F401
 
     # Import our integration components
+    from .adaptive import AdaptiveRetrievalPolicy
     from .graph_storage import ZepGraphStorage
     from .memory import ZepStorage
     from .tools import (
@@ -62,6 +63,7 @@ try:
         "ZepAddDataTool",
         "create_search_tool",
         "create_add_data_tool",
+        "AdaptiveRetrievalPolicy",
         "ZepDependencyError",
     ]
 
@@ -0,0 +1,291 @@
+"""
+Adaptive retrieval limits for Zep CrewAI storages.
+
+This module provides a policy that tunes the per-scope search limits of a storage
+from observed search latency and context size, so retrieval stays within a
+latency or token SLO.
+"""
+
+import logging
+import math
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+@dataclass
+class ScopeStats:
+    """Smoothed observations and the current limit for one search scope."""
+
+    limit: int
+    base_limit: int
+    latency_ms: float | None = None
+    tokens: float | None = None
+    contribution: float | None = None
+    skipped_turns: int = 0
+    probing: bool = False
+
+
+class AdaptiveRetrievalPolicy:
+    """
+    Adjusts the facts, entity and episode limits of a storage between searches.
+
+    After every search the policy records, per scope, the search latency, the
+    number of results returned and how many of them survived packing into the
+    token budget. When the observed latency or context size approaches the
+    configured SLO, limits are lowered and scopes that rarely contribute are
+    skipped. When there is headroom, limits are raised again up to the limits
+    configured on the storage.
+
+    A scope contributes the share of its results that survive packing. Without a
+    token SLO every result survives, so a scope contributes its share of the
+    composed context instead.
+
+    Args:
+        latency_slo_ms: Target latency for the parallel scope searches
+        token_slo: Target size of the composed context, in tokens
+        pressure: Fraction of an SLO above which limits are lowered
+        headroom: Fraction of an SLO below which limits are raised
+        min_limit: Smallest limit used for a scope that is not skipped
+        min_contribution: Scopes whose smoothed contribution falls below this are skipped
+        probe_interval: Number of searches after which a skipped scope is retried
+        smoothing: Weight of the newest observation in the moving averages
+        token_estimator: Optional callable returning the token count of a string
+    """
+
+    def __init__(
+        self,
+        latency_slo_ms: float | None = None,
+        token_slo: int | None = None,
+        pressure: float = 0.9,
+        headroom: float = 0.6,
+        min_limit: int = 1,
+        min_contribution: float = 0.1,
+        probe_interval: int = 10,
+        smoothing: float = 0.3,
+        token_estimator: Callable[[str], int] | None = None,
+    ) -> None:
+        if latency_slo_ms is None and token_slo is None:
+            raise ValueError("At least one of latency_slo_ms or token_slo is required")
+
+        if not 0 < headroom < pressure:
+            raise ValueError("headroom must be positive and lower than pressure")
+
+        self._latency_slo_ms = latency_slo_ms
+        self._token_slo = token_slo
+        self._pressure = pressure
+        self._headroom = headroom
+        self._min_limit = max(1, min_limit)
+        self._min_contribution = min_contribution
+        self._probe_interval = probe_interval
+        self._smoothing = smoothing
+        self._estimate_tokens = token_estimator or estimate_tokens
+
+        self._scopes: dict[str, ScopeStats] = {}
+        self._latency_ms: float | None = None
+        self._tokens: float | None = None
+        self._lock = threading.Lock()
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def token_slo(self) -> int | None:
+        """Get the token budget for the composed context."""
+        return self._token_slo
+
+    def limits(self, base_limits: dict[str, int]) -> dict[str, int]:
+        """
+        Get the limits to use for the next search.
+
+        Args:
+            base_limits: The limits configured on the storage, keyed by scope
+
+        Returns:
+            Current limit per scope; 0 means the scope should be skipped
+        """
+        with self._lock:
+            limits = {}
+            for scope, base_limit in base_limits.items():
+                stats = self._scopes.get(scope)
+                if stats is None or stats.base_limit != base_limit:
+                    stats = ScopeStats(limit=base_limit, base_limit=base_limit)
+                    self._scopes[scope] = stats
+
+                stats.probing = False
+                if stats.limit == 0:
+                    stats.skipped_turns += 1
+                    if stats.skipped_turns >= self._probe_interval:
+                        # Periodically probe skipped scopes so they can earn their way back;
+                        # the count restarts now so a failed probe waits another interval
+                        stats.skipped_turns = 0
+                        stats.probing = True
+                        limits[scope] = min(self._min_limit, base_limit)
+                        continue
+                limits[scope] = stats.limit
+            return limits
+
+    def pack(
+        self, edges: list[Any], nodes: list[Any], episodes: list[Any]
+    ) -> tuple[list[Any], list[Any], list[Any]]:
+        """
+        Keep the highest priority results that fit in the token budget.
+
+        Facts are kept first, then entities, then episodes, each in search rank order.
+        Without a token SLO all results are kept.
+        """
+        if self._token_slo is None:
+            return edges, nodes, episodes
+
+        remaining = self._token_slo
+        packed: list[list[Any]] = []
+        for items, to_text in (
+            (edges, lambda edge: edge.fact),
+            (nodes, lambda node: f"{node.name}: {node.summary}"),
+            (episodes, lambda episode: episode.content),
+        ):
+            kept = []
+            for item in items:
+                tokens = self._estimate_tokens(to_text(item) or "")
+                if tokens > remaining:
+                    break
+                kept.append(item)
+                remaining -= tokens
+            packed.append(kept)
+        return packed[0], packed[1], packed[2]
+
+    def count_tokens(self, scope: str, items: list[Any]) -> int:
+        """Estimate the context size of a scope's results."""
+        if scope == "edges":
+            return sum(self._estimate_tokens(edge.fact or "") for edge in items)
+        if scope == "nodes":
+            return sum(self._estimate_tokens(f"{node.name}: {node.summary}") for node in items)
+        return sum(self._estimate_tokens(episode.content or "") for episode in items)
+
+    def record(
+        self,
+        scope: str,
+        latency_ms: float,
+        returned: int,
+        kept: int,
+        tokens: int,
+    ) -> None:
+        """
+        Record the outcome of one scope search.
+
+        Args:
+            scope: The searched scope
+            latency_ms: Duration of the search
+            returned: Number of results returned by Zep
+            kept: Number of results that survived budget packing
+            tokens: Estimated size of the kept results
+        """
+        with self._lock:
+            stats = self._scopes.get(scope)
+            if stats is None:
+                return
+
+            stats.latency_ms = self._smooth(stats.latency_ms, latency_ms)
+            stats.tokens = self._smooth(stats.tokens, tokens)
+            stats.contribution = self._smooth(
+                stats.contribution, kept / returned if returned else 0.0
+            )
+
+    def observe(self, latency_ms: float, tokens: int) -> None:
+        """
+        Record the overall latency and context size of a search and adjust limits.
+
+        Args:
+            latency_ms: Wall-clock duration of the parallel scope searches
+            tokens: Estimated size of the composed context
+        """
+        with self._lock:
+            self._latency_ms = self._smooth(self._latency_ms, latency_ms)
+            self._tokens = self._smooth(self._tokens, tokens)
+
+            for stats in self._scopes.values():
+                if stats.probing:
+                    # A probed scope that contributes again is searched again
+                    stats.probing = False
+                    contribution = self._contribution(stats)
+                    if contribution is not None and contribution >= self._min_contribution:
+                        stats.limit = min(self._min_limit, stats.base_limit)
+
+            load = self._load()
+            if load >= self._pressure:
+                self._decrease()
+            elif load <= self._headroom:
+                self._increase()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the current limits and smoothed observations, for monitoring."""
+        with self._lock:
+            return {
+                "latency_ms": self._latency_ms,
+                "tokens": self._tokens,
+                "scopes": {
+                    scope: {
+                        "limit": stats.limit,
+                        "base_limit": stats.base_limit,
+                        "latency_ms": stats.latency_ms,
+                        "tokens": stats.tokens,
+                        "contribution": self._contribution(stats),
+                    }
+                    for scope, stats in self._scopes.items()
+                },
+            }
+
+    def _smooth(self, current: float | None, value: float) -> float:
+        if current is None:
+            return float(value)
+        return current + self._smoothing * (value - current)
+
+    def _contribution(self, stats: ScopeStats) -> float | None:
+        """Smoothed contribution of a scope, None before it has results to measure."""
+        if self._token_slo is not None:
+            return stats.contribution
+        if stats.tokens is None:
+            return None
+        total = sum(other.tokens or 0.0 for other in self._scopes.values())
+        return stats.tokens / total if total else None
+
+    def _load(self) -> float:
+        """Highest observed fraction of any configured SLO."""
+        loads = []
+        if self._latency_slo_ms and self._latency_ms is not None:
+            loads.append(self._latency_ms / self._latency_slo_ms)
+        if self._token_slo and self._tokens is not None:
+            loads.append(self._tokens / self._token_slo)
+        return max(loads, default=0.0)
+
+    def _decrease(self) -> None:
+        active = [stats for stats in self._scopes.values() if stats.limit > 0]
+
+        # Drop a scope that rarely contributes before shrinking the useful ones
+        idle = [
+            (contribution, stats)
+            for stats in active
+            if (contribution := self._contribution(stats)) is not None
+            and contribution < self._min_contribution
+        ]
+        if idle and len(active) > 1:
+            contribution, stats = min(idle, key=lambda pair: pair[0])
+            stats.limit = 0
+            stats.skipped_turns = 0
+            self._logger.debug(f"Skipping scope with contribution {contribution:.2f}")
+            return
+
+        for stats in active:
+            stats.limit = max(self._min_limit, math.floor(stats.limit * 0.75))
+
+    def _increase(self) -> None:
+        for stats in self._scopes.values():
+            if stats.limit == 0:
+                stats.limit = min(self._min_limit, stats.base_limit)
+                continue
+            stats.limit = min(stats.base_limit, stats.limit + max(1, math.ceil(stats.limit * 0.25)))
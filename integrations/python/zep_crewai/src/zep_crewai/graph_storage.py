@@ -12,6 +12,7 @@ from crewai.memory.storage.interface import Storage
 from zep_cloud.client import Zep
 from zep_cloud.types import SearchFilters
 
+from .adaptive import AdaptiveRetrievalPolicy
 from .utils import search_graph_and_compose_context
 
 
@@ -30,6 +31,7 @@ class ZepGraphStorage(Storage):
         search_filters: SearchFilters | None = None,
         facts_limit: int = 20,
         entity_limit: int = 5,
+        adaptive_policy: AdaptiveRetrievalPolicy | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -41,6 +43,8 @@ class ZepGraphStorage(Storage):
             search_filters: Optional filters for search operations
             facts_limit: Maximum number of facts (edges) to retrieve for context
             entity_limit: Maximum number of entities (nodes) to retrieve for context
+            adaptive_policy: Optional policy that lowers or raises the retrieval limits
+                to stay within a latency or token SLO
             **kwargs: Additional configuration options
         """
         if not isinstance(client, Zep):
@@ -54,6 +58,7 @@ class ZepGraphStorage(Storage):
         self._search_filters = search_filters
         self._facts_limit = facts_limit
         self._entity_limit = entity_limit
+        self._adaptive_policy = adaptive_policy
         self._config = kwargs
 
         self._logger = logging.getLogger(__name__)
@@ -122,6 +127,7 @@ class ZepGraphStorage(Storage):
                 entity_limit=self._entity_limit,
                 episodes_limit=limit,
                 search_filters=self._search_filters,
+                adaptive_policy=self._adaptive_policy,
             )
 
             if context:
@@ -145,3 +151,8 @@ class ZepGraphStorage(Storage):
     def graph_id(self) -> str:
         """Get the graph ID."""
         return self._graph_id
+
+    @property
+    def adaptive_policy(self) -> AdaptiveRetrievalPolicy | None:
+        """Get the adaptive retrieval policy, if any."""
+        return self._adaptive_policy
@@ -12,7 +12,8 @@ from crewai.memory.storage.interface import Storage
 from zep_cloud.client import Zep
 from zep_cloud.types import Message, SearchFilters
 
-from .utils import search_graph_and_compose_context
+from .adaptive import AdaptiveRetrievalPolicy
+from .utils import MAX_EPISODE_CHARS, add_json_to_graph, search_graph_and_compose_context
 
 
 class ZepUserStorage(Storage):
@@ -32,6 +33,9 @@ class ZepUserStorage(Storage):
         facts_limit: int = 20,
         entity_limit: int = 5,
         mode: Literal["summary", "basic"] = "summary",
+        json_max_chars: int = MAX_EPISODE_CHARS,
+        json_upload_workers: int = 4,
+        adaptive_policy: AdaptiveRetrievalPolicy | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -45,6 +49,10 @@ class ZepUserStorage(Storage):
             facts_limit: Maximum number of facts (edges) to retrieve for context
             entity_limit: Maximum number of entities (nodes) to retrieve for context
             mode: Mode for thread context retrieval ("summary" or "basic")
+            json_max_chars: Maximum size of a single JSON episode; larger objects are split
+            json_upload_workers: Maximum number of concurrent uploads for split JSON data
+            adaptive_policy: Optional policy that lowers or raises the retrieval limits
+                to stay within a latency or token SLO
             **kwargs: Additional configuration options
         """
         if not isinstance(client, Zep):
@@ -63,6 +71,9 @@ class ZepUserStorage(Storage):
         self._facts_limit = facts_limit
         self._entity_limit = entity_limit
         self._mode = mode
+        self._json_max_chars = json_max_chars
+        self._json_upload_workers = json_upload_workers
+        self._adaptive_policy = adaptive_policy
         self._config = kwargs
 
         self._logger = logging.getLogger(__name__)
@@ -73,7 +84,9 @@ class ZepUserStorage(Storage):
 
         Routes storage based on metadata.type:
         - "message": Store as thread message (requires thread_id)
-        - "json": Store as JSON data in user graph
+        - "json": Store as JSON data in user graph. Dicts, lists and JSON strings are
+          normalized (null and empty fields removed) and objects larger than a single
+          episode are split into grouped sub-documents uploaded concurrently
         - "text": Store as text data in user graph (default)
 
         Args:
@@ -106,6 +119,19 @@ class ZepUserStorage(Storage):
                     f"Saved message to thread {self._thread_id} from {name or role}: {content_str[:100]}..."
                 )
 
+            elif content_type == "json":
+                episode_count = add_json_to_graph(
+                    self._client,
+                    value,
+                    user_id=self._user_id,
+                    max_chars=self._json_max_chars,
+                    max_workers=self._json_upload_workers,
+                )
+
+                self._logger.debug(
+                    f"Saved json data to user graph {self._user_id} as {episode_count} episode(s)"
+                )
+
             else:
                 # Store in user graph
                 self._client.graph.add(
@@ -149,6 +175,7 @@ class ZepUserStorage(Storage):
                 entity_limit=self._entity_limit,
                 episodes_limit=limit,
                 search_filters=self._search_filters,
+                adaptive_policy=self._adaptive_policy,
             )
 
             if context:
@@ -206,3 +233,8 @@ class ZepUserStorage(Storage):
     def thread_id(self) -> str:
         """Get the thread ID."""
         return self._thread_id
+
+    @property
+    def adaptive_policy(self) -> AdaptiveRetrievalPolicy | None:
+        """Get the adaptive retrieval policy, if any."""
+        return self._adaptive_policy
@@ -2,13 +2,31 @@
 Utility functions for Zep CrewAI integration.
 """
 
+import json
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from zep_cloud.client import Zep
 from zep_cloud.graph.utils import compose_context_string
 from zep_cloud.types import SearchFilters
 
+from .adaptive import AdaptiveRetrievalPolicy
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    _HAS_ORJSON = False
+
+# Zep rejects episodes larger than this many characters
+MAX_EPISODE_CHARS = 10_000
+
+# Top-level scalar fields repeated in every sub-document so split episodes stay attributable
+_IDENTITY_KEYS = ("id", "uuid", "name", "title", "type")
+
 
 def search_graph_and_compose_context(
     client: Zep,
@@ -19,6 +37,7 @@ def search_graph_and_compose_context(
     entity_limit: int = 5,
     episodes_limit: int = 10,
     search_filters: SearchFilters | None = None,
+    adaptive_policy: AdaptiveRetrievalPolicy | None = None,
 ) -> str | None:
     """
     Perform parallel graph searches and compose context string.
@@ -35,6 +54,8 @@ def search_graph_and_compose_context(
         entity_limit: Maximum number of entities (nodes) to retrieve
         episodes_limit: Maximum number of episodes to retrieve
         search_filters: Optional search filters
+        adaptive_policy: Optional policy that adjusts the limits from observed latency
+            and context size, and packs the results into its token budget
 
     Returns:
         Composed context string or None if no results
@@ -47,93 +68,279 @@ def search_graph_and_compose_context(
     # Truncate query if too long
     truncated_query = query[:400] if len(query) > 400 else query
 
-    edges = []
-    nodes = []
-    episodes = []
-
-    # Execute searches in parallel
-    try:
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Search for facts (edges)
-            if graph_id:
-                future_edges = executor.submit(
-                    client.graph.search,
-                    graph_id=graph_id,
-                    query=truncated_query,
-                    limit=facts_limit,
-                    scope="edges",
-                    search_filters=search_filters,
-                )
-            else:
-                future_edges = executor.submit(
-                    client.graph.search,
-                    user_id=user_id,
-                    query=truncated_query,
-                    limit=facts_limit,
-                    scope="edges",
-                    search_filters=search_filters,
-                )
-
-            # Search for entities (nodes)
-            if graph_id:
-                future_nodes = executor.submit(
-                    client.graph.search,
-                    graph_id=graph_id,
-                    query=truncated_query,
-                    limit=entity_limit,
-                    scope="nodes",
-                    search_filters=search_filters,
-                )
-            else:
-                future_nodes = executor.submit(
-                    client.graph.search,
-                    user_id=user_id,
-                    query=truncated_query,
-                    limit=entity_limit,
-                    scope="nodes",
-                    search_filters=search_filters,
-                )
+    target = {"graph_id": graph_id} if graph_id else {"user_id": user_id}
+    limits = {"edges": facts_limit, "nodes": entity_limit, "episodes": episodes_limit}
+    if adaptive_policy is not None:
+        limits = adaptive_policy.limits(limits)
 
-            # Search for episodes
-            if graph_id:
-                future_episodes = executor.submit(
-                    client.graph.search,
-                    graph_id=graph_id,
-                    query=truncated_query,
-                    limit=episodes_limit,
-                    scope="episodes",
-                    search_filters=search_filters,
-                )
-            else:
-                future_episodes = executor.submit(
-                    client.graph.search,
-                    user_id=user_id,
-                    query=truncated_query,
-                    limit=episodes_limit,
-                    scope="episodes",
-                    search_filters=search_filters,
-                )
+    latencies: dict[str, float] = {}
 
-            edge_results = future_edges.result()
-            node_results = future_nodes.result()
-            episode_results = future_episodes.result()
+    def timed_search(scope: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return client.graph.search(
+                **target,
+                query=truncated_query,
+                limit=limits[scope],
+                scope=scope,
+                search_filters=search_filters,
+            )
+        finally:
+            latencies[scope] = (time.perf_counter() - start) * 1000
 
-            if edge_results and edge_results.edges:
-                edges = edge_results.edges
+    found: dict[str, list[Any]] = {"edges": [], "nodes": [], "episodes": []}
 
-            if node_results and node_results.nodes:
-                nodes = node_results.nodes
+    # Execute searches in parallel, skipping scopes the adaptive policy has turned off
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                scope: executor.submit(timed_search, scope) for scope in found if limits[scope] > 0
+            }
 
-            if episode_results and episode_results.episodes:
-                episodes = episode_results.episodes
+            for scope, future in futures.items():
+                scope_results = future.result()
+                if scope_results and getattr(scope_results, scope):
+                    found[scope] = getattr(scope_results, scope)
+        elapsed_ms = (time.perf_counter() - started) * 1000
 
     except Exception as e:
         logger.error(f"Failed to search graph: {e}")
         return None
 
+    edges, nodes, episodes = found["edges"], found["nodes"], found["episodes"]
+
+    if adaptive_policy is not None:
+        edges, nodes, episodes = adaptive_policy.pack(edges, nodes, episodes)
+        kept = {"edges": edges, "nodes": nodes, "episodes": episodes}
+        total_tokens = 0
+        for scope in futures:
+            tokens = adaptive_policy.count_tokens(scope, kept[scope])
+            total_tokens += tokens
+            adaptive_policy.record(
+                scope,
+                latency_ms=latencies.get(scope, elapsed_ms),
+                returned=len(found[scope]),
+                kept=len(kept[scope]),
+                tokens=tokens,
+            )
+        adaptive_policy.observe(latency_ms=elapsed_ms, tokens=total_tokens)
+
     # Compose context string from all results
     if edges or nodes or episodes:
         context = compose_context_string(edges=edges, nodes=nodes, episodes=episodes)
         return context
 
     return None
+
+
+def dumps_json(value: Any) -> str:
+    """
+    Serialize a value to canonical JSON (sorted keys, compact separators).
+
+    Uses orjson when it is installed and falls back to the standard library otherwise.
+    Values that are not natively serializable are converted with str().
+    """
+    if _HAS_ORJSON:
+        return orjson.dumps(
+            value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        ).decode()
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def strip_empty(value: Any) -> Any:
+    """
+    Recursively remove None values and empty strings, lists and dicts.
+
+    Returns None if the value itself ends up empty.
+    """
+    if isinstance(value, dict):
+        stripped = {}
+        for key, item in value.items():
+            item = strip_empty(item)
+            if item is not None:
+                stripped[key] = item
+        return stripped or None
+    if isinstance(value, list | tuple):
+        items = [item for item in (strip_empty(item) for item in value) if item is not None]
+        return items or None
+    if value is None or value == "":
+        return None
+    return value
+
+
+def _split_json_value(value: Any, budget: int) -> list[Any]:
+    """
+    Split a JSON-compatible value into pieces that each serialize within budget.
+
+    Dict entries are packed greedily, scalar fields first and then one group per
+    nested key, so related data stays together. List items are packed into
+    consecutive runs. Entries that are too large on their own are split recursively
+    and re-wrapped under their key.
+    """
+    if len(dumps_json(value)) <= budget:
+        return [value]
+
+    if isinstance(value, dict):
+        # Keep scalar fields together, followed by nested structures one key at a time
+        entries = sorted(value.items(), key=lambda kv: isinstance(kv[1], dict | list))
+        groups: list[Any] = []
+        current: dict[str, Any] = {}
+        current_size = 2
+        for key, item in entries:
+            entry_size = len(dumps_json({key: item}))
+            if entry_size > budget:
+                # "null" is four characters long; the rest is the wrapper overhead
+                overhead = len(dumps_json({key: None})) - 4
+                groups.extend({key: piece} for piece in _split_json_value(item, budget - overhead))
+                continue
+            # Joining two compact objects drops one brace pair and adds a comma
+            added = entry_size - 1 if current else entry_size - 2
+            if current and current_size + added > budget:
+                groups.append(current)
+                current, current_size, added = {}, 2, entry_size - 2
+            current[key] = item
+            current_size += added
+        if current:
+            groups.append(current)
+        return groups
+
+    if isinstance(value, list):
+        groups = []
+        run: list[Any] = []
+        run_size = 2
+        for item in value:
+            item_size = len(dumps_json(item))
+            if item_size + 2 > budget:
+                if run:
+                    groups.append(run)
+                    run, run_size = [], 2
+                groups.extend([piece] for piece in _split_json_value(item, budget - 2))
+                continue
+            added = item_size + 1 if run else item_size
+            if run and run_size + added > budget:
+                groups.append(run)
+                run, run_size, added = [], 2, item_size
+            run.append(item)
+            run_size += added
+        if run:
+            groups.append(run)
+        return groups
+
+    if isinstance(value, str):
+        pieces = []
+        start = 0
+        while start < len(value):
+            step = max(budget - 2, 1)
+            # Escaped characters take more room than they occupy in the string
+            while step > 1 and len(dumps_json(value[start : start + step])) > budget:
+                step //= 2
+            pieces.append(value[start : start + step])
+            start += step
+        return pieces
+
+    return [value]
+
+
+def prepare_json_payloads(value: Any, max_chars: int = MAX_EPISODE_CHARS) -> list[tuple[str, str]]:
+    """
+    Normalize a JSON value and split it into documents that fit in a single episode.
+
+    Strings are parsed as JSON first; strings that are not valid JSON are stored as
+    plain text, in chunks of at most max_chars characters. The parsed value is
+    stripped of null and empty fields and serialized canonically. Objects larger
+    than max_chars are split into semantically grouped sub-documents, each
+    repeating the top-level identity fields (id, name, ...).
+
+    Args:
+        value: A JSON string or a JSON-compatible Python value
+        max_chars: Maximum serialized size of each document
+
+    Returns:
+        List of (document, episode type) pairs, the type being "json", or "text" for
+        chunks of invalid JSON. Empty if there is nothing left to store
+    """
+    if isinstance(value, str | bytes):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            text = value.decode() if isinstance(value, bytes) else value
+            return [
+                (text[start : start + max_chars], "text")
+                for start in range(0, len(text), max_chars)
+            ]
+
+    value = strip_empty(value)
+    if value is None:
+        return []
+
+    document = dumps_json(value)
+    if len(document) <= max_chars:
+        return [(document, "json")]
+
+    identity: dict[str, Any] = {}
+    if isinstance(value, dict):
+        identity = {
+            key: value[key]
+            for key in _IDENTITY_KEYS
+            if key in value and not isinstance(value[key], dict | list)
+        }
+        value = {key: item for key, item in value.items() if key not in identity}
+
+    if identity:
+        budget = max_chars - len(dumps_json(identity)) - 1
+        return [
+            (dumps_json({**identity, **piece}), "json")
+            for piece in _split_json_value(value, budget)
+        ]
+
+    return [(dumps_json(piece), "json") for piece in _split_json_value(value, max_chars)]
+
+
+def add_json_to_graph(
+    client: Zep,
+    value: Any,
+    graph_id: str | None = None,
+    user_id: str | None = None,
+    max_chars: int = MAX_EPISODE_CHARS,
+    max_workers: int = 4,
+) -> int:
+    """
+    Normalize JSON data and add it to a graph, splitting oversized objects.
+
+    Each document produced by prepare_json_payloads is added as its own episode,
+    of type "json", or "text" if the value was not valid JSON. When there are
+    several, they are uploaded concurrently so Zep can process them in parallel
+    instead of as one large episode.
+
+    Args:
+        client: Zep client instance
+        value: A JSON string or a JSON-compatible Python value
+        graph_id: Graph ID for generic graph storage
+        user_id: User ID for user graph storage
+        max_chars: Maximum serialized size of each episode
+        max_workers: Maximum number of concurrent uploads
+
+    Returns:
+        Number of episodes added
+    """
+    if not graph_id and not user_id:
+        raise ValueError("Either graph_id or user_id must be provided")
+
+    target = {"graph_id": graph_id} if graph_id else {"user_id": user_id}
+    payloads = prepare_json_payloads(value, max_chars=max_chars)
+
+    if len(payloads) == 1:
+        data, episode_type = payloads[0]
+        client.graph.add(data=data, type=episode_type, **target)
+    elif payloads:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(payloads))) as executor:
+            # Consume the iterator so the first upload error is raised here
+            list(
+                executor.map(
+                    lambda payload: client.graph.add(data=payload[0], type=payload[1], **target),
+                    payloads,
+                )
+            )
+
+    return len(payloads)
@@ -0,0 +1,146 @@
+"""
+Tests for AdaptiveRetrievalPolicy.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from zep_crewai import AdaptiveRetrievalPolicy, ZepGraphStorage
+
+BASE_LIMITS = {"edges": 20, "nodes": 8, "episodes": 10}
+
+
+def _observe_turn(policy, latency_ms, tokens, contributions=None, scope_tokens=None):
+    """Record one search turn with the given per-scope contribution and context size."""
+    contributions = contributions or {}
+    scope_tokens = scope_tokens or {}
+    limits = policy.limits(BASE_LIMITS)
+    for scope, limit in limits.items():
+        if limit:
+            returned = limit
+            kept = int(returned * contributions.get(scope, 1.0))
+            policy.record(
+                scope,
+                latency_ms=latency_ms,
+                returned=returned,
+                kept=kept,
+                tokens=scope_tokens.get(scope, 0),
+            )
+    policy.observe(latency_ms=latency_ms, tokens=tokens)
+    return policy.limits(BASE_LIMITS)
+
+
+class TestAdaptiveRetrievalPolicy:
+    """Test suite for AdaptiveRetrievalPolicy."""
+
+    def test_requires_an_slo(self):
+        """Test that at least one SLO must be configured."""
+        with pytest.raises(ValueError, match="At least one of"):
+            AdaptiveRetrievalPolicy()
+
+    def test_starts_at_base_limits(self):
+        """Test that limits start at the storage's configured limits."""
+        policy = AdaptiveRetrievalPolicy(latency_slo_ms=200)
+        assert policy.limits(BASE_LIMITS) == BASE_LIMITS
+
+    def test_lowers_limits_under_latency_pressure_and_recovers(self):
+        """Test that limits shrink near the latency SLO and grow back with headroom."""
+        policy = AdaptiveRetrievalPolicy(latency_slo_ms=200)
+
+        limits = _observe_turn(policy, latency_ms=250, tokens=0)
+        assert limits["edges"] < BASE_LIMITS["edges"]
+        assert limits["nodes"] < BASE_LIMITS["nodes"]
+
+        for _ in range(30):
+            limits = _observe_turn(policy, latency_ms=20, tokens=0)
+        assert limits == BASE_LIMITS
+
+    def test_skips_scope_that_does_not_survive_packing(self):
+        """Test that a scope whose results are always cut is skipped under token pressure."""
+        policy = AdaptiveRetrievalPolicy(token_slo=1000, probe_interval=3)
+
+        limits = _observe_turn(policy, latency_ms=10, tokens=1200, contributions={"episodes": 0})
+        assert limits["episodes"] == 0
+        assert limits["edges"] == BASE_LIMITS["edges"]
+
+        # The skipped scope is probed again after probe_interval searches, counting the
+        # limits() read above
+        policy.observe(latency_ms=10, tokens=700)
+        probes = [policy.limits(BASE_LIMITS)["episodes"] for _ in range(2)]
+        assert probes == [0, 1]
+
+    def test_latency_slo_skips_scope_with_small_share(self):
+        """Test that with only a latency SLO, a scope adding little context is skipped."""
+        policy = AdaptiveRetrievalPolicy(latency_slo_ms=200)
+
+        limits = _observe_turn(
+            policy,
+            latency_ms=250,
+            tokens=1000,
+            scope_tokens={"edges": 800, "nodes": 190, "episodes": 10},
+        )
+
+        assert limits["episodes"] == 0
+        assert limits["edges"] == BASE_LIMITS["edges"]
+        assert policy.snapshot()["scopes"]["edges"]["contribution"] == 0.8
+
+    def test_failed_probe_waits_another_interval(self):
+        """Test that a probe whose search fails is not repeated on every later turn."""
+        policy = AdaptiveRetrievalPolicy(token_slo=1000, probe_interval=3)
+        _observe_turn(policy, latency_ms=10, tokens=1200, contributions={"episodes": 0})
+
+        # No record() or observe() follows a failed search; the helper's limits() read
+        # was the first skipped turn
+        probes = [policy.limits(BASE_LIMITS)["episodes"] for _ in range(5)]
+
+        assert probes == [0, 1, 0, 0, 1]
+
+    def test_pack_keeps_facts_before_episodes(self):
+        """Test that budget packing prefers facts, then entities, then episodes."""
+        policy = AdaptiveRetrievalPolicy(token_slo=12)
+
+        edges = [MagicMock(fact="a" * 16), MagicMock(fact="b" * 16)]
+        nodes = [MagicMock(summary="s" * 8)]
+        nodes[0].name = "n"
+        episodes = [MagicMock(content="c" * 40)]
+
+        kept_edges, kept_nodes, kept_episodes = policy.pack(edges, nodes, episodes)
+
+        assert kept_edges == edges
+        assert kept_nodes == nodes
+        assert kept_episodes == []
+
+
+class TestAdaptiveSearch:
+    """Test adaptive limits applied through a storage search."""
+
+    def test_search_uses_adapted_limits_and_skips_scopes(self):
+        """Test that searches use the policy's limits and skipped scopes are not queried."""
+        from zep_cloud.client import Zep
+
+        mock_client = MagicMock(spec=Zep)
+        mock_client.graph = MagicMock()
+        results = MagicMock()
+        results.edges = [MagicMock(fact="Python is used for AI")]
+        results.nodes = []
+        results.episodes = []
+        mock_client.graph.search.return_value = results
+
+        policy = AdaptiveRetrievalPolicy(latency_slo_ms=200)
+        policy.limits({"edges": 20, "nodes": 5, "episodes": 10})
+        policy._scopes["nodes"].limit = 0
+        policy._scopes["edges"].limit = 7
+
+        storage = ZepGraphStorage(client=mock_client, graph_id="test-graph", adaptive_policy=policy)
+        storage.search("Python", limit=10)
+
+        searched = {
+            call[1]["scope"]: call[1]["limit"] for call in mock_client.graph.search.call_args_list
+        }
+        assert searched == {"edges": 7, "episodes": 10}
+
+        snapshot = policy.snapshot()
+        assert snapshot["scopes"]["edges"]["contribution"] == 1.0
+        assert snapshot["scopes"]["episodes"]["contribution"] == 0.0
+        assert snapshot["latency_ms"] is not None
@@ -143,6 +143,7 @@ class TestZepGraphStorage:
             entity_limit=5,
             episodes_limit=5,
             search_filters=None,
+            adaptive_policy=None,
         )
 
     @patch("zep_crewai.graph_storage.search_graph_and_compose_context")
@@ -192,6 +193,7 @@ class TestZepGraphStorage:
             entity_limit=10,
             episodes_limit=15,  # Uses the limit parameter for episodes
             search_filters=None,
+            adaptive_policy=None,
         )
 
     @patch("zep_crewai.graph_storage.search_graph_and_compose_context")
@@ -222,6 +224,7 @@ class TestZepGraphStorage:
             entity_limit=5,
             episodes_limit=5,
             search_filters=search_filters,
+            adaptive_policy=None,
         )
 
     def test_reset_does_nothing(self):
@@ -108,11 +108,86 @@ class TestZepUserStorage:
         json_data = '{"preference": "dark_mode", "timezone": "PST"}'
         storage.save(json_data, metadata={"type": "json"})
 
-        # Verify graph.add was called correctly
+        # Verify graph.add was called with the canonicalized JSON
+        mock_client.graph.add.assert_called_once_with(
+            user_id="test-user", data='{"preference":"dark_mode","timezone":"PST"}', type="json"
+        )
+
+    def test_save_json_dict_strips_empty_fields(self):
+        """Test that dict values are serialized as JSON without null or empty fields."""
+        from zep_cloud.client import Zep
+
+        mock_client = MagicMock(spec=Zep)
+        mock_client.graph = MagicMock()
+        mock_client.graph.add = MagicMock()
+
+        storage = ZepUserStorage(client=mock_client, user_id="test-user", thread_id="test-thread")
+
+        storage.save(
+            {"timezone": "PST", "nickname": None, "tags": [], "profile": {"bio": ""}},
+            metadata={"type": "json"},
+        )
+
         mock_client.graph.add.assert_called_once_with(
-            user_id="test-user", data=json_data, type="json"
+            user_id="test-user", data='{"timezone":"PST"}', type="json"
+        )
+
+    def test_save_json_splits_oversized_objects(self):
+        """Test that large JSON objects are split into sub-documents under the size limit."""
+        import json
+
+        from zep_cloud.client import Zep
+
+        mock_client = MagicMock(spec=Zep)
+        mock_client.graph = MagicMock()
+        mock_client.graph.add = MagicMock()
+
+        storage = ZepUserStorage(
+            client=mock_client, user_id="test-user", thread_id="test-thread", json_max_chars=500
+        )
+
+        value = {
+            "id": "order-1",
+            "status": "shipped",
+            "items": [{"sku": f"SKU-{i}", "description": "x" * 40} for i in range(20)],
+            "shipping": {"address": "1 Main St", "notes": "y" * 100},
+        }
+        storage.save(value, metadata={"type": "json"})
+
+        payloads = [call[1]["data"] for call in mock_client.graph.add.call_args_list]
+        assert len(payloads) > 1
+        assert all(len(payload) <= 500 for payload in payloads)
+
+        documents = [json.loads(payload) for payload in payloads]
+        # Every sub-document carries the identity field
+        assert all(document["id"] == "order-1" for document in documents)
+        # No item is lost or duplicated
+        skus = [item["sku"] for document in documents for item in document.get("items", [])]
+        assert skus == [f"SKU-{i}" for i in range(20)]
+        assert sum("shipping" in document for document in documents) == 1
+
+    def test_save_json_chunks_oversized_invalid_json(self):
+        """Test that text that is not valid JSON is chunked under the size limit."""
+        from zep_cloud.client import Zep
+
+        mock_client = MagicMock(spec=Zep)
+        mock_client.graph = MagicMock()
+        mock_client.graph.add = MagicMock()
+
+        storage = ZepUserStorage(
+            client=mock_client, user_id="test-user", thread_id="test-thread", json_max_chars=100
         )
 
+        text = "{not json " + "z" * 240
+        storage.save(text, metadata={"type": "json"})
+
+        payloads = [call[1]["data"] for call in mock_client.graph.add.call_args_list]
+        assert len(payloads) == 3
+        assert all(len(payload) <= 100 for payload in payloads)
+        assert "".join(payloads) == text
+        # Sent as plain text, not as JSON the server would reject
+        assert all(call[1]["type"] == "text" for call in mock_client.graph.add.call_args_list)
+
     def test_save_text_data(self):
         """Test saving text data to user graph."""
         from zep_cloud.client import Zep
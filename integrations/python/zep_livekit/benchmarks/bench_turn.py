@@ -0,0 +1,245 @@
+"""
+Benchmark the time the agents' user turn hook adds before the LLM can start, offline.
+
+Runs on_user_turn_completed of ZepUserAgent and ZepGraphAgent against FakeAsyncZep,
+an in-process AsyncZep stand-in with configurable latency, and reports the hook
+time per turn (p50 and p95, milliseconds), the Zep calls made per turn and, with
+--deadline-ms, the share of turns whose context missed the deadline. "graph_speculative" simulates
+interim transcripts while the user speaks, so its search overlaps the speech, and
+"graph_adaptive" skips the search scopes whose hits stay the same. The
+"user_sequential" scenario replays the previous ZepUserAgent hook (store the
+message, then retrieve the context) as the reference.
+
+Usage:
+    python benchmarks/bench_turn.py [--turns 50] [--latency-ms 80] [--deadline-ms 150]
+        [--scenarios user_sequential,user_background] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from livekit.agents.llm.chat_context import ChatContext
+from zep_cloud.types import Message
+
+from zep_livekit import ZepGraphAgent, ZepUserAgent
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_zep import FakeAsyncZep, FakeZepConfig, lognormal  # noqa: E402
+
+# Runs a user turn for one message and returns the hook time in milliseconds
+Turn = Callable[[str], Awaitable[float]]
+Agent = ZepUserAgent | ZepGraphAgent
+# Builds the turn function, and the agent if the scenario uses one, for a client and deadline
+Scenario = Callable[[FakeAsyncZep, float | None], tuple[Turn, Agent | None]]
+
+INSTRUCTIONS = "You are a helpful assistant."
+
+# Pace of the simulated speech, and silence before the end of the turn is detected
+WORD_S = 0.08
+ENDPOINTING_S = 0.3
+
+
+def _agent_turn(agent: Agent, speak: bool = False) -> tuple[Turn, Agent]:
+    async def turn(text: str) -> float:
+        if speak:
+            # Interim transcripts as the user speaks, as the session would deliver them
+            words = text.split()
+            for i in range(1, len(words) + 1):
+                agent._prefetch.update(" ".join(words[:i]), is_final=False)
+                await asyncio.sleep(WORD_S)
+            await asyncio.sleep(ENDPOINTING_S)
+
+        turn_ctx = ChatContext()
+        new_message = turn_ctx.add_message(role="user", content=text)
+        started = time.perf_counter()
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        return (time.perf_counter() - started) * 1000
+
+    return turn, agent
+
+
+def user_sequential(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, None]:
+    """The previous ZepUserAgent hook: store the message, then retrieve the context."""
+
+    async def turn(text: str) -> float:
+        started = time.perf_counter()
+        await client.thread.add_messages(
+            thread_id="thread", messages=[Message(content=text, role="user")]
+        )
+        await client.thread.get_user_context(thread_id="thread")
+        return (time.perf_counter() - started) * 1000
+
+    return turn, None
+
+
+def user_background(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, Agent]:
+    """ZepUserAgent storing the message in the background while retrieving the context."""
+    return _agent_turn(
+        ZepUserAgent(
+            zep_client=client,
+            user_id="user",
+            thread_id="thread",
+            context_deadline_ms=deadline_ms,
+            instructions=INSTRUCTIONS,
+        )
+    )
+
+
+def user_pipelined(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, Agent]:
+    """ZepUserAgent storing the message and retrieving the context in one round trip."""
+    return _agent_turn(
+        ZepUserAgent(
+            zep_client=client,
+            user_id="user",
+            thread_id="thread",
+            store_mode="pipelined",
+            context_deadline_ms=deadline_ms,
+            instructions=INSTRUCTIONS,
+        )
+    )
+
+
+def graph(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, Agent]:
+    """ZepGraphAgent storing the message and searching edges, nodes and episodes."""
+    return _agent_turn(
+        ZepGraphAgent(
+            zep_client=client,
+            graph_id="graph",
+            context_deadline_ms=deadline_ms,
+            instructions=INSTRUCTIONS,
+        )
+    )
+
+
+def graph_speculative(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, Agent]:
+    """ZepGraphAgent searching speculatively on interim transcripts while the user speaks."""
+    return _agent_turn(
+        ZepGraphAgent(
+            zep_client=client,
+            graph_id="graph",
+            context_deadline_ms=deadline_ms,
+            speculative_prefetch=True,
+            instructions=INSTRUCTIONS,
+        ),
+        speak=True,
+    )
+
+
+def graph_adaptive(client: FakeAsyncZep, deadline_ms: float | None) -> tuple[Turn, Agent]:
+    """ZepGraphAgent caching searches and skipping scopes whose hits do not change."""
+    return _agent_turn(
+        ZepGraphAgent(
+            zep_client=client,
+            graph_id="graph",
+            context_deadline_ms=deadline_ms,
+            search_cache_ttl=30.0,
+            adaptive_scope_turns=3,
+            instructions=INSTRUCTIONS,
+        )
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "user_sequential": user_sequential,
+    "user_background": user_background,
+    "user_pipelined": user_pipelined,
+    "graph": graph,
+    "graph_speculative": graph_speculative,
+    "graph_adaptive": graph_adaptive,
+}
+
+
+async def run_turns(
+    scenario: Scenario,
+    config: FakeZepConfig,
+    turns: int,
+    pause_s: float,
+    deadline_ms: float | None = None,
+) -> tuple[list[float], float, float | None]:
+    """
+    Run turns turns of a scenario, one at a time, pausing pause_s between turns.
+
+    Returns:
+        The hook time of every turn in milliseconds, the Zep calls per turn, and the
+        share of turns past the context deadline (None without an agent or deadline)
+    """
+    client = FakeAsyncZep(config)
+    turn, agent = scenario(client, deadline_ms)
+    await turn("Warm-up message")
+    client.reset_counters()
+    exceeded_before = agent.retrieval_stats["deadline_exceeded"] if agent else 0
+
+    durations: list[float] = []
+    for i in range(turns):
+        durations.append(await turn(f"Message {i}: I'd like to plan a trip to Lisbon in June"))
+        # The LLM reply and the user's next utterance take a while; background writes
+        # complete in the meantime
+        await asyncio.sleep(pause_s)
+
+    missed = None
+    if agent is not None:
+        if deadline_ms is not None:
+            missed = (agent.retrieval_stats["deadline_exceeded"] - exceeded_before) / turns
+        await agent.on_exit()
+    return durations, sum(client.calls.values()) / turns, missed
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=50, help="Turns per scenario")
+    parser.add_argument(
+        "--latency-ms", type=float, default=80.0, help="Median service latency (log-normal)"
+    )
+    parser.add_argument("--deadline-ms", type=float, help="Context deadline of the agents")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake service")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    config = FakeZepConfig(default_latency_ms=lognormal(args.latency_ms), seed=args.seed)
+
+    deadline = f", {args.deadline_ms:g} ms context deadline" if args.deadline_ms else ""
+    print(f"{args.turns} turns, {args.latency_ms:g} ms median service latency{deadline}")
+    print(f"{'scenario':<18}{'hook p50':>10}{'hook p95':>10}{'calls/turn':>12}{'missed':>8}")
+
+    results = []
+    for name in args.scenarios.split(","):
+        durations, calls, missed = await run_turns(
+            SCENARIOS[name],
+            config,
+            args.turns,
+            pause_s=args.latency_ms * 3 / 1000,
+            deadline_ms=args.deadline_ms,
+        )
+        row = {
+            "scenario": name,
+            "hook_p50_ms": _percentile(durations, 50),
+            "hook_p95_ms": _percentile(durations, 95),
+            "calls_per_turn": calls,
+            "deadline_missed": missed,
+        }
+        results.append(row)
+        print(
+            f"{name:<18}{row['hook_p50_ms']:>10.1f}{row['hook_p95_ms']:>10.1f}{calls:>12.1f}"
+            f"{'-' if missed is None else f'{missed:.0%}':>8}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
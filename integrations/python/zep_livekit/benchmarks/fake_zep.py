@@ -0,0 +1,175 @@
+"""
+In-process stand-in for AsyncZep, used to benchmark the agents offline.
+
+FakeAsyncZep is a real AsyncZep instance (so the agents accept it) whose thread
+and graph clients are replaced by fakes. Every call sleeps for a latency drawn
+from a configurable distribution and returns zep_cloud response types, so the
+agents run exactly as they do against the service. No request leaves the process.
+"""
+
+import asyncio
+import math
+import random
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from zep_cloud import EntityEdge, EntityNode, Episode, GraphSearchResults
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import AddThreadMessagesResponse, Message, ThreadContextResponse
+
+# Draws a value from a random generator
+Distribution = Callable[[random.Random], float]
+
+
+def fixed(value: float) -> Distribution:
+    """Always the same value."""
+    return lambda rng: value
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Distribution:
+    """Log-normally distributed around median; a long right tail like real latencies."""
+    if median <= 0:
+        return fixed(0.0)
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class FakeZepConfig:
+    """
+    Latency and payload shape of the fake service.
+
+    Attributes:
+        latency_ms: Latency of each call in milliseconds, per operation; operations
+            without an entry use default_latency_ms
+        default_latency_ms: Latency of operations without their own distribution
+        results: Number of results a search has available, capped by its limit
+        context_chars: Length of the thread context string
+        seed: Seed of the random generator, for repeatable runs
+    """
+
+    latency_ms: dict[str, Distribution] = field(default_factory=dict)
+    default_latency_ms: Distribution = field(default_factory=lambda: fixed(0.0))
+    results: int = 10
+    context_chars: int = 1500
+    seed: int = 0
+
+
+class _FakeService:
+    """Shared state of the fake clients: latency, stored messages and call counts."""
+
+    def __init__(self, config: FakeZepConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.calls: Counter[str] = Counter()
+        self.threads: dict[str, list[Message]] = {}
+
+    async def call(self, operation: str) -> None:
+        self.calls[operation] += 1
+        distribution = self.config.latency_ms.get(operation, self.config.default_latency_ms)
+        await asyncio.sleep(max(0.0, distribution(self.rng)) / 1000)
+
+    def context(self, thread_id: str) -> str:
+        messages = self._thread_text(thread_id)
+        return (messages + " lorem ipsum" * self.config.context_chars)[: self.config.context_chars]
+
+    def _thread_text(self, thread_id: str) -> str:
+        return " ".join(message.content for message in self.threads.get(thread_id, []))
+
+
+class _FakeThreadClient:
+    def __init__(self, service: _FakeService) -> None:
+        self._service = service
+
+    async def add_messages(
+        self,
+        thread_id: str,
+        *,
+        messages: Sequence[Message],
+        return_context: bool | None = None,
+        **_: Any,
+    ) -> AddThreadMessagesResponse:
+        await self._service.call("thread.add_messages")
+        self._service.threads.setdefault(thread_id, []).extend(messages)
+        if return_context:
+            return AddThreadMessagesResponse(context=self._service.context(thread_id))
+        return AddThreadMessagesResponse()
+
+    async def get_user_context(self, thread_id: str, **_: Any) -> ThreadContextResponse:
+        await self._service.call("thread.get_user_context")
+        return ThreadContextResponse(context=self._service.context(thread_id))
+
+
+class _FakeGraphClient:
+    def __init__(self, service: _FakeService) -> None:
+        self._service = service
+
+    async def add(self, *, data: str, type: str, **_: Any) -> Episode:
+        await self._service.call("graph.add")
+        return Episode(uuid_="episode", content=data, created_at="2025-01-01T00:00:00Z")
+
+    async def search(
+        self, *, query: str, limit: int | None = None, scope: str | None = None, **_: Any
+    ) -> GraphSearchResults:
+        await self._service.call("graph.search")
+        count = min(self._service.config.results, limit or self._service.config.results)
+        if scope == "nodes":
+            return GraphSearchResults(nodes=[_node(i) for i in range(count)])
+        if scope == "episodes":
+            return GraphSearchResults(episodes=[_episode(i) for i in range(count)])
+        return GraphSearchResults(edges=[_edge(i) for i in range(count)])
+
+
+def _edge(i: int) -> EntityEdge:
+    return EntityEdge(
+        uuid_=f"edge-{i}",
+        fact=f"Fact {i} lorem ipsum dolor sit amet",
+        name="RELATES_TO",
+        source_node_uuid="source",
+        target_node_uuid="target",
+        created_at="2025-01-01T00:00:00Z",
+        valid_at="2025-01-01T00:00:00Z",
+    )
+
+
+def _node(i: int) -> EntityNode:
+    return EntityNode(
+        uuid_=f"node-{i}",
+        name=f"Entity {i}",
+        summary=f"Entity {i} lorem ipsum dolor sit amet",
+        created_at="2025-01-01T00:00:00Z",
+    )
+
+
+def _episode(i: int) -> Episode:
+    return Episode(
+        uuid_=f"episode-{i}",
+        content=f"Message {i} lorem ipsum dolor sit amet",
+        created_at="2025-01-01T00:00:00Z",
+    )
+
+
+class FakeAsyncZep(AsyncZep):
+    """
+    AsyncZep whose thread and graph APIs are served in-process.
+
+    Args:
+        config: Latency and payload shape of the fake service
+    """
+
+    def __init__(self, config: FakeZepConfig | None = None) -> None:
+        super().__init__(api_key="offline")
+        self._service = _FakeService(config or FakeZepConfig())
+        self.thread = _FakeThreadClient(self._service)  # type: ignore[assignment]
+        self.graph = _FakeGraphClient(self._service)  # type: ignore[assignment]
+
+    @property
+    def calls(self) -> Counter[str]:
+        """Get the number of calls made to each operation."""
+        return self._service.calls
+
+    def reset_counters(self) -> None:
+        """Reset the call counts."""
+        self._service.calls.clear()
@@ -14,9 +14,14 @@ from livekit.agents.llm.chat_context import ChatContext, ChatMessage
 from zep_cloud import SearchFilters
 from zep_cloud.client import AsyncZep
 from zep_cloud.graph.utils import compose_context_string
-from zep_cloud.types import Message, Reranker
+from zep_cloud.types import GraphSearchResults, GraphSearchScope, Message, Reranker
 
+from .coalescer import MessageCoalescer
+from .deadline import RetrievalDeadline
 from .exceptions import AgentConfigurationError
+from .prefetch import SpeculativePrefetch
+from .search_cache import AdaptiveScopeSkipper, SearchCache
+from .writer import ManagedWriter
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +39,30 @@ class ZepUserAgent(agents.Agent):
         zep_client: Initialized AsyncZep client for memory operations
         user_id: User identifier for memory isolation and personalization
         thread_id: Thread identifier for conversation continuity
+        context_mode: Context mode for retrieval, "basic" or "summary" (default: "basic")
         user_message_name: Optional name to set on user messages in Zep
         assistant_message_name: Optional name to set on assistant messages in Zep
+        store_mode: How the user turn is stored and its context retrieved:
+            - "background" (default): the user message is written in a background task
+              while context retrieval starts immediately, so the turn waits for one round
+              trip; the context reflects the thread up to the previous turn
+            - "pipelined": the message is sent with return_context, so the context
+              returned by the same round trip reflects the new message (basic mode only)
+        context_deadline_ms: Time a turn waits for context in milliseconds; a context
+            retrieved later is injected on the next turn instead (default: no deadline)
+        speculative_prefetch: Start context retrieval once the interim transcript of a user
+            turn stabilizes, so it overlaps the user's speech; the user context does not
+            depend on the words, so the result is used whatever the final transcript
+            (background store mode only)
+        prefetch_debounce_ms: Time the interim transcript must stay unchanged before
+            speculative retrieval starts (default: 250)
+        max_pending_writes: Largest number of messages waiting to be stored; messages
+            beyond it are dropped (default: 100)
+        write_retries: Number of retries of a failed write, with backoff (default: 2)
+        drain_timeout: Time on exit to wait for pending writes in seconds (default: 5)
+        coalesce_window_ms: Hold messages up to this long so several are stored in one
+            write: a user message and the assistant reply to it are stored together, as
+            are any messages within the window (default: every message is stored alone)
         **kwargs: All other LiveKit Agent parameters (chat_ctx, tools, stt, llm, tts, etc.)
     """
 
@@ -48,12 +75,40 @@ class ZepUserAgent(agents.Agent):
         context_mode: Literal["basic", "summary"] | None = None,
         user_message_name: str | None = None,
         assistant_message_name: str | None = None,
+        store_mode: Literal["background", "pipelined"] = "background",
+        context_deadline_ms: float | None = None,
+        speculative_prefetch: bool = False,
+        prefetch_debounce_ms: float = 250.0,
+        max_pending_writes: int = 100,
+        write_retries: int = 2,
+        drain_timeout: float = 5.0,
+        coalesce_window_ms: float | None = None,
         **kwargs: Any,
     ) -> None:
         if not user_id:
             raise AgentConfigurationError("user_id must be a non-empty string")
         if not thread_id:
             raise AgentConfigurationError("thread_id must be a non-empty string")
+        if store_mode not in ("background", "pipelined"):
+            raise AgentConfigurationError('store_mode must be "background" or "pipelined"')
+        if store_mode == "pipelined" and context_mode == "summary":
+            raise AgentConfigurationError(
+                'store_mode "pipelined" only supports context_mode "basic"'
+            )
+        if context_deadline_ms is not None and context_deadline_ms <= 0:
+            raise AgentConfigurationError("context_deadline_ms must be positive")
+        if speculative_prefetch and store_mode == "pipelined":
+            raise AgentConfigurationError(
+                'speculative_prefetch cannot be combined with store_mode "pipelined"'
+            )
+        if prefetch_debounce_ms < 0:
+            raise AgentConfigurationError("prefetch_debounce_ms must not be negative")
+        if max_pending_writes < 1:
+            raise AgentConfigurationError("max_pending_writes must be at least 1")
+        if write_retries < 0:
+            raise AgentConfigurationError("write_retries must not be negative")
+        if coalesce_window_ms is not None and coalesce_window_ms <= 0:
+            raise AgentConfigurationError("coalesce_window_ms must be positive")
 
         # Initialize base Agent with all parameters passed through
         super().__init__(**kwargs)
@@ -64,6 +119,48 @@ class ZepUserAgent(agents.Agent):
         self._context_mode = context_mode or "basic"
         self._user_message_name = user_message_name
         self._assistant_message_name = assistant_message_name
+        self._store_mode = store_mode
+        self._deadline = RetrievalDeadline(context_deadline_ms)
+        self._speculative_prefetch = speculative_prefetch
+        self._prefetch = SpeculativePrefetch(
+            lambda _: self._get_context(),
+            debounce_ms=prefetch_debounce_ms,
+            similarity_threshold=0.0,
+        )
+
+        # Messages are stored in the background, in order
+        self._writer = ManagedWriter(max_queue_size=max_pending_writes, max_retries=write_retries)
+        self._drain_timeout = drain_timeout
+        self._coalescer = (
+            MessageCoalescer(self._store_messages, window_ms=coalesce_window_ms)
+            if coalesce_window_ms
+            else None
+        )
+
+    @property
+    def store_mode(self) -> str:
+        """Get how user turns are stored and their context retrieved."""
+        return self._store_mode
+
+    @property
+    def retrieval_stats(self) -> dict[str, int]:
+        """Get the number of turns, of context deadlines exceeded and of late contexts injected."""
+        return self._deadline.stats
+
+    @property
+    def prefetch_stats(self) -> dict[str, int]:
+        """Get the number of speculative retrievals started, used and discarded."""
+        return self._prefetch.stats
+
+    @property
+    def writer_stats(self) -> dict[str, float]:
+        """Get the number of pending writes, write counts and recent write latencies."""
+        return self._writer.stats
+
+    @property
+    def coalescing_stats(self) -> dict[str, int]:
+        """Get the number of messages and of batches stored, when coalescing messages."""
+        return self._coalescer.stats if self._coalescer else {}
 
     async def on_enter(self) -> None:
         """Called when the agent enters a conversation."""
@@ -74,15 +171,22 @@ class ZepUserAgent(agents.Agent):
             self._setup_session_handlers()
 
     def _setup_session_handlers(self) -> None:
-        """Set up event handlers on the session to capture assistant responses."""
+        """Set up event handlers on the session to capture assistant responses and transcripts."""
 
         @self.session.on("conversation_item_added")
         def on_conversation_item_added(event: Any) -> None:
             """Handle conversation item addition events to capture assistant responses."""
-            # Schedule async storage to avoid blocking event processing
-            asyncio.create_task(self._handle_conversation_item(event))
+            # Storage is queued on the writer to avoid blocking event processing
+            self._handle_conversation_item(event)
+
+        if self._speculative_prefetch:
 
-    async def _handle_conversation_item(self, event: Any) -> None:
+            @self.session.on("user_input_transcribed")
+            def on_user_input_transcribed(event: Any) -> None:
+                """Feed interim transcripts to speculative context retrieval."""
+                self._prefetch.update(event.transcript, event.is_final)
+
+    def _handle_conversation_item(self, event: Any) -> None:
         """Handle conversation item from session event."""
         try:
             # Extract conversation item from event
@@ -102,7 +206,7 @@ class ZepUserAgent(agents.Agent):
             if role == "assistant":
                 content_text = self._extract_text_content(content)
                 if content_text.strip():
-                    await self._store_assistant_message(content_text.strip(), item)
+                    self._store_assistant_message(content_text.strip(), item)
 
         except Exception as e:
             logger.error(f"Failed to handle conversation item: {e}")
@@ -123,28 +227,23 @@ class ZepUserAgent(agents.Agent):
 
         return str(content)
 
-    async def _store_assistant_message(self, content_text: str, item: Any) -> None:
+    def _store_assistant_message(self, content_text: str, item: Any) -> None:
         """Store assistant message in Zep thread memory."""
-        try:
-            # Use custom assistant name if provided, otherwise fallback to item name
-            message_name = self._assistant_message_name or getattr(item, "name", None)
+        # Use custom assistant name if provided, otherwise fallback to item name
+        message_name = self._assistant_message_name or getattr(item, "name", None)
 
-            zep_message = Message(content=content_text, role="assistant", name=message_name)
+        zep_message = Message(content=content_text, role="assistant", name=message_name)
 
-            await self._zep_client.thread.add_messages(
-                thread_id=self._thread_id, messages=[zep_message]
-            )
-
-        except Exception as e:
-            logger.warning(f"Failed to store assistant response: {e}")
+        self._store_message(zep_message)
 
     async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
         """
         Handle user turn completion - store message and inject memory context.
 
-        1. Store user message in Zep
-        2. Retrieve relevant context from Zep
-        3. Inject context into conversation
+        In "background" mode the user message is queued on the writer while the context
+        is retrieved; in "pipelined" mode both happen in a single round trip, once the
+        writes queued before it are delivered.
+        The retrieved context is injected into the conversation.
         """
         await super().on_user_turn_completed(turn_ctx, new_message)
 
@@ -152,33 +251,79 @@ class ZepUserAgent(agents.Agent):
         if not user_text or not user_text.strip():
             return
 
-        try:
-            zep_message = Message(
-                content=user_text.strip(), role="user", name=self._user_message_name
-            )
-
-            await self._zep_client.thread.add_messages(
-                thread_id=self._thread_id, messages=[zep_message]
+        zep_message = Message(content=user_text.strip(), role="user", name=self._user_message_name)
+
+        if self._store_mode == "pipelined":
+            # Held messages go along with the user message
+            messages = self._coalescer.batch_with(zep_message) if self._coalescer else [zep_message]
+            store = self._store_messages(messages, return_context=True)
+            context = await self._deadline.run(lambda: self._context_of(store))
+        else:
+            self._store_message(zep_message)
+            speculative = self._prefetch.take(user_text)
+            if speculative is not None:
+                context = await self._deadline.run(lambda: speculative)
+            else:
+                context = await self._deadline.run(self._get_context)
+
+        if context:
+            turn_ctx.add_message(role="system", content=f"Relevant user context:\n{context}")
+
+    def _store_message(self, zep_message: Message) -> None:
+        """Store a message in Zep thread memory, with the next batch when coalescing."""
+        if self._coalescer:
+            self._coalescer.add(zep_message)
+        else:
+            self._store_messages([zep_message])
+
+    def _store_messages(
+        self, messages: list[Message], return_context: bool = False
+    ) -> asyncio.Future[Any]:
+        """Queue one write of messages to Zep thread memory."""
+        if len(messages) > 1:
+            label = f"{len(messages)} messages"
+        else:
+            label = "user message" if messages[0].role == "user" else "assistant response"
+
+        if return_context:
+            return self._writer.submit(
+                lambda: self._zep_client.thread.add_messages(
+                    thread_id=self._thread_id, messages=messages, return_context=True
+                ),
+                label=label,
             )
-
-        except Exception as e:
-            logger.warning(f"Failed to store user message in Zep: {e}")
-
+        return self._writer.submit(
+            lambda: self._zep_client.thread.add_messages(
+                thread_id=self._thread_id, messages=messages
+            ),
+            label=label,
+        )
+
+    async def _get_context(self) -> str | None:
+        """Retrieve the user context of the thread."""
         try:
             memory_result = await self._zep_client.thread.get_user_context(
                 thread_id=self._thread_id, mode=self._context_mode
             )
-
-            if memory_result and memory_result.context:
-                context = memory_result.context
-
-                turn_ctx.add_message(role="system", content=f"Relevant user context:\n{context}")
-
+            return memory_result.context if memory_result else None
         except Exception as e:
             logger.warning(f"Failed to retrieve context from Zep: {e}")
+            return None
+
+    async def _context_of(self, store: asyncio.Future[Any]) -> str | None:
+        """Get the context returned by a pipelined store."""
+        # Shielded, so a retrieval past its deadline leaves the write to the writer
+        response = await asyncio.shield(store)
+        return response.context if response else None
 
     async def on_exit(self) -> None:
         """Called when the agent exits a conversation."""
+        self._deadline.close()
+        self._prefetch.close()
+        if self._coalescer:
+            self._coalescer.flush()
+        # Deliver the writes of the last turns
+        await self._writer.drain(timeout=self._drain_timeout)
         await super().on_exit()
 
 
@@ -206,6 +351,28 @@ class ZepGraphAgent(agents.Agent):
         episode_limit: Maximum number of episodes to retrieve (default: 3)
         search_filters: Optional filters for graph search
         reranker: Optional reranker for search results
+        context_deadline_ms: Time a turn waits for context in milliseconds; a context
+            retrieved later is injected on the next turn instead (default: no deadline)
+        speculative_prefetch: Start the graph search once the interim transcript of a user
+            turn stabilizes, so it overlaps the user's speech, and use its result if the
+            final transcript is close enough
+        prefetch_debounce_ms: Time the interim transcript must stay unchanged before
+            speculative search starts (default: 250)
+        prefetch_similarity: Smallest word similarity (0 to 1) between the interim and
+            final transcripts for a speculative search to be used (default: 0.8)
+        max_pending_writes: Largest number of messages waiting to be stored; messages
+            beyond it are dropped (default: 100)
+        write_retries: Number of retries of a failed write, with backoff (default: 2)
+        drain_timeout: Time on exit to wait for pending writes in seconds (default: 5)
+        search_cache_ttl: Time to cache the results of each search scope for a query in
+            seconds; the cache is emptied once the agent's writes have been extracted
+            (default: no cache)
+        adaptive_scope_turns: Skip searching a scope once its hits have not changed over
+            this many turns, reusing its last results, and search it again after as many
+            turns; the hits are forgotten once the agent's writes have been extracted
+            (default: every scope is searched on every turn)
+        extraction_delay: Time in seconds Zep is given to extract facts from a delivered
+            write before the search cache and skipped scopes are reset (default: 5)
         **kwargs: All other LiveKit Agent parameters
     """
 
@@ -220,10 +387,36 @@ class ZepGraphAgent(agents.Agent):
         episode_limit: int = 2,
         search_filters: SearchFilters | None = None,
         reranker: Reranker | None = "rrf",
+        context_deadline_ms: float | None = None,
+        speculative_prefetch: bool = False,
+        prefetch_debounce_ms: float = 250.0,
+        prefetch_similarity: float = 0.8,
+        max_pending_writes: int = 100,
+        write_retries: int = 2,
+        drain_timeout: float = 5.0,
+        search_cache_ttl: float | None = None,
+        adaptive_scope_turns: int | None = None,
+        extraction_delay: float = 5.0,
         **kwargs: Any,
     ) -> None:
         if not graph_id:
             raise AgentConfigurationError("graph_id must be a non-empty string")
+        if context_deadline_ms is not None and context_deadline_ms <= 0:
+            raise AgentConfigurationError("context_deadline_ms must be positive")
+        if prefetch_debounce_ms < 0:
+            raise AgentConfigurationError("prefetch_debounce_ms must not be negative")
+        if max_pending_writes < 1:
+            raise AgentConfigurationError("max_pending_writes must be at least 1")
+        if write_retries < 0:
+            raise AgentConfigurationError("write_retries must not be negative")
+        if not 0.0 <= prefetch_similarity <= 1.0:
+            raise AgentConfigurationError("prefetch_similarity must be between 0 and 1")
+        if search_cache_ttl is not None and search_cache_ttl <= 0:
+            raise AgentConfigurationError("search_cache_ttl must be positive")
+        if adaptive_scope_turns is not None and adaptive_scope_turns < 1:
+            raise AgentConfigurationError("adaptive_scope_turns must be at least 1")
+        if extraction_delay < 0:
+            raise AgentConfigurationError("extraction_delay must not be negative")
 
         # Initialize base Agent with all parameters passed through
         super().__init__(**kwargs)
@@ -236,6 +429,55 @@ class ZepGraphAgent(agents.Agent):
         self._episode_limit = episode_limit
         self._search_filters = search_filters
         self._reranker = reranker
+        self._deadline = RetrievalDeadline(context_deadline_ms)
+        self._speculative_prefetch = speculative_prefetch
+        self._prefetch = SpeculativePrefetch(
+            lambda text: self._retrieve_graph_context(text[:400]),
+            debounce_ms=prefetch_debounce_ms,
+            similarity_threshold=prefetch_similarity,
+        )
+
+        # Messages are stored in the background, in order
+        self._writer = ManagedWriter(max_queue_size=max_pending_writes, max_retries=write_retries)
+        self._drain_timeout = drain_timeout
+
+        # Fewer concurrent searches per turn, from cached and stable scopes
+        self._search_cache = SearchCache(search_cache_ttl) if search_cache_ttl else None
+        self._scope_skipper = (
+            AdaptiveScopeSkipper(adaptive_scope_turns) if adaptive_scope_turns else None
+        )
+        # Searches only see a write once Zep has extracted it, so the agent's own turn
+        # writes reset the cache and skipper after extraction_delay, not on delivery
+        self._extraction_delay = extraction_delay
+        self._settled_at = 0.0
+        self._settle_timer: asyncio.TimerHandle | None = None
+        self._searches = 0
+        self._cache_hits = 0
+        self._skipped_scopes = 0
+
+    @property
+    def retrieval_stats(self) -> dict[str, int]:
+        """Get the number of turns, of context deadlines exceeded and of late contexts injected."""
+        return self._deadline.stats
+
+    @property
+    def prefetch_stats(self) -> dict[str, int]:
+        """Get the number of speculative retrievals started, used and discarded."""
+        return self._prefetch.stats
+
+    @property
+    def writer_stats(self) -> dict[str, float]:
+        """Get the number of pending writes, write counts and recent write latencies."""
+        return self._writer.stats
+
+    @property
+    def search_stats(self) -> dict[str, int]:
+        """Get the number of scope searches made, answered from the cache and skipped."""
+        return {
+            "searches": self._searches,
+            "cache_hits": self._cache_hits,
+            "skipped_scopes": self._skipped_scopes,
+        }
 
     async def on_enter(self) -> None:
         """Called when the agent enters a conversation."""
@@ -246,15 +488,22 @@ class ZepGraphAgent(agents.Agent):
             self._setup_session_handlers()
 
     def _setup_session_handlers(self) -> None:
-        """Set up event handlers on the session to capture assistant responses."""
+        """Set up event handlers on the session to capture assistant responses and transcripts."""
 
         @self.session.on("conversation_item_added")
         def on_conversation_item_added(event: Any) -> None:
             """Handle conversation item addition events to capture assistant responses."""
-            # Schedule async storage to avoid blocking event processing
-            asyncio.create_task(self._handle_conversation_item(event))
+            # Storage is queued on the writer to avoid blocking event processing
+            self._handle_conversation_item(event)
 
-    async def _handle_conversation_item(self, event: Any) -> None:
+        if self._speculative_prefetch:
+
+            @self.session.on("user_input_transcribed")
+            def on_user_input_transcribed(event: Any) -> None:
+                """Feed interim transcripts to speculative context retrieval."""
+                self._prefetch.update(event.transcript, event.is_final)
+
+    def _handle_conversation_item(self, event: Any) -> None:
         """Handle conversation item from session event."""
         try:
             # Extract conversation item from event
@@ -274,7 +523,7 @@ class ZepGraphAgent(agents.Agent):
             if role == "assistant":
                 content_text = self._extract_text_content(content)
                 if content_text.strip():
-                    await self._store_assistant_message(content_text.strip(), item)
+                    self._store_assistant_message(content_text.strip(), item)
 
         except Exception as e:
             logger.error(f"Failed to handle conversation item: {e}")
@@ -295,27 +544,21 @@ class ZepGraphAgent(agents.Agent):
 
         return str(content)
 
-    async def _store_assistant_message(self, content_text: str, item: Any) -> None:
+    def _store_assistant_message(self, content_text: str, item: Any) -> None:
         """Store assistant message in Zep graph."""
-        try:
-            # Prefix assistant messages for consistency when user has a name
-            if self._user_name:
-                message_data = f"[Assistant]: {content_text}"
-            else:
-                message_data = content_text
-
-            await self._zep_client.graph.add(
-                graph_id=self._graph_id, type="message", data=message_data
-            )
+        # Prefix assistant messages for consistency when user has a name
+        if self._user_name:
+            message_data = f"[Assistant]: {content_text}"
+        else:
+            message_data = content_text
 
-        except Exception as e:
-            logger.warning(f"Failed to store assistant response: {e}")
+        self._store_message(message_data, label="assistant response")
 
     async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
         """
         Handle user turn completion - store message and inject memory context.
 
-        1. Store user message in Zep graph
+        1. Store user message in Zep graph (in the background)
         2. Perform hybrid search to retrieve relevant context
         3. Inject context into conversation using smart composition
         """
@@ -325,32 +568,61 @@ class ZepGraphAgent(agents.Agent):
         if not user_text or not user_text.strip():
             return
 
-        # Step 1: Store user message in Zep graph with user identification
-        try:
+        # Step 1: Store user message in Zep graph with user identification, queued on the
+        # writer so the turn only waits for retrieval
+        message_data = user_text.strip()
+        if self._user_name:
             # Prefix message with user name if provided
-            message_data = user_text.strip()
-            if self._user_name:
-                message_data = f"[{self._user_name}]: {message_data}"
-
-            await self._zep_client.graph.add(
-                graph_id=self._graph_id, type="message", data=message_data
+            message_data = f"[{self._user_name}]: {message_data}"
+        self._store_message(message_data, label="user message")
+
+        # Step 2: Retrieve relevant context using hybrid search, within the deadline; a
+        # speculative search started during the user's speech is used if it matches
+        speculative = self._prefetch.take(user_text)
+        if speculative is not None:
+            context = await self._deadline.run(lambda: speculative)
+        else:
+            query = user_text[:400]  # Limit query length
+            context = await self._deadline.run(lambda: self._retrieve_graph_context(query))
+
+        if context:
+            # Step 3: Inject context as system message
+            turn_ctx.add_message(
+                role="system", content=f"Relevant knowledge from memory:\n{context}"
             )
 
-        except Exception as e:
-            logger.warning(f"Failed to store user message in Zep graph: {e}")
-
-        # Step 2: Retrieve relevant context using hybrid search
-        try:
-            context = await self._retrieve_graph_context(user_text[:400])  # Limit query length
-
-            if context:
-                # Step 3: Inject context as system message
-                turn_ctx.add_message(
-                    role="system", content=f"Relevant knowledge from memory:\n{context}"
-                )
-
-        except Exception as e:
-            logger.warning(f"Failed to retrieve context from Zep graph: {e}")
+    def _store_message(self, message_data: str, label: str) -> None:
+        """Store a message in Zep graph."""
+        write = self._writer.submit(
+            lambda: self._zep_client.graph.add(
+                graph_id=self._graph_id, type="message", data=message_data
+            ),
+            label=label,
+        )
+        if self._search_cache is not None or self._scope_skipper is not None:
+            write.add_done_callback(self._on_graph_write)
+
+    def _on_graph_write(self, write: asyncio.Future[Any]) -> None:
+        """Schedule a reset of the search cache and skipped scopes once a write is extracted."""
+        if write.cancelled() or write.result() is None:
+            return
+        loop = asyncio.get_running_loop()
+        self._settled_at = loop.time() + self._extraction_delay
+        if self._settle_timer is None:
+            self._settle_timer = loop.call_at(self._settled_at, self._on_graph_settled)
+
+    def _on_graph_settled(self) -> None:
+        """Empty the search cache and skipped scopes, as the graph now has the writes."""
+        self._settle_timer = None
+        if self._search_cache is not None:
+            self._search_cache.invalidate()
+        if self._scope_skipper is not None:
+            self._scope_skipper.reset()
+
+        # Writes delivered since the timer was set are extracted later
+        loop = asyncio.get_running_loop()
+        if self._settled_at > loop.time():
+            self._settle_timer = loop.call_at(self._settled_at, self._on_graph_settled)
 
     async def _retrieve_graph_context(self, query: str) -> str | None:
         """
@@ -360,47 +632,16 @@ class ZepGraphAgent(agents.Agent):
         - Compose a context string using the graph utilities
         """
         try:
-            # Perform parallel searches like in autogen
-            search_functions = []
-
-            if self._facts_limit:
-                # Search for facts/relationships (edges)
-                search_functions.append(
-                    self._zep_client.graph.search(
-                        graph_id=self._graph_id,
-                        query=query,
-                        limit=self._facts_limit,
-                        search_filters=self._search_filters,
-                        reranker=self._reranker,
-                        scope="edges",
-                    ),
-                )
-
-            if self._entity_limit:
-                # Search for entities (nodes)
-                search_functions.append(
-                    self._zep_client.graph.search(
-                        graph_id=self._graph_id,
-                        query=query,
-                        limit=self._entity_limit,
-                        search_filters=self._search_filters,
-                        reranker=self._reranker,
-                        scope="nodes",
-                    ),
-                )
-
-            if self._episode_limit:
-                # Search for episodes
-                search_functions.append(
-                    self._zep_client.graph.search(
-                        graph_id=self._graph_id,
-                        query=query,
-                        limit=self._episode_limit,
-                        search_filters=self._search_filters,
-                        reranker=self._reranker,
-                        scope="episodes",
-                    ),
-                )
+            # Perform parallel searches like in autogen, for facts/relationships (edges),
+            # entities (nodes) and episodes
+            scope_limits: list[tuple[GraphSearchScope, int]] = [
+                ("edges", self._facts_limit),
+                ("nodes", self._entity_limit),
+                ("episodes", self._episode_limit),
+            ]
+            search_functions = [
+                self._search_scope(query, scope, limit) for scope, limit in scope_limits if limit
+            ]
 
             results = await asyncio.gather(*search_functions)
 
@@ -427,6 +668,49 @@ class ZepGraphAgent(agents.Agent):
             logger.error(f"Error retrieving graph context: {e}")
             return None
 
+    async def _search_scope(
+        self, query: str, scope: GraphSearchScope, limit: int
+    ) -> GraphSearchResults:
+        """Search one scope of the graph, unless its results are cached or stable."""
+        generation = 0
+        if self._search_cache is not None:
+            cached = self._search_cache.get(scope, query)
+            if cached is not None:
+                self._cache_hits += 1
+                return cached
+            generation = self._search_cache.generation
+
+        skipper_generation = 0
+        if self._scope_skipper is not None:
+            reused = self._scope_skipper.skip(scope)
+            if reused is not None:
+                self._skipped_scopes += 1
+                return reused
+            skipper_generation = self._scope_skipper.generation
+
+        self._searches += 1
+        results = await self._zep_client.graph.search(
+            graph_id=self._graph_id,
+            query=query,
+            limit=limit,
+            search_filters=self._search_filters,
+            reranker=self._reranker,
+            scope=scope,
+        )
+
+        if self._scope_skipper is not None:
+            self._scope_skipper.record(scope, results, skipper_generation)
+        if self._search_cache is not None:
+            self._search_cache.put(scope, query, results, generation)
+        return results
+
     async def on_exit(self) -> None:
         """Called when the agent exits a conversation."""
+        self._deadline.close()
+        self._prefetch.close()
+        # Deliver the writes of the last turns
+        await self._writer.drain(timeout=self._drain_timeout)
+        if self._settle_timer is not None:
+            self._settle_timer.cancel()
+            self._settle_timer = None
         await super().on_exit()
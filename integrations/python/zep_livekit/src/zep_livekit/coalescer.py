@@ -0,0 +1,103 @@
+"""
+Coalescing of thread messages into batched writes.
+"""
+
+import asyncio
+from collections.abc import Callable
+
+from zep_cloud.types import Message
+
+# Largest number of messages thread.add_messages accepts per call
+MAX_BATCH_SIZE = 30
+
+
+class MessageCoalescer:
+    """
+    Holds thread messages briefly so several can be stored in one write.
+
+    Pending messages are flushed, in order, as one batch as soon as an assistant
+    message completes an exchange (a user message is pending before it), once
+    window_ms has passed since the oldest pending message, or when the batch is full.
+
+    Args:
+        flush: Stores a batch of messages; called from the event loop
+        window_ms: Longest time a message is held
+        max_batch_size: Largest number of messages in a batch
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[Message]], object],
+        window_ms: float,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ) -> None:
+        if window_ms <= 0:
+            raise ValueError("window_ms must be positive")
+        if not 1 <= max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"max_batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+        self._flush = flush
+        self._window_ms = window_ms
+        self._max_batch_size = max_batch_size
+
+        self._pending: list[Message] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+        self._messages = 0
+        self._batches = 0
+
+    @property
+    def pending(self) -> int:
+        """Get the number of messages held."""
+        return len(self._pending)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get the number of messages and of batches flushed."""
+        return {"messages": self._messages, "batches": self._batches}
+
+    def add(self, message: Message) -> None:
+        """
+        Hold a message for the next batch.
+
+        Must be called from the event loop, e.g. in a session event handler.
+        """
+        completes_exchange = message.role == "assistant" and any(
+            pending.role == "user" for pending in self._pending
+        )
+        self._pending.append(message)
+
+        if completes_exchange or len(self._pending) >= self._max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window_ms / 1000, self.flush)
+
+    def batch_with(self, message: Message) -> list[Message]:
+        """
+        Get the held messages followed by message, as a batch the caller stores.
+
+        For writes that must be made right away (e.g. to get the context reflecting
+        message), so the held messages go with them rather than in a separate write.
+        """
+        # Fewer than max_batch_size messages are ever held, so the batch fits
+        batch = [*self._take(), message]
+        self._record(batch)
+        return batch
+
+    def flush(self) -> None:
+        """Flush the held messages now."""
+        batch = self._take()
+        if batch:
+            self._record(batch)
+            self._flush(batch)
+
+    def _take(self) -> list[Message]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        return pending
+
+    def _record(self, batch: list[Message]) -> None:
+        self._messages += len(batch)
+        self._batches += 1
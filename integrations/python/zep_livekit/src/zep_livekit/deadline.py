@@ -0,0 +1,101 @@
+"""
+Latency-budgeted context retrieval for LiveKit agents.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalDeadline:
+    """
+    Runs context retrievals under a deadline and keeps late results for the next turn.
+
+    A retrieval that is not done by the deadline keeps running in the background; the
+    turn proceeds without context, and the result is injected on the next turn if that
+    turn's own retrieval misses the deadline too. A retrieval that makes the deadline
+    always wins over a late result, which is then dropped as stale.
+
+    Args:
+        deadline_ms: Time a turn waits for context in milliseconds; None waits for as
+            long as retrieval takes
+    """
+
+    def __init__(self, deadline_ms: float | None = None) -> None:
+        if deadline_ms is not None and deadline_ms <= 0:
+            raise ValueError("deadline_ms must be positive")
+
+        self._deadline_ms = deadline_ms
+        self._late_task: asyncio.Future[str | None] | None = None
+        self._late_context: str | None = None
+
+        self._turns = 0
+        self._deadline_exceeded = 0
+        self._late_injections = 0
+
+    @property
+    def deadline_ms(self) -> float | None:
+        """Get the time a turn waits for context in milliseconds."""
+        return self._deadline_ms
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get the number of turns, of deadlines exceeded and of late contexts injected."""
+        return {
+            "turns": self._turns,
+            "deadline_exceeded": self._deadline_exceeded,
+            "late_injections": self._late_injections,
+        }
+
+    async def run(self, retrieve: Callable[[], Awaitable[str | None]]) -> str | None:
+        """
+        Retrieve the context of a turn, waiting at most the deadline.
+
+        A retrieval that must not be cancelled when superseded (e.g. one that also stores
+        the message) should be shielded by the caller.
+
+        Returns:
+            The context of this turn if retrieved in time, otherwise the late context
+            of an earlier turn, if any
+        """
+        self._turns += 1
+        if self._deadline_ms is None:
+            return await retrieve()
+
+        task = asyncio.ensure_future(retrieve())
+        done, _ = await asyncio.wait({task}, timeout=self._deadline_ms / 1000)
+        if done:
+            # Earlier late results are stale now
+            self.close()
+            self._late_context = None
+            return task.result()
+
+        self._deadline_exceeded += 1
+        logger.debug(f"Context retrieval exceeded the {self._deadline_ms:g} ms deadline")
+
+        # A newer retrieval supersedes one that is still running
+        if self._late_task is not None:
+            self._late_task.cancel()
+        self._late_task = task
+        task.add_done_callback(self._keep_late_result)
+
+        context, self._late_context = self._late_context, None
+        if context:
+            self._late_injections += 1
+        return context
+
+    def _keep_late_result(self, task: asyncio.Future[str | None]) -> None:
+        if self._late_task is task:
+            self._late_task = None
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result():
+            self._late_context = task.result()
+
+    def close(self) -> None:
+        """Cancel a retrieval still running past its deadline."""
+        if self._late_task is not None:
+            self._late_task.cancel()
+            self._late_task = None
@@ -0,0 +1,163 @@
+"""
+Speculative context retrieval from interim speech-to-text transcripts.
+"""
+
+import asyncio
+import difflib
+import logging
+import re
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[\w']+")
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """
+    Get the similarity of two transcripts from 0 to 1.
+
+    Compares their words in order, ignoring case and punctuation, which speech-to-text
+    often changes between interim and final transcripts.
+    """
+    words_a = _WORD.findall(a.lower())
+    words_b = _WORD.findall(b.lower())
+    return difflib.SequenceMatcher(None, words_a, words_b).ratio()
+
+
+def _failed(task: asyncio.Future[str | None]) -> bool:
+    return task.done() and (task.cancelled() or task.exception() is not None)
+
+
+class SpeculativePrefetch:
+    """
+    Starts context retrieval while the user is still speaking.
+
+    Interim and final transcripts of the current user turn are fed to update(). Once
+    the turn's text has not changed for debounce_ms, a retrieval for it starts in the
+    background. When the turn completes, take() hands that retrieval over if its text
+    is close enough to the final transcript, hiding its latency behind the user's
+    speech; otherwise it is cancelled and the caller retrieves as usual.
+
+    Args:
+        retrieve: Retrieves the context for a transcript
+        debounce_ms: Time the transcript must stay unchanged before retrieval starts
+        similarity_threshold: Smallest similarity between the speculative and final
+            transcripts for the speculative retrieval to be used (0 uses it for any
+            transcript, e.g. when the context does not depend on the words)
+    """
+
+    def __init__(
+        self,
+        retrieve: Callable[[str], Awaitable[str | None]],
+        debounce_ms: float = 250.0,
+        similarity_threshold: float = 0.8,
+    ) -> None:
+        if debounce_ms < 0:
+            raise ValueError("debounce_ms must not be negative")
+        if not 0.0 <= similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be between 0 and 1")
+
+        self._retrieve = retrieve
+        self._debounce_ms = debounce_ms
+        self._similarity_threshold = similarity_threshold
+
+        # Final segments of the current turn, and its latest interim transcript
+        self._segments: list[str] = []
+        self._interim = ""
+        self._timer: asyncio.TimerHandle | None = None
+
+        self._task: asyncio.Future[str | None] | None = None
+        self._task_text = ""
+
+        self._speculations = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get the number of speculative retrievals started, used and discarded."""
+        return {
+            "speculations": self._speculations,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def update(self, transcript: str, is_final: bool) -> None:
+        """
+        Feed a transcript of the current user turn.
+
+        Must be called from the event loop, e.g. in a session event handler.
+        """
+        if is_final:
+            if transcript.strip():
+                self._segments.append(transcript.strip())
+            self._interim = ""
+        else:
+            self._interim = transcript.strip()
+
+        text = self._text()
+        if not text:
+            return
+
+        # Debounce: restart the wait on every change of the transcript
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(
+            self._debounce_ms / 1000, self._speculate, text
+        )
+
+    def take(self, final_text: str) -> asyncio.Future[str | None] | None:
+        """
+        End the current turn and get its speculative retrieval, if it can be used.
+
+        Returns:
+            The retrieval for a transcript close enough to final_text, or None
+        """
+        self._segments.clear()
+        self._interim = ""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        task, self._task = self._task, None
+        if task is None:
+            return None
+
+        similarity = transcript_similarity(self._task_text, final_text)
+        if not _failed(task) and similarity >= self._similarity_threshold:
+            self._hits += 1
+            return task
+
+        self._misses += 1
+        logger.debug(f"Discarding speculative retrieval (similarity {similarity:.2f})")
+        task.cancel()
+        return None
+
+    def close(self) -> None:
+        """Cancel a pending or running speculative retrieval."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _text(self) -> str:
+        return " ".join([*self._segments, self._interim]).strip()
+
+    def _speculate(self, text: str) -> None:
+        self._timer = None
+        # A retrieval that would be used for this text is kept rather than repeated
+        if (
+            self._task is not None
+            and not _failed(self._task)
+            and transcript_similarity(self._task_text, text) >= self._similarity_threshold
+        ):
+            return
+
+        if self._task is not None:
+            self._task.cancel()
+        self._task = asyncio.ensure_future(self._retrieve(text))
+        self._task_text = text
+        self._speculations += 1
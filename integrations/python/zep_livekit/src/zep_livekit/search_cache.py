@@ -0,0 +1,153 @@
+"""
+Caching and adaptive skipping of graph searches for ZepGraphAgent.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from zep_cloud.types import GraphSearchResults
+
+_WORD = re.compile(r"[\w']+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for caching: lowercase words, without punctuation."""
+    return " ".join(_WORD.findall(query.lower()))
+
+
+def _result_ids(results: GraphSearchResults) -> frozenset[str]:
+    return frozenset(
+        [
+            *(edge.uuid_ for edge in results.edges or []),
+            *(node.uuid_ for node in results.nodes or []),
+            *(episode.uuid_ for episode in results.episodes or []),
+        ]
+    )
+
+
+class SearchCache:
+    """
+    TTL cache of graph search results, per scope and normalized query.
+
+    invalidate() empties the cache when the graph changes. A search that was in flight
+    during an invalidation is not cached, as its results may predate the change.
+
+    Args:
+        ttl: Time a result stays fresh in seconds
+        max_entries: Largest number of cached results; the least recently used go first
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 256) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, GraphSearchResults]] = (
+            OrderedDict()
+        )
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Get the number of invalidations so far, to pass to put()."""
+        return self._generation
+
+    def get(self, scope: str, query: str) -> GraphSearchResults | None:
+        """Get the fresh cached results of a search, if any."""
+        key = (scope, normalize_query(query))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return results
+
+    def put(self, scope: str, query: str, results: GraphSearchResults, generation: int) -> None:
+        """Cache the results of a search that started at the given generation."""
+        if generation != self._generation:
+            return
+        key = (scope, normalize_query(query))
+        self._entries[key] = (time.monotonic(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Empty the cache, e.g. after a write to the graph."""
+        self._entries.clear()
+        self._generation += 1
+
+
+@dataclass
+class _ScopeState:
+    ids: frozenset[str] | None = None
+    results: GraphSearchResults | None = None
+    # Number of consecutive searches that returned ids
+    streak: int = 0
+    skipped: int = 0
+
+
+class AdaptiveScopeSkipper:
+    """
+    Skips searching a scope whose hits have not changed over recent turns.
+
+    Once the last stable_turns searches of a scope returned the same hits, whatever the
+    query, the scope is skipped and its last results reused for up to stable_turns
+    turns; then it is searched again to check whether its hits are still the same.
+    reset() forgets all recorded hits when the graph changes; a search that was in
+    flight during a reset is not recorded.
+
+    Args:
+        stable_turns: Number of searches with unchanged hits before a scope is skipped
+    """
+
+    def __init__(self, stable_turns: int = 3) -> None:
+        if stable_turns < 1:
+            raise ValueError("stable_turns must be at least 1")
+
+        self._stable_turns = stable_turns
+        self._scopes: dict[str, _ScopeState] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Get the number of resets so far, to pass to record()."""
+        return self._generation
+
+    def skip(self, scope: str) -> GraphSearchResults | None:
+        """
+        Decide whether to skip searching a scope this turn.
+
+        Returns:
+            The results to reuse if the scope is skipped, otherwise None
+        """
+        state = self._scopes.get(scope)
+        if state is None or state.results is None or state.streak < self._stable_turns:
+            return None
+        if state.skipped >= self._stable_turns:
+            # Search again to check the hits
+            return None
+        state.skipped += 1
+        return state.results
+
+    def record(self, scope: str, results: GraphSearchResults, generation: int) -> None:
+        """Record the results of a search of a scope that started at the given generation."""
+        if generation != self._generation:
+            return
+        state = self._scopes.setdefault(scope, _ScopeState())
+        ids = _result_ids(results)
+        state.streak = state.streak + 1 if ids == state.ids else 1
+        state.ids = ids
+        state.results = results
+        state.skipped = 0
+
+    def reset(self) -> None:
+        """Forget the recorded hits, e.g. after a change to the graph."""
+        self._scopes.clear()
+        self._generation += 1
@@ -0,0 +1,194 @@
+"""
+Managed background writes to Zep for LiveKit agents.
+"""
+
+import asyncio
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Write:
+    call: Callable[[], Awaitable[Any]]
+    label: str
+    future: asyncio.Future[Any]
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class ManagedWriter:
+    """
+    Delivers an agent's writes to Zep in the background, in order.
+
+    Writes are queued without waiting and delivered one at a time by a single worker,
+    so they reach the agent's thread or graph in the order they were submitted. A
+    failed write is retried with exponential backoff; one that still fails, or that
+    does not fit in the queue, is logged and dropped, so writes never fail a turn.
+
+    Args:
+        max_queue_size: Largest number of writes waiting for delivery
+        max_retries: Number of retries of a failed write
+        retry_delay: Delay before the first retry in seconds, doubled on each retry
+        latency_window: Number of recent writes the latency percentiles cover
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 100,
+        max_retries: int = 2,
+        retry_delay: float = 0.2,
+        latency_window: int = 100,
+    ) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+
+        self._queue: asyncio.Queue[_Write] = asyncio.Queue(maxsize=max_queue_size)
+        self._worker: asyncio.Task[None] | None = None
+        self._in_flight = 0
+
+        # Time from submission to delivery of recent writes, in milliseconds
+        self._latencies_ms: deque[float] = deque(maxlen=latency_window)
+        self._written = 0
+        self._retries = 0
+        self._failed = 0
+        self._dropped = 0
+
+    @property
+    def depth(self) -> int:
+        """Get the number of writes queued or being delivered."""
+        return self._queue.qsize() + self._in_flight
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Get the queue depth, write counts and recent write latency percentiles."""
+        latencies = sorted(self._latencies_ms)
+        return {
+            "depth": self.depth,
+            "written": self._written,
+            "retries": self._retries,
+            "failed": self._failed,
+            "dropped": self._dropped,
+            "latency_p50_ms": _percentile(latencies, 50),
+            "latency_p95_ms": _percentile(latencies, 95),
+            "latency_mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        }
+
+    def submit(
+        self, call: Callable[[], Awaitable[Any]], label: str = "write"
+    ) -> asyncio.Future[Any]:
+        """
+        Queue a write without waiting for it.
+
+        Must be called from the event loop, e.g. in a session event handler.
+
+        Args:
+            call: Makes the write; called again for each retry
+            label: What is written, for log messages
+
+        Returns:
+            A future of the write's result, or of None if it was dropped or failed
+        """
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_Write(call=call, label=label, future=future))
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(f"Dropping {label}: {self._queue.maxsize} writes already queued")
+            future.set_result(None)
+            return future
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return future
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the queued writes to be delivered, then stop the worker.
+
+        Writes still queued after timeout seconds are dropped.
+
+        Returns:
+            Whether every write was delivered or gave up before the timeout
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            drained = True
+        except asyncio.TimeoutError:
+            drained = False
+
+        remaining = self.depth
+        if self._worker is not None:
+            # Abandons the write in flight, if any
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        if not drained:
+            while not self._queue.empty():
+                self._abandon(self._queue.get_nowait())
+                self._queue.task_done()
+            logger.warning(f"Dropped {remaining} writes not delivered within {timeout} s")
+        return drained
+
+    async def _run(self) -> None:
+        while True:
+            write = await self._queue.get()
+            self._in_flight = 1
+            try:
+                await self._deliver(write)
+            except asyncio.CancelledError:
+                self._abandon(write)
+                raise
+            finally:
+                self._in_flight = 0
+                self._queue.task_done()
+
+    async def _deliver(self, write: _Write) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                result = await write.call()
+            except Exception as e:
+                if attempt == self._max_retries:
+                    self._failed += 1
+                    logger.warning(
+                        f"Failed to store {write.label} in Zep after {attempt + 1} attempts: {e}"
+                    )
+                    _resolve(write.future, None)
+                    return
+                self._retries += 1
+                await asyncio.sleep(self._retry_delay * 2**attempt)
+            else:
+                self._written += 1
+                self._latencies_ms.append((time.perf_counter() - write.submitted_at) * 1000)
+                _resolve(write.future, result)
+                return
+
+    def _abandon(self, write: _Write) -> None:
+        self._dropped += 1
+        _resolve(write.future, None)
+
+
+def _resolve(future: asyncio.Future[Any], result: Any) -> None:
+    # The submitter may have cancelled the future
+    if not future.done():
+        future.set_result(result)
+
+
+def _percentile(ordered: list[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest rank
+    rank = max(1, math.ceil(len(ordered) * percentile / 100))
+    return ordered[rank - 1]
@@ -0,0 +1,579 @@
+"""
+Tests for the user turn hooks of ZepUserAgent and ZepGraphAgent.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from livekit.agents.llm.chat_context import ChatContext, ChatMessage
+from zep_cloud import EntityEdge, GraphSearchResults
+from zep_cloud.client import AsyncZep
+from zep_cloud.types import AddThreadMessagesResponse, ThreadContextResponse
+
+from zep_livekit import ZepGraphAgent, ZepUserAgent
+from zep_livekit.exceptions import AgentConfigurationError
+
+INSTRUCTIONS = "You are a helpful assistant."
+
+
+def _mock_client() -> MagicMock:
+    mock_client = MagicMock(spec=AsyncZep)
+    mock_client.thread = MagicMock()
+    mock_client.thread.add_messages = AsyncMock(return_value=AddThreadMessagesResponse())
+    mock_client.thread.get_user_context = AsyncMock(
+        return_value=ThreadContextResponse(context="User likes Lisbon")
+    )
+    mock_client.graph = MagicMock()
+    mock_client.graph.add = AsyncMock()
+    mock_client.graph.search = AsyncMock(
+        return_value=GraphSearchResults(
+            edges=[
+                EntityEdge(
+                    uuid_="edge",
+                    fact="Alice lives in Lisbon",
+                    name="LIVES_IN",
+                    source_node_uuid="alice",
+                    target_node_uuid="lisbon",
+                    created_at="2025-01-01T00:00:00Z",
+                )
+            ]
+        )
+    )
+    return mock_client
+
+
+def _delayed(delay: float, result: object):
+    async def call(**_):
+        await asyncio.sleep(delay)
+        return result
+
+    return call
+
+
+def _user_turn(text: str) -> tuple[ChatContext, ChatMessage]:
+    turn_ctx = ChatContext()
+    return turn_ctx, turn_ctx.add_message(role="user", content=text)
+
+
+def _system_messages(turn_ctx: ChatContext) -> list[str]:
+    return [
+        item.text_content or ""
+        for item in turn_ctx.items
+        if getattr(item, "role", None) == "system"
+    ]
+
+
+class TestZepUserAgentTurn:
+    """Test ZepUserAgent.on_user_turn_completed."""
+
+    @pytest.mark.asyncio
+    async def test_retrieval_does_not_wait_for_store(self):
+        """Test that the context is injected while the user message is still being stored."""
+        mock_client = _mock_client()
+        stored = asyncio.Event()
+
+        async def add_messages(**_):
+            await stored.wait()
+            return AddThreadMessagesResponse()
+
+        mock_client.thread.add_messages.side_effect = add_messages
+        agent = ZepUserAgent(
+            zep_client=mock_client, user_id="user", thread_id="thread", instructions=INSTRUCTIONS
+        )
+
+        turn_ctx, new_message = _user_turn("I'm going to Lisbon")
+        await asyncio.wait_for(agent.on_user_turn_completed(turn_ctx, new_message), timeout=1)
+
+        assert _system_messages(turn_ctx) == ["Relevant user context:\nUser likes Lisbon"]
+        mock_client.thread.add_messages.assert_called_once()
+        assert mock_client.thread.add_messages.call_args.kwargs["messages"][0].content == (
+            "I'm going to Lisbon"
+        )
+
+        # on_exit waits for the write of the last turn
+        stored.set()
+        await agent.on_exit()
+        mock_client.thread.add_messages.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_store_does_not_fail_turn(self):
+        """Test that a failing background write is logged, not raised."""
+        mock_client = _mock_client()
+        mock_client.thread.add_messages.side_effect = RuntimeError("boom")
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            write_retries=0,
+            instructions=INSTRUCTIONS,
+        )
+
+        turn_ctx, new_message = _user_turn("Hello")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        await agent.on_exit()
+
+        assert len(_system_messages(turn_ctx)) == 1
+        assert agent.writer_stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pipelined_mode_uses_one_round_trip(self):
+        """Test that pipelined mode stores the message and gets its context in one call."""
+        mock_client = _mock_client()
+        mock_client.thread.add_messages.return_value = AddThreadMessagesResponse(
+            context="User is going to Lisbon"
+        )
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            store_mode="pipelined",
+            instructions=INSTRUCTIONS,
+        )
+
+        turn_ctx, new_message = _user_turn("I'm going to Lisbon")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+
+        mock_client.thread.add_messages.assert_awaited_once()
+        assert mock_client.thread.add_messages.call_args.kwargs["return_context"] is True
+        mock_client.thread.get_user_context.assert_not_called()
+        assert _system_messages(turn_ctx) == ["Relevant user context:\nUser is going to Lisbon"]
+
+    def test_pipelined_mode_rejects_summary_context(self):
+        """Test that pipelined mode cannot be combined with summary context."""
+        with pytest.raises(AgentConfigurationError, match="pipelined"):
+            ZepUserAgent(
+                zep_client=_mock_client(),
+                user_id="user",
+                thread_id="thread",
+                context_mode="summary",
+                store_mode="pipelined",
+                instructions=INSTRUCTIONS,
+            )
+
+    @pytest.mark.asyncio
+    async def test_late_context_is_injected_on_next_turn(self):
+        """Test that a turn past the deadline proceeds and the next turn gets the late context."""
+        mock_client = _mock_client()
+        mock_client.thread.get_user_context.side_effect = _delayed(
+            0.05, ThreadContextResponse(context="User likes Lisbon")
+        )
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            context_deadline_ms=10,
+            instructions=INSTRUCTIONS,
+        )
+
+        first_ctx, first_message = _user_turn("I'm going to Lisbon")
+        await agent.on_user_turn_completed(first_ctx, first_message)
+        assert _system_messages(first_ctx) == []
+
+        await asyncio.sleep(0.1)
+        second_ctx, second_message = _user_turn("What should I pack?")
+        await agent.on_user_turn_completed(second_ctx, second_message)
+
+        assert _system_messages(second_ctx) == ["Relevant user context:\nUser likes Lisbon"]
+        assert agent.retrieval_stats == {
+            "turns": 2,
+            "deadline_exceeded": 2,
+            "late_injections": 1,
+        }
+        await agent.on_exit()
+
+    @pytest.mark.asyncio
+    async def test_pipelined_store_completes_past_deadline(self):
+        """Test that pipelined mode still stores the message when the deadline is exceeded."""
+        mock_client = _mock_client()
+        mock_client.thread.add_messages.side_effect = _delayed(
+            0.05, AddThreadMessagesResponse(context="User is going to Lisbon")
+        )
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            store_mode="pipelined",
+            context_deadline_ms=10,
+            instructions=INSTRUCTIONS,
+        )
+
+        turn_ctx, new_message = _user_turn("I'm going to Lisbon")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        await agent.on_exit()
+
+        assert _system_messages(turn_ctx) == []
+        mock_client.thread.add_messages.assert_awaited_once()
+
+
+class TestZepGraphAgentTurn:
+    """Test ZepGraphAgent.on_user_turn_completed."""
+
+    @pytest.mark.asyncio
+    async def test_searches_without_waiting_for_store(self):
+        """Test that the graph context is injected while the message is still being stored."""
+        mock_client = _mock_client()
+        stored = asyncio.Event()
+
+        async def add(**_):
+            await stored.wait()
+
+        mock_client.graph.add.side_effect = add
+        agent = ZepGraphAgent(
+            zep_client=mock_client, graph_id="graph", user_name="Alice", instructions=INSTRUCTIONS
+        )
+
+        turn_ctx, new_message = _user_turn("Where do I live?")
+        await asyncio.wait_for(agent.on_user_turn_completed(turn_ctx, new_message), timeout=1)
+
+        (context,) = _system_messages(turn_ctx)
+        assert "Alice lives in Lisbon" in context
+        assert mock_client.graph.add.call_args.kwargs["data"] == "[Alice]: Where do I live?"
+
+        stored.set()
+        await agent.on_exit()
+        mock_client.graph.add.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_deadline_skips_slow_search(self):
+        """Test that a search past the deadline is counted and injected on the next turn."""
+        mock_client = _mock_client()
+        mock_client.graph.search.side_effect = _delayed(0.05, mock_client.graph.search.return_value)
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            context_deadline_ms=10,
+            instructions=INSTRUCTIONS,
+        )
+
+        first_ctx, first_message = _user_turn("Where do I live?")
+        await agent.on_user_turn_completed(first_ctx, first_message)
+        assert _system_messages(first_ctx) == []
+
+        await asyncio.sleep(0.1)
+        second_ctx, second_message = _user_turn("And my sister?")
+        await agent.on_user_turn_completed(second_ctx, second_message)
+
+        (context,) = _system_messages(second_ctx)
+        assert "Alice lives in Lisbon" in context
+        assert agent.retrieval_stats["deadline_exceeded"] == 2
+        await agent.on_exit()
+
+
+class TestSpeculativePrefetch:
+    """Test speculative retrieval in the agents' turn hooks."""
+
+    @pytest.mark.asyncio
+    async def test_graph_agent_uses_speculative_search(self):
+        """Test that a search started on the interim transcript is used for the turn."""
+        mock_client = _mock_client()
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            speculative_prefetch=True,
+            prefetch_debounce_ms=5,
+            instructions=INSTRUCTIONS,
+        )
+
+        agent._prefetch.update("where do I live", is_final=False)
+        await asyncio.sleep(0.02)
+        turn_ctx, new_message = _user_turn("Where do I live?")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+
+        (context,) = _system_messages(turn_ctx)
+        assert "Alice lives in Lisbon" in context
+        # One search per scope, all speculative
+        assert mock_client.graph.search.await_count == 3
+        assert mock_client.graph.search.call_args.kwargs["query"] == "where do I live"
+        assert agent.prefetch_stats["hits"] == 1
+        await agent.on_exit()
+
+    @pytest.mark.asyncio
+    async def test_user_agent_uses_speculative_context(self):
+        """Test that the user context retrieved during speech is used whatever the words."""
+        mock_client = _mock_client()
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            speculative_prefetch=True,
+            prefetch_debounce_ms=5,
+            instructions=INSTRUCTIONS,
+        )
+
+        agent._prefetch.update("I'm going", is_final=False)
+        await asyncio.sleep(0.02)
+        turn_ctx, new_message = _user_turn("I'm going to Lisbon next month with my sister")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+
+        assert _system_messages(turn_ctx) == ["Relevant user context:\nUser likes Lisbon"]
+        mock_client.thread.get_user_context.assert_awaited_once()
+        await agent.on_exit()
+
+    def test_user_agent_rejects_pipelined_prefetch(self):
+        """Test that speculative retrieval cannot be combined with pipelined mode."""
+        with pytest.raises(AgentConfigurationError, match="speculative_prefetch"):
+            ZepUserAgent(
+                zep_client=_mock_client(),
+                user_id="user",
+                thread_id="thread",
+                store_mode="pipelined",
+                speculative_prefetch=True,
+                instructions=INSTRUCTIONS,
+            )
+
+
+def _assistant_item(text: str) -> SimpleNamespace:
+    return SimpleNamespace(item=SimpleNamespace(role="assistant", content=[text], name=None))
+
+
+class TestManagedWrites:
+    """Test that the agents store messages through their writer."""
+
+    @pytest.mark.asyncio
+    async def test_user_agent_stores_turns_in_order(self):
+        """Test that user and assistant messages reach the thread in order."""
+        mock_client = _mock_client()
+        stored: list[str] = []
+
+        async def add_messages(thread_id, messages, **_):
+            # Earlier messages take longer, so out-of-order delivery would show
+            await asyncio.sleep(0.02 if messages[0].role == "user" else 0)
+            stored.extend(message.content for message in messages)
+            return AddThreadMessagesResponse()
+
+        mock_client.thread.add_messages.side_effect = add_messages
+        agent = ZepUserAgent(
+            zep_client=mock_client, user_id="user", thread_id="thread", instructions=INSTRUCTIONS
+        )
+
+        turn_ctx, new_message = _user_turn("Hi, I'm Alice")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        agent._handle_conversation_item(_assistant_item("Hello Alice!"))
+        assert agent.writer_stats["depth"] == 2
+
+        await agent.on_exit()
+
+        assert stored == ["Hi, I'm Alice", "Hello Alice!"]
+        assert agent.writer_stats["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_graph_agent_drains_on_exit_within_timeout(self):
+        """Test that on_exit stops waiting for writes after the drain timeout."""
+        mock_client = _mock_client()
+        mock_client.graph.add.side_effect = _delayed(1, None)
+        agent = ZepGraphAgent(
+            zep_client=mock_client, graph_id="graph", drain_timeout=0.01, instructions=INSTRUCTIONS
+        )
+
+        agent._handle_conversation_item(_assistant_item("Lisbon is in Portugal."))
+        await asyncio.wait_for(agent.on_exit(), timeout=0.5)
+
+        assert agent.writer_stats["dropped"] == 1
+
+
+class TestCoalescedWrites:
+    """Test message coalescing in ZepUserAgent."""
+
+    @pytest.mark.asyncio
+    async def test_exchange_is_stored_in_one_write(self):
+        """Test that a user message and the assistant reply are stored in one call."""
+        mock_client = _mock_client()
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            coalesce_window_ms=5000,
+            instructions=INSTRUCTIONS,
+        )
+
+        turn_ctx, new_message = _user_turn("Hi, I'm Alice")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        agent._handle_conversation_item(_assistant_item("Hello Alice!"))
+        await agent.on_exit()
+
+        mock_client.thread.add_messages.assert_awaited_once()
+        messages = mock_client.thread.add_messages.call_args.kwargs["messages"]
+        assert [(message.role, message.content) for message in messages] == [
+            ("user", "Hi, I'm Alice"),
+            ("assistant", "Hello Alice!"),
+        ]
+        assert agent.coalescing_stats == {"messages": 2, "batches": 1}
+
+    @pytest.mark.asyncio
+    async def test_pipelined_store_carries_held_reply(self):
+        """Test that pipelined mode sends the held assistant reply with the next user message."""
+        mock_client = _mock_client()
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            store_mode="pipelined",
+            coalesce_window_ms=5000,
+            instructions=INSTRUCTIONS,
+        )
+
+        agent._handle_conversation_item(_assistant_item("Welcome back, Alice!"))
+        turn_ctx, new_message = _user_turn("Where do I live?")
+        await agent.on_user_turn_completed(turn_ctx, new_message)
+        await agent.on_exit()
+
+        mock_client.thread.add_messages.assert_awaited_once()
+        call = mock_client.thread.add_messages.call_args.kwargs
+        assert [message.content for message in call["messages"]] == [
+            "Welcome back, Alice!",
+            "Where do I live?",
+        ]
+        assert call["return_context"] is True
+
+    @pytest.mark.asyncio
+    async def test_held_messages_are_stored_on_exit(self):
+        """Test that on_exit stores messages still held."""
+        mock_client = _mock_client()
+        agent = ZepUserAgent(
+            zep_client=mock_client,
+            user_id="user",
+            thread_id="thread",
+            coalesce_window_ms=5000,
+            instructions=INSTRUCTIONS,
+        )
+
+        agent._handle_conversation_item(_assistant_item("Goodbye!"))
+        await agent.on_exit()
+
+        mock_client.thread.add_messages.assert_awaited_once()
+
+
+class TestGraphSearchReduction:
+    """Test ZepGraphAgent search caching and adaptive scope skipping."""
+
+    @pytest.mark.asyncio
+    async def test_cached_search_is_invalidated_after_extraction(self):
+        """Test that a repeated query is answered from the cache until a write is extracted."""
+        mock_client = _mock_client()
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            facts_limit=5,
+            entity_limit=0,
+            episode_limit=0,
+            search_cache_ttl=30,
+            extraction_delay=0.05,
+            instructions=INSTRUCTIONS,
+        )
+
+        assert await agent._retrieve_graph_context("Where do I live?")
+        assert await agent._retrieve_graph_context("where do I live")
+        assert mock_client.graph.search.await_count == 1
+
+        agent._handle_conversation_item(_assistant_item("You live in Lisbon."))
+        await asyncio.sleep(0.01)
+        # Delivered, but not extracted yet
+        mock_client.graph.add.assert_awaited_once()
+        await agent._retrieve_graph_context("Where do I live?")
+        assert mock_client.graph.search.await_count == 1
+
+        await asyncio.sleep(0.1)
+        await agent._retrieve_graph_context("Where do I live?")
+        await agent.on_exit()
+
+        assert agent.search_stats == {"searches": 2, "cache_hits": 2, "skipped_scopes": 0}
+
+    @pytest.mark.asyncio
+    async def test_repeated_turns_are_cached(self):
+        """Test that the user turn's own write does not empty the cache for its search."""
+        mock_client = _mock_client()
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            search_cache_ttl=30,
+            instructions=INSTRUCTIONS,
+        )
+
+        for _ in range(5):
+            turn_ctx, new_message = _user_turn("Where do I live?")
+            await agent.on_user_turn_completed(turn_ctx, new_message)
+            assert "Alice lives in Lisbon" in _system_messages(turn_ctx)[0]
+            await asyncio.sleep(0.01)
+        await agent.on_exit()
+
+        assert mock_client.graph.add.await_count == 5
+        assert agent.search_stats == {"searches": 3, "cache_hits": 12, "skipped_scopes": 0}
+
+    @pytest.mark.asyncio
+    async def test_stable_scopes_are_skipped(self):
+        """Test that scopes with unchanged hits are skipped on later turns."""
+        mock_client = _mock_client()
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            adaptive_scope_turns=2,
+            instructions=INSTRUCTIONS,
+        )
+
+        contexts = []
+        for text in ["Where do I live?", "Is it sunny there?", "What should I wear?"]:
+            turn_ctx, new_message = _user_turn(text)
+            await agent.on_user_turn_completed(turn_ctx, new_message)
+            contexts.append(_system_messages(turn_ctx))
+            await asyncio.sleep(0.01)
+        await agent.on_exit()
+
+        # Edges, nodes and episodes are searched on the first two turns only, even though
+        # every turn's message was written to the graph
+        assert mock_client.graph.add.await_count == 3
+        assert agent.search_stats == {"searches": 6, "cache_hits": 0, "skipped_scopes": 3}
+        assert all("Alice lives in Lisbon" in context for (context,) in contexts)
+
+    @pytest.mark.asyncio
+    async def test_extracted_write_ends_skipping(self):
+        """Test that a skipped scope is searched again once a write has been extracted."""
+        mock_client = _mock_client()
+        agent = ZepGraphAgent(
+            zep_client=mock_client,
+            graph_id="graph",
+            entity_limit=0,
+            episode_limit=0,
+            adaptive_scope_turns=2,
+            extraction_delay=0.05,
+            instructions=INSTRUCTIONS,
+        )
+
+        for _ in range(3):
+            await agent._retrieve_graph_context("Where do I live?")
+        agent._handle_conversation_item(_assistant_item("You moved to Porto."))
+        await asyncio.sleep(0.01)
+        await agent._retrieve_graph_context("Where do I live?")
+        assert agent.search_stats["skipped_scopes"] == 2
+
+        await asyncio.sleep(0.1)
+        await agent._retrieve_graph_context("Where do I live?")
+        await agent.on_exit()
+
+        # Still skipped after delivery, searched again after extraction
+        assert agent.search_stats == {"searches": 3, "cache_hits": 0, "skipped_scopes": 2}
+
+    def test_rejects_invalid_search_settings(self):
+        """Test that invalid cache and adaptive scope settings are rejected."""
+        with pytest.raises(AgentConfigurationError, match="search_cache_ttl"):
+            ZepGraphAgent(
+                zep_client=_mock_client(),
+                graph_id="graph",
+                search_cache_ttl=0,
+                instructions=INSTRUCTIONS,
+            )
+        with pytest.raises(AgentConfigurationError, match="adaptive_scope_turns"):
+            ZepGraphAgent(
+                zep_client=_mock_client(),
+                graph_id="graph",
+                adaptive_scope_turns=0,
+                instructions=INSTRUCTIONS,
+            )
+        with pytest.raises(AgentConfigurationError, match="extraction_delay"):
+            ZepGraphAgent(
+                zep_client=_mock_client(),
+                graph_id="graph",
+                extraction_delay=-1,
+                instructions=INSTRUCTIONS,
+            )
@@ -0,0 +1,72 @@
+"""
+Tests for MessageCoalescer.
+"""
+
+import asyncio
+
+import pytest
+from zep_cloud.types import Message
+
+from zep_livekit.coalescer import MessageCoalescer
+
+
+def _contents(batches: list[list[Message]]) -> list[list[str]]:
+    return [[message.content for message in batch] for batch in batches]
+
+
+class TestMessageCoalescer:
+    """Test suite for MessageCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_user_assistant_pair(self):
+        """Test that an assistant reply is flushed together with the user message before it."""
+        batches: list[list[Message]] = []
+        coalescer = MessageCoalescer(batches.append, window_ms=1000)
+
+        coalescer.add(Message(content="Hi, I'm Alice", role="user"))
+        assert batches == []
+        assert coalescer.pending == 1
+
+        coalescer.add(Message(content="Hello Alice!", role="assistant"))
+
+        assert _contents(batches) == [["Hi, I'm Alice", "Hello Alice!"]]
+        assert coalescer.stats == {"messages": 2, "batches": 1}
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_window(self):
+        """Test that held messages are flushed once the window has passed."""
+        batches: list[list[Message]] = []
+        coalescer = MessageCoalescer(batches.append, window_ms=10)
+
+        coalescer.add(Message(content="Welcome back!", role="assistant"))
+        coalescer.add(Message(content="Anything else?", role="assistant"))
+        await asyncio.sleep(0.03)
+
+        assert _contents(batches) == [["Welcome back!", "Anything else?"]]
+
+    @pytest.mark.asyncio
+    async def test_flushes_full_batch(self):
+        """Test that a batch is flushed once it holds max_batch_size messages."""
+        batches: list[list[Message]] = []
+        coalescer = MessageCoalescer(batches.append, window_ms=1000, max_batch_size=2)
+
+        for i in range(3):
+            coalescer.add(Message(content=f"Note {i}", role="assistant"))
+
+        assert _contents(batches) == [["Note 0", "Note 1"]]
+        coalescer.flush()
+        assert _contents(batches) == [["Note 0", "Note 1"], ["Note 2"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_with_takes_held_messages(self):
+        """Test that held messages go along with a message stored right away."""
+        batches: list[list[Message]] = []
+        coalescer = MessageCoalescer(batches.append, window_ms=10)
+
+        coalescer.add(Message(content="Hello Alice!", role="assistant"))
+        batch = coalescer.batch_with(Message(content="Where do I live?", role="user"))
+        await asyncio.sleep(0.03)
+
+        assert [message.content for message in batch] == ["Hello Alice!", "Where do I live?"]
+        assert batches == []
+        assert coalescer.stats == {"messages": 2, "batches": 1}
@@ -0,0 +1,78 @@
+"""
+Tests for RetrievalDeadline.
+"""
+
+import asyncio
+
+import pytest
+
+from zep_livekit.deadline import RetrievalDeadline
+
+
+def _retrieval(context: str | None, delay: float = 0.0):
+    async def retrieve() -> str | None:
+        await asyncio.sleep(delay)
+        return context
+
+    return retrieve
+
+
+class TestRetrievalDeadline:
+    """Test suite for RetrievalDeadline."""
+
+    @pytest.mark.asyncio
+    async def test_returns_context_retrieved_in_time(self):
+        """Test that a retrieval within the deadline is returned as is."""
+        deadline = RetrievalDeadline(deadline_ms=100)
+
+        assert await deadline.run(_retrieval("fresh")) == "fresh"
+        assert deadline.stats == {"turns": 1, "deadline_exceeded": 0, "late_injections": 0}
+
+    @pytest.mark.asyncio
+    async def test_late_result_is_returned_on_next_turn(self):
+        """Test that a turn past the deadline gets nothing and the next one gets the result."""
+        deadline = RetrievalDeadline(deadline_ms=10)
+
+        assert await deadline.run(_retrieval("late", delay=0.03)) is None
+        await asyncio.sleep(0.05)  # the late retrieval completes
+
+        assert await deadline.run(_retrieval("slow again", delay=0.5)) == "late"
+        assert deadline.stats == {"turns": 2, "deadline_exceeded": 2, "late_injections": 1}
+        deadline.close()
+
+    @pytest.mark.asyncio
+    async def test_retrieval_in_time_drops_late_result(self):
+        """Test that a fresh context wins over a late one, which is not returned later."""
+        deadline = RetrievalDeadline(deadline_ms=10)
+
+        await deadline.run(_retrieval("late", delay=0.03))
+        await asyncio.sleep(0.05)
+
+        assert await deadline.run(_retrieval("fresh")) == "fresh"
+        assert await deadline.run(_retrieval("slow", delay=0.5)) is None
+        deadline.close()
+
+    @pytest.mark.asyncio
+    async def test_newer_retrieval_supersedes_running_one(self):
+        """Test that a retrieval still running when the next turn misses its deadline is dropped."""
+        deadline = RetrievalDeadline(deadline_ms=10)
+
+        await deadline.run(_retrieval("first", delay=0.05))
+        await deadline.run(_retrieval("second", delay=0.02))
+        await asyncio.sleep(0.06)
+
+        assert await deadline.run(_retrieval("third", delay=0.5)) == "second"
+        deadline.close()
+
+    @pytest.mark.asyncio
+    async def test_no_deadline_waits_for_retrieval(self):
+        """Test that without a deadline the turn waits for retrieval."""
+        deadline = RetrievalDeadline()
+
+        assert await deadline.run(_retrieval("slow", delay=0.02)) == "slow"
+        assert deadline.stats["deadline_exceeded"] == 0
+
+    def test_rejects_non_positive_deadline(self):
+        """Test that the deadline must be positive."""
+        with pytest.raises(ValueError, match="positive"):
+            RetrievalDeadline(deadline_ms=0)
@@ -0,0 +1,98 @@
+"""
+Tests for SpeculativePrefetch.
+"""
+
+import asyncio
+
+import pytest
+
+from zep_livekit.prefetch import SpeculativePrefetch, transcript_similarity
+
+
+class RecordingRetrieval:
+    """Retrieval that records the transcripts it was started for."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.queries: list[str] = []
+        self.delay = delay
+
+    async def __call__(self, text: str) -> str | None:
+        self.queries.append(text)
+        await asyncio.sleep(self.delay)
+        return f"context for {text}"
+
+
+class TestSpeculativePrefetch:
+    """Test suite for SpeculativePrefetch."""
+
+    @pytest.mark.asyncio
+    async def test_starts_once_transcript_stabilizes(self):
+        """Test that retrieval waits until the transcript stops changing."""
+        retrieve = RecordingRetrieval()
+        prefetch = SpeculativePrefetch(retrieve, debounce_ms=20)
+
+        prefetch.update("What is", is_final=False)
+        await asyncio.sleep(0.005)
+        prefetch.update("What is the capital", is_final=False)
+        await asyncio.sleep(0.005)
+        prefetch.update("What is the capital of Portugal", is_final=False)
+        await asyncio.sleep(0.05)
+
+        assert retrieve.queries == ["What is the capital of Portugal"]
+        assert prefetch.stats["speculations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_final_segments_accumulate(self):
+        """Test that final segments of a turn are joined with the interim transcript."""
+        retrieve = RecordingRetrieval()
+        prefetch = SpeculativePrefetch(retrieve, debounce_ms=5)
+
+        prefetch.update("I'm flying to Lisbon.", is_final=True)
+        prefetch.update("Where should I", is_final=False)
+        await asyncio.sleep(0.02)
+
+        assert retrieve.queries == ["I'm flying to Lisbon. Where should I"]
+        prefetch.close()
+
+    @pytest.mark.asyncio
+    async def test_take_uses_retrieval_for_close_transcript(self):
+        """Test that a speculative retrieval is handed over when the final transcript matches."""
+        prefetch = SpeculativePrefetch(RecordingRetrieval(), debounce_ms=5)
+
+        prefetch.update("what is the capital of Portugal", is_final=False)
+        await asyncio.sleep(0.02)
+        speculative = prefetch.take("What is the capital of Portugal?")
+
+        assert speculative is not None
+        assert await speculative == "context for what is the capital of Portugal"
+        assert prefetch.stats == {"speculations": 1, "hits": 1, "misses": 0}
+
+    @pytest.mark.asyncio
+    async def test_take_discards_retrieval_for_different_transcript(self):
+        """Test that a speculative retrieval is cancelled when the final transcript differs."""
+        prefetch = SpeculativePrefetch(RecordingRetrieval(delay=1), debounce_ms=5)
+
+        prefetch.update("what is the capital", is_final=False)
+        await asyncio.sleep(0.02)
+
+        assert prefetch.take("What is the capital of Spain and how big is Madrid?") is None
+        assert prefetch.stats == {"speculations": 1, "hits": 0, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_take_without_speculation(self):
+        """Test that a turn that ends before the debounce has nothing to hand over."""
+        retrieve = RecordingRetrieval()
+        prefetch = SpeculativePrefetch(retrieve, debounce_ms=50)
+
+        prefetch.update("Hello", is_final=False)
+
+        assert prefetch.take("Hello") is None
+        await asyncio.sleep(0.06)
+        assert retrieve.queries == []
+
+    def test_similarity(self):
+        """Test that similarity compares words in order, ignoring case and punctuation."""
+        assert transcript_similarity("where do I live", "Where do I live?") == 1.0
+        assert transcript_similarity("Hello there", "hello there") == 1.0
+        assert transcript_similarity("hello there", "general kenobi") == 0.0
+        assert 0.5 < transcript_similarity("book a table for two", "book a table for four") < 1
@@ -0,0 +1,126 @@
+"""
+Tests for SearchCache and AdaptiveScopeSkipper.
+"""
+
+import time
+
+import pytest
+from zep_cloud import EntityEdge, GraphSearchResults
+
+from zep_livekit.search_cache import AdaptiveScopeSkipper, SearchCache, normalize_query
+
+
+def _results(*facts: str) -> GraphSearchResults:
+    return GraphSearchResults(
+        edges=[
+            EntityEdge(
+                uuid_=fact,
+                fact=fact,
+                name="FACT",
+                source_node_uuid="source",
+                target_node_uuid="target",
+                created_at="2025-01-01T00:00:00Z",
+            )
+            for fact in facts
+        ]
+    )
+
+
+class TestSearchCache:
+    """Test suite for SearchCache."""
+
+    def test_normalizes_queries(self):
+        """Test that queries differing in case and punctuation share a cache entry."""
+        cache = SearchCache(ttl=10)
+        results = _results("Alice lives in Lisbon")
+
+        cache.put("edges", "Where do I live?", results, cache.generation)
+
+        assert normalize_query("  Where do I   live? ") == "where do i live"
+        assert cache.get("edges", "where do I live") is results
+        assert cache.get("nodes", "where do I live") is None
+
+    def test_expires_after_ttl(self, monkeypatch):
+        """Test that results are no longer returned once the TTL has passed."""
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache = SearchCache(ttl=10)
+        cache.put("edges", "Where do I live?", _results("Alice lives in Lisbon"), 0)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get("edges", "Where do I live?") is None
+
+    def test_invalidate_discards_in_flight_search(self):
+        """Test that results of a search started before an invalidation are not cached."""
+        cache = SearchCache(ttl=10)
+        cache.put("edges", "Where do I live?", _results("Alice lives in Lisbon"), 0)
+        generation = cache.generation
+
+        cache.invalidate()
+        cache.put("edges", "And my sister?", _results("Bea lives in Porto"), generation)
+
+        assert cache.get("edges", "Where do I live?") is None
+        assert cache.get("edges", "And my sister?") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry goes first once the cache is full."""
+        cache = SearchCache(ttl=10, max_entries=2)
+        cache.put("edges", "first", _results("1"), 0)
+        cache.put("edges", "second", _results("2"), 0)
+        cache.get("edges", "first")
+
+        cache.put("edges", "third", _results("3"), 0)
+
+        assert cache.get("edges", "second") is None
+        assert cache.get("edges", "first") is not None
+
+    def test_rejects_invalid_ttl(self):
+        """Test that a TTL that is not positive is rejected."""
+        with pytest.raises(ValueError, match="ttl"):
+            SearchCache(ttl=0)
+
+
+class TestAdaptiveScopeSkipper:
+    """Test suite for AdaptiveScopeSkipper."""
+
+    def test_skips_stable_scope_then_probes(self):
+        """Test that a scope is skipped after stable_turns unchanged searches, then probed."""
+        skipper = AdaptiveScopeSkipper(stable_turns=2)
+        results = _results("Alice lives in Lisbon")
+
+        skipper.record("edges", results, skipper.generation)
+        assert skipper.skip("edges") is None
+        skipper.record("edges", _results("Alice lives in Lisbon"), skipper.generation)
+
+        assert skipper.skip("edges") is not None
+        assert skipper.skip("edges") is not None
+        # Searched again after stable_turns skipped turns
+        assert skipper.skip("edges") is None
+
+    def test_changed_hits_reset_streak(self):
+        """Test that a scope whose hits change keeps being searched."""
+        skipper = AdaptiveScopeSkipper(stable_turns=2)
+
+        skipper.record("edges", _results("Alice lives in Lisbon"), 0)
+        skipper.record("edges", _results("Alice lives in Lisbon", "Bea lives in Porto"), 0)
+
+        assert skipper.skip("edges") is None
+        assert skipper.skip("nodes") is None
+
+    def test_reset_discards_in_flight_search(self):
+        """Test that results of a search started before a reset are not recorded."""
+        skipper = AdaptiveScopeSkipper(stable_turns=1)
+        skipper.record("edges", _results("Alice lives in Lisbon"), 0)
+        generation = skipper.generation
+
+        skipper.reset()
+        skipper.record("nodes", _results("Bea lives in Porto"), generation)
+
+        assert skipper.skip("edges") is None
+        assert skipper.skip("nodes") is None
+
+    def test_rejects_invalid_stable_turns(self):
+        """Test that stable_turns below 1 is rejected."""
+        with pytest.raises(ValueError, match="stable_turns"):
+            AdaptiveScopeSkipper(stable_turns=0)
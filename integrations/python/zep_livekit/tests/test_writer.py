@@ -0,0 +1,102 @@
+"""
+Tests for ManagedWriter.
+"""
+
+import asyncio
+
+import pytest
+
+from zep_livekit.writer import ManagedWriter
+
+
+class RecordingWrite:
+    """Write that records its deliveries and can be slowed down or made to fail."""
+
+    def __init__(self, delivered: list[str], value: str, delay: float = 0.0, failures: int = 0):
+        self.delivered = delivered
+        self.value = value
+        self.delay = delay
+        self.failures = failures
+        self.attempts = 0
+
+    async def __call__(self) -> str:
+        self.attempts += 1
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("write failed")
+        self.delivered.append(self.value)
+        return self.value
+
+
+class TestManagedWriter:
+    """Test suite for ManagedWriter."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_in_submission_order(self):
+        """Test that writes are delivered one at a time, in order, without waiting on submit."""
+        delivered: list[str] = []
+        writer = ManagedWriter()
+
+        futures = [
+            writer.submit(RecordingWrite(delivered, value, delay=0.03 - i * 0.01))
+            for i, value in enumerate(["first", "second", "third"])
+        ]
+        assert delivered == []
+        assert writer.depth == 3
+
+        assert await asyncio.gather(*futures) == ["first", "second", "third"]
+        assert delivered == ["first", "second", "third"]
+        assert writer.stats["written"] == 3
+        assert writer.stats["latency_p95_ms"] >= writer.stats["latency_p50_ms"] > 0
+        await writer.drain()
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff(self):
+        """Test that a failed write is retried until it succeeds."""
+        delivered: list[str] = []
+        writer = ManagedWriter(max_retries=2, retry_delay=0.001)
+        write = RecordingWrite(delivered, "message", failures=2)
+
+        assert await writer.submit(write) == "message"
+        assert write.attempts == 3
+        assert writer.stats["retries"] == 2
+        await writer.drain()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_resolves_to_none(self):
+        """Test that a write failing every attempt is given up without raising."""
+        writer = ManagedWriter(max_retries=1, retry_delay=0.001)
+
+        assert await writer.submit(RecordingWrite([], "message", failures=5)) is None
+        assert writer.stats["failed"] == 1
+        await writer.drain()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_new_writes(self):
+        """Test that writes beyond max_queue_size are dropped."""
+        delivered: list[str] = []
+        writer = ManagedWriter(max_queue_size=2)
+
+        writer.submit(RecordingWrite(delivered, "first", delay=0.01))
+        writer.submit(RecordingWrite(delivered, "second"))
+        dropped = writer.submit(RecordingWrite(delivered, "third"))
+
+        assert await dropped is None
+        await writer.drain()
+        assert delivered == ["first", "second"]
+        assert writer.stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drain_times_out(self):
+        """Test that drain gives up on writes not delivered within the timeout."""
+        delivered: list[str] = []
+        writer = ManagedWriter()
+
+        writer.submit(RecordingWrite(delivered, "slow", delay=1))
+        writer.submit(RecordingWrite(delivered, "queued"))
+
+        assert not await writer.drain(timeout=0.01)
+        assert delivered == []
+        assert writer.depth == 0
+        assert writer.stats["dropped"] == 2